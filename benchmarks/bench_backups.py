@@ -0,0 +1,74 @@
+"""
+Orchestrated backups across many servers against the stub panel, reporting
+throughput, rotations and the peak number of concurrent backups per node.
+
+    python -m benchmarks.bench_backups --servers 300 --nodes 3 --per-node 2,4,8 --backup-seconds 0.5
+"""
+import argparse
+import asyncio
+import json
+import uuid
+from typing import Dict
+
+from benchmarks.stub_panel import StubPanel, _now
+from utils.api import PterodactylAPI
+from utils.backups import BackupOrchestrator
+
+def _prefill(panel: StubPanel, ratio: float):
+    """Fill a share of servers up to their backup limit so runs have to rotate"""
+    for i, server in enumerate(panel.servers.values()):
+        if ratio and i % max(1, round(1 / ratio)) == 0:
+            for n in range(server['feature_limits']['backups']):
+                panel.backups[server['uuid']].append({
+                    'uuid': str(uuid.uuid4()), 'is_successful': True, 'is_locked': False,
+                    'name': f"old-{n}", 'ignored_files': [], 'checksum': None,
+                    'bytes': 1024 * 1024, 'created_at': _now(), 'completed_at': _now()
+                })
+
+async def run(args, per_node: int) -> Dict:
+    panel = StubPanel(servers=args.servers, users=args.users, nodes=args.nodes, latency=args.latency,
+                      jitter=args.jitter, backup_seconds=args.backup_seconds)
+    _prefill(panel, args.full_ratio)
+    url = await panel.start()
+    try:
+        api = PterodactylAPI(url, 'ptla_benchmark', 'ptlc_benchmark')
+        servers = await api.fetch_all_servers()
+        orchestrator = BackupOrchestrator(api, per_node=per_node, total=args.total,
+                                          poll_initial=args.poll_initial, poll_max=args.poll_max)
+        requests_before = panel.request_count
+        report = await orchestrator.run(servers)
+        await api.close()
+    finally:
+        await panel.stop()
+    return {
+        'per_node': per_node,
+        'servers': len(servers),
+        'succeeded': len(report.succeeded),
+        'failed': len(report.failed),
+        'rotated': report.rotated,
+        'wall_s': round(report.elapsed, 2),
+        'servers_per_min': round(report.servers_per_minute, 1),
+        'panel_requests': panel.request_count - requests_before,
+        'peak_per_node': max(panel.backup_peak_per_node.values(), default=0)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark orchestrated backups against the stub panel")
+    parser.add_argument('--servers', type=int, default=300)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--per-node', default='2,4', help="Comma-separated per-node concurrency caps to compare")
+    parser.add_argument('--total', type=int, default=50, help="Overall concurrency cap")
+    parser.add_argument('--backup-seconds', type=float, default=0.5)
+    parser.add_argument('--full-ratio', type=float, default=0.25, help="Share of servers already at their backup limit")
+    parser.add_argument('--poll-initial', type=float, default=0.1)
+    parser.add_argument('--poll-max', type=float, default=1.0)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--jitter', type=float, default=0.005)
+    args = parser.parse_args()
+    
+    for per_node in (int(v) for v in args.per_node.split(',') if v.strip()):
+        print(json.dumps(asyncio.run(run(args, per_node))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Decode cost and retained memory of a 10k-server listing: stdlib json vs orjson vs
+msgspec, kept as raw JSON:API dicts vs converted to the compact models in utils/models.py.
+
+    python -m benchmarks.bench_decode --servers 10000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from benchmarks.stub_panel import StubPanel
+from utils.models import Server, parse_list
+
+def _decoders() -> Dict[str, Callable[[bytes], object]]:
+    decoders = {'json': json.loads}
+    try:
+        import orjson
+        decoders['orjson'] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        decoders['msgspec'] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+    return decoders
+
+def build_payload(servers: int) -> bytes:
+    panel = StubPanel(servers=servers, users=max(1, servers // 20), nodes=5)
+    return json.dumps({
+        'object': 'list',
+        'data': [{'object': 'server', 'attributes': attrs} for attrs in panel.servers.values()],
+        'meta': {'pagination': {'total': servers, 'count': servers, 'per_page': servers,
+                                'current_page': 1, 'total_pages': 1, 'links': {}}}
+    }).encode()
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by the object ``build`` returns, once temporaries are freed"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark panel listing decode paths")
+    parser.add_argument('--servers', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    payload = build_payload(args.servers)
+    print(f"payload: {args.servers} servers, {len(payload) / 1024 / 1024:.1f} MiB")
+    print(f"{'decoder':<10} {'decode ms':>10} {'decode+models ms':>17} {'dicts KiB':>10} {'models KiB':>11}")
+    for name, loads in _decoders().items():
+        decode = best_of(lambda: loads(payload), args.repeat)
+        to_models = best_of(lambda: parse_list(loads(payload), Server), args.repeat)
+        dicts = retained_bytes(lambda: loads(payload)['data'])
+        models = retained_bytes(lambda: parse_list(loads(payload), Server))
+        print(f"{name:<10} {decode * 1000:>10.1f} {to_models * 1000:>17.1f} {dicts / 1024:>10.0f} {models / 1024:>11.0f}")
+
+if __name__ == "__main__":
+    main()
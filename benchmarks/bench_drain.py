@@ -0,0 +1,98 @@
+"""
+Drain planning speed: the pure best-fit-decreasing placement on synthetic
+fleets, then the full planner (index plus allocation fetches) against the
+stub panel.
+    
+    python -m benchmarks.bench_drain --servers 1000,5000,20000 --nodes 40
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import random
+import time
+from typing import Dict
+
+from benchmarks.stub_panel import StubPanel
+from utils.api import PterodactylAPI
+from utils.drain import DrainPlanner, plan_drain
+from utils.index import PanelIndex
+from utils.models import Allocation, Node, Server
+
+def _fleet(servers: int, nodes: int, seed: int = 1):
+    rng = random.Random(seed)
+    # Sized so the fleet fills roughly 70% of the memory
+    node_memory = servers // nodes * 4096 * 2
+    node_list = [
+        Node(i, f"node-{i}", f"node{i}.example.com", 'https', 8080, 1 + i % 3,
+             node_memory, rng.choice([0, 10, 25]), node_memory * 5, 0, False, None)
+        for i in range(1, nodes + 1)
+    ]
+    server_list = [
+        Server(i, f"uuid-{i}", f"id{i}", f"server-{i}", False, 1, 1 + i % nodes, i, 1,
+               rng.choice([1024, 2048, 4096, 8192]), 0, rng.choice([5120, 10240, 20480]), 500, 100,
+               None, 0, 1, 2, None)
+        for i in range(1, servers + 1)
+    ]
+    free = {
+        node.id: [Allocation(node.id * 100_000 + p, '0.0.0.0', 25565 + p, None, False) for p in range(servers // nodes + 50)]
+        for node in node_list
+    }
+    return node_list, server_list, free
+
+def bench_pure(servers: int, nodes: int, repeat: int) -> Dict:
+    node_list, server_list, free = _fleet(servers, nodes)
+    # Put a fifth of the fleet on the node being drained
+    source = node_list[0]
+    server_list = [s if i % 5 else dataclasses.replace(s, node=source.id) for i, s in enumerate(server_list)]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        plan = plan_drain(source, node_list, server_list, free)
+        timings.append(time.perf_counter() - start)
+    return {
+        'mode': 'pure', 'servers': servers, 'nodes': nodes,
+        'to_move': len(plan.moves) + len(plan.unplaced), 'placed': len(plan.moves), 'unplaced': len(plan.unplaced),
+        'best_ms': round(min(timings) * 1000, 1), 'median_ms': round(sorted(timings)[len(timings) // 2] * 1000, 1)
+    }
+
+async def bench_stub(args) -> Dict:
+    panel = StubPanel(servers=args.stub_servers, users=50, nodes=args.stub_nodes, latency=args.latency)
+    for node in panel.nodes.values():
+        node['memory'] = args.stub_servers // args.stub_nodes * 8192 * 2
+    url = await panel.start()
+    try:
+        api = PterodactylAPI(url, 'ptla_benchmark', 'ptlc_benchmark')
+        index = PanelIndex(api)
+        await index.refresh()
+        planner = DrainPlanner(api, index)
+        requests_before = panel.request_count
+        start = time.perf_counter()
+        plan = await planner.plan(1)
+        elapsed = time.perf_counter() - start
+        await api.close()
+    finally:
+        await panel.stop()
+    return {
+        'mode': 'stub', 'servers': args.stub_servers, 'nodes': args.stub_nodes,
+        'to_move': len(plan.moves) + len(plan.unplaced), 'placed': len(plan.moves), 'unplaced': len(plan.unplaced),
+        'placement_ms': round(plan.seconds * 1000, 1), 'total_ms': round(elapsed * 1000, 1),
+        'panel_requests': panel.request_count - requests_before
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark node drain planning")
+    parser.add_argument('--servers', default='1000,5000,20000', help="Comma-separated fleet sizes for the pure planner")
+    parser.add_argument('--nodes', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stub-servers', type=int, default=3000)
+    parser.add_argument('--stub-nodes', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.01)
+    args = parser.parse_args()
+    
+    for servers in (int(v) for v in args.servers.split(',') if v.strip()):
+        print(json.dumps(bench_pure(servers, args.nodes, args.repeat)))
+    print(json.dumps(asyncio.run(bench_stub(args))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Embed build cost: the templated ``EmbedBuilder`` against building the same
+embeds from scratch with ``discord.Embed`` and ``add_field`` (how the builder
+worked before templates). Reports time and memory allocated per embed,
+optionally including ``to_dict()``, which discord.py calls on every send.
+
+    python -m benchmarks.bench_embeds --count 20000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+import discord
+
+from utils.embeds import EmbedBuilder
+from utils.models import Server
+
+SERVER = Server(1042, "9f1c2d3e-aaaa-bbbb-cccc-0123456789ab", "9f1c2d3e", "survival-eu", False, 7, 3, 1,
+                1, 4096, 0, 20480, 500, 200, None, 0, 1, 3, None, owner_discord_id=123456789012345678)
+
+def scratch_server_info(server: Server) -> discord.Embed:
+    embed = discord.Embed(title=f"🖥️ {server.name}", color=discord.Color.blue(), timestamp=datetime.utcnow())
+    embed.add_field(name="🆔 ID", value=server.id, inline=True)
+    embed.add_field(name="🔑 UUID", value=server.uuid[:8] + "...", inline=True)
+    embed.add_field(name="📊 Status", value="🟢 Active" if not server.suspended else "🔴 Suspended", inline=True)
+    embed.add_field(name="💾 RAM", value=f"{server.memory} MB", inline=True)
+    embed.add_field(name="⚙️ CPU", value=f"{server.cpu}%", inline=True)
+    embed.add_field(name="💿 Disk", value=f"{server.disk} MB", inline=True)
+    if server.owner_discord_id:
+        embed.add_field(name="👤 Owner", value=f"<@{server.owner_discord_id}>", inline=True)
+    embed.set_footer(text=f"Server UUID: {server.uuid}")
+    return embed
+
+def scratch_dm_server_created(server: Server) -> discord.Embed:
+    embed = discord.Embed(
+        title="✅ SERVER CREATED",
+        description="Your new server has been successfully created!",
+        color=discord.Color.green(),
+        timestamp=datetime.utcnow()
+    )
+    embed.add_field(name="📛 Server Name", value=server.name, inline=True)
+    embed.add_field(name="🆔 Server ID", value=str(server.id), inline=True)
+    embed.add_field(name="🖥️ Node", value="node-3", inline=True)
+    embed.add_field(name="💾 RAM", value=f"{server.memory} MB", inline=True)
+    embed.add_field(name="⚙️ CPU", value=f"{server.cpu}%", inline=True)
+    embed.add_field(name="💿 Disk", value=f"{server.disk} MB", inline=True)
+    embed.add_field(name="🎮 Version", value="1.21.1", inline=True)
+    embed.add_field(name="🌐 Panel URL", value="https://panel.example.com", inline=False)
+    embed.add_field(name="👤 Username", value="player1", inline=True)
+    embed.set_footer(text="Access your server at the panel URL above")
+    return embed
+
+def scratch_dm_server_suspended(server: Server) -> discord.Embed:
+    embed = discord.Embed(
+        title="⚠️ SERVER SUSPENDED",
+        description="Your server has been suspended and is temporarily unavailable.",
+        color=discord.Color.orange(),
+        timestamp=datetime.utcnow()
+    )
+    embed.add_field(name="🆔 Server ID", value=str(server.id), inline=True)
+    embed.add_field(name="📋 Reason", value="Expired", inline=False)
+    embed.add_field(name="📅 Suspended At", value=f"<t:{int(datetime.utcnow().timestamp())}:F>", inline=False)
+    embed.set_footer(text="Contact support if you believe this is an error")
+    return embed
+
+CASES = {
+    'server_info': (scratch_server_info, lambda s: EmbedBuilder.server_info(s)),
+    'dm_server_created': (
+        scratch_dm_server_created,
+        lambda s: EmbedBuilder.dm_server_created(s.name, str(s.id), "node-3", s.memory, s.cpu, s.disk,
+                                                 "1.21.1", "https://panel.example.com", "player1")
+    ),
+    'dm_server_suspended': (scratch_dm_server_suspended, lambda s: EmbedBuilder.dm_server_suspended(str(s.id), "Expired")),
+}
+
+def measure(build, count: int, serialize: bool):
+    """Seconds and bytes allocated per embed"""
+    start = time.perf_counter()
+    for _ in range(count):
+        embed = build(SERVER)
+        if serialize:
+            embed.to_dict()
+    seconds = (time.perf_counter() - start) / count
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(SERVER) for _ in range(1000)]
+    allocated = (tracemalloc.get_traced_memory()[0] - before) / len(kept)
+    tracemalloc.stop()
+    return seconds, allocated
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000, help="embeds built per measurement")
+    parser.add_argument('--serialize', action='store_true', help="include to_dict() in the timing")
+    parser.add_argument('--repeat', type=int, default=3, help="timings per path; the best is reported")
+    args = parser.parse_args()
+    
+    print(f"{'embed':<22}{'scratch µs':>12}{'template µs':>13}{'speedup':>9}{'scratch B':>11}{'template B':>12}")
+    for name, (scratch, templated) in CASES.items():
+        assert scratch(SERVER).to_dict().keys() == templated(SERVER).to_dict().keys()
+        # Warm up both paths before timing
+        measure(scratch, 500, args.serialize)
+        measure(templated, 500, args.serialize)
+        old_time, old_bytes = min(measure(scratch, args.count, args.serialize) for _ in range(args.repeat))
+        new_time, new_bytes = min(measure(templated, args.count, args.serialize) for _ in range(args.repeat))
+        print(f"{name:<22}{old_time * 1e6:>12.1f}{new_time * 1e6:>13.1f}{old_time / new_time:>8.2f}x"
+              f"{old_bytes:>11.0f}{new_bytes:>12.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Gateway cache memory and startup work per 1,000 guilds for each
+``MEMBER_CACHE`` mode. Synthetic GUILD_CREATE payloads are fed into
+discord.py's connection state as the gateway would. In ``full`` mode they carry
+the whole member list, as they do once chunking at startup has finished. In
+``low`` mode there is no chunking, so only channels and roles arrive, and
+nothing about members is cached. Each mode runs in a fresh subprocess so RSS
+numbers don't mix. A process running a shard range holds roughly its share of
+the guilds, so per-process memory is this figure times guilds / processes.
+
+    python -m benchmarks.bench_guild_memory --guilds 2000 --members 500
+"""
+import argparse
+import json
+import math
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import discord
+
+# Member cache flags and whether guilds are chunked, as PterodactylBot sets them per MEMBER_CACHE
+MODES = {
+    'full': (lambda intents: discord.MemberCacheFlags.from_intents(intents), True),
+    'low': (lambda intents: discord.MemberCacheFlags.none(), False),
+}
+
+# Members per GUILD_MEMBERS_CHUNK event
+CHUNK_SIZE = 1000
+
+def _snowflake(n: int) -> str:
+    return str((1_600_000_000_000 - 1_420_070_400_000 << 22) + n)
+
+def guild_payload(index: int, members: int, channels: int, roles: int) -> dict:
+    base = index * 100_000
+    return {
+        'id': _snowflake(base),
+        'name': f"guild-{index}",
+        'icon': None,
+        'owner_id': _snowflake(base + 1),
+        'member_count': members,
+        'large': members > 250,
+        'features': [],
+        'emojis': [],
+        'stickers': [],
+        'roles': [
+            {'id': _snowflake(base if r == 0 else base + 10 + r), 'name': f"role-{r}", 'color': 0, 'hoist': False,
+             'position': r, 'permissions': '0', 'managed': False, 'mentionable': False}
+            for r in range(roles)
+        ],
+        'channels': [
+            {'id': _snowflake(base + 100 + c), 'type': 0, 'name': f"channel-{c}", 'position': c,
+             'permission_overwrites': [], 'nsfw': False, 'parent_id': None}
+            for c in range(channels)
+        ],
+        'members': [
+            {
+                'user': {'id': _snowflake(base + 1000 + m), 'username': f"user{index}_{m}", 'discriminator': '0',
+                         'avatar': None, 'global_name': None},
+                'roles': [_snowflake(base + 10 + 1 + m % max(1, roles - 1))] if roles > 1 else [],
+                'joined_at': '2024-01-01T00:00:00+00:00',
+                'deaf': False,
+                'mute': False,
+                'flags': 0
+            }
+            for m in range(members)
+        ],
+        'voice_states': [],
+        'presences': [],
+        'threads': [],
+        'stage_instances': [],
+        'guild_scheduled_events': [],
+        'soundboard_sounds': [],
+    }
+
+def current_rss_kb() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+def measure(mode: str, guilds: int, members: int, channels: int, roles: int, trace: bool) -> dict:
+    """
+    Load ``guilds`` guilds into a client's connection state. With ``trace``
+    the Python heap they hold is counted with tracemalloc; without it RSS and
+    load time are measured, which tracemalloc would inflate.
+    """
+    intents = discord.Intents.default()
+    intents.members = True
+    flags, chunked = MODES[mode]
+    client = discord.Client(intents=intents, member_cache_flags=flags(intents), chunk_guilds_at_startup=chunked)
+    state = client._connection
+    payload_members = members if chunked else 0
+    
+    rss_before = current_rss_kb()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(guilds):
+        # Built per guild and dropped, as the gateway's decoded JSON would be
+        state._add_guild_from_data(guild_payload(i, payload_members, channels, roles))
+    elapsed = time.perf_counter() - start
+    result = {
+        'mode': mode,
+        'guilds': guilds,
+        'cached_members': sum(len(guild._members) for guild in state.guilds),
+        'cached_users': len(state._users),
+        # Each one is a gateway round trip before the guild counts as ready
+        'chunk_events': guilds * math.ceil(members / CHUNK_SIZE) if chunked else 0,
+    }
+    if trace:
+        result['kb_per_1k_guilds'] = tracemalloc.get_traced_memory()[0] / 1024 / guilds * 1000
+        tracemalloc.stop()
+    else:
+        result['rss_kb_per_1k_guilds'] = (current_rss_kb() - rss_before) / guilds * 1000
+        result['load_seconds'] = elapsed
+    return result
+
+def run_child(mode: str, args, trace: bool) -> dict:
+    command = [sys.executable, '-m', 'benchmarks.bench_guild_memory', '--mode', mode, '--guilds', str(args.guilds),
+               '--members', str(args.members), '--channels', str(args.channels), '--roles', str(args.roles)]
+    if trace:
+        command.append('--trace')
+    return json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--guilds', type=int, default=1000)
+    parser.add_argument('--members', type=int, default=500, help="members per guild")
+    parser.add_argument('--channels', type=int, default=30, help="channels per guild")
+    parser.add_argument('--roles', type=int, default=15, help="roles per guild")
+    parser.add_argument('--mode', choices=MODES, help="measure one mode in this process and print JSON")
+    parser.add_argument('--trace', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    args = parser.parse_args()
+    
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.guilds, args.members, args.channels, args.roles, args.trace)))
+        return
+    
+    results = [{**run_child(mode, args, trace=False), **run_child(mode, args, trace=True)} for mode in MODES]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.guilds} guilds · {args.members} members · {args.channels} channels · {args.roles} roles each")
+    print(f"{'mode':<8}{'members':>10}{'users':>10}{'heap MB/1k':>12}{'RSS MB/1k':>11}{'load s':>8}{'chunks':>8}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['cached_members']:>10}{r['cached_users']:>10}{r['kb_per_1k_guilds'] / 1024:>12.1f}"
+              f"{r['rss_kb_per_1k_guilds'] / 1024:>11.1f}{r['load_seconds']:>8.2f}{r['chunk_events']:>8}")
+
+if __name__ == '__main__':
+    main()
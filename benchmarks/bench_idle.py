@@ -0,0 +1,85 @@
+"""
+Idle detection against the stub panel with time scaled down: compares the
+number of resource samples with fixed-interval polling and checks the
+flagged servers against the stub's idle set.
+
+    python -m benchmarks.bench_idle --servers 1000 --idle-ratio 0.4 --seconds 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from benchmarks.stub_panel import StubPanel
+from utils.api import PterodactylAPI
+from utils.idle import IdleDetector
+from utils.index import PanelIndex
+
+async def run(args):
+    panel = StubPanel(servers=args.servers, users=args.users, nodes=args.nodes, latency=args.latency,
+                      jitter=args.jitter, idle_ratio=args.idle_ratio)
+    url = await panel.start()
+    try:
+        api = PterodactylAPI(url, 'ptla_benchmark', 'ptlc_benchmark')
+        index = PanelIndex(api)
+        await index.refresh()
+        
+        async def log_action(embed):
+            pass
+        
+        bot = SimpleNamespace(api=api, index=index, log_action=log_action)
+        detector = IdleDetector(
+            bot, idle_hours=args.idle_seconds / 3600, min_interval=args.min_interval,
+            max_interval=args.max_interval, rate=args.rate, concurrency=args.concurrency,
+            auto_stop=args.auto_stop
+        )
+        requests_before = panel.request_count
+        start = time.perf_counter()
+        detector.start()
+        await asyncio.sleep(args.seconds)
+        await detector.stop()
+        elapsed = time.perf_counter() - start
+        samples = panel.request_count - requests_before
+        await api.close()
+    finally:
+        await panel.stop()
+    
+    idle = {server['id'] for server in panel.servers.values() if panel.runtime[server['uuid']]['idle']}
+    stopped = {entry[2] for entry in panel.power_log if entry[3] == 'stop'}
+    flagged = {activity.server_id for activity in detector.activity.values() if activity.flagged} | stopped
+    fixed = args.servers * elapsed / args.min_interval
+    return {
+        'servers': args.servers,
+        'idle_servers': len(idle),
+        'seconds': round(elapsed, 1),
+        'panel_requests': samples,
+        'fixed_interval_requests': round(fixed),
+        'saved_pct': round(100 * (1 - samples / fixed), 1) if fixed else 0.0,
+        'flagged': len(flagged),
+        'false_positives': len(flagged - idle),
+        'missed': len(idle - flagged),
+        'stopped': len(stopped)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive idle detection against the stub panel")
+    parser.add_argument('--servers', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--idle-ratio', type=float, default=0.4)
+    parser.add_argument('--seconds', type=float, default=20, help="How long to run the detector")
+    parser.add_argument('--idle-seconds', type=float, default=5, help="Idle time before a server is flagged")
+    parser.add_argument('--min-interval', type=float, default=1.0)
+    parser.add_argument('--max-interval', type=float, default=8.0)
+    parser.add_argument('--rate', type=float, default=500, help="Samples per second")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--auto-stop', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--jitter', type=float, default=0.002)
+    args = parser.parse_args()
+    
+    print(json.dumps(asyncio.run(run(args))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Power fan-out against the stub panel: wall time and how closely starts on
+each node are bunched together, with and without staggering.
+    
+    python -m benchmarks.bench_power --servers 300 --nodes 3 --stagger 0,0.05,0.1
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from benchmarks.stub_panel import StubPanel
+from utils.api import PterodactylAPI
+from utils.power import PowerExecutor
+
+def _min_gap_ms(times: List[float]) -> float:
+    """Smallest gap between two consecutive signals on one node"""
+    times = sorted(times)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    return round(min(gaps) * 1000, 2) if gaps else 0.0
+
+async def run(args, stagger: float) -> Dict:
+    panel = StubPanel(servers=args.servers, users=args.users, nodes=args.nodes,
+                      latency=args.latency, jitter=args.jitter)
+    url = await panel.start()
+    try:
+        api = PterodactylAPI(url, 'ptla_benchmark', 'ptlc_benchmark')
+        servers = await api.fetch_all_servers()
+        node_of = {server.uuid: server.node for server in servers}
+        sent: Dict[int, List[float]] = {}
+        send_power_action = api.send_power_action
+        
+        async def timed_send(uuid: str, signal: str):
+            # When the executor lets the signal go, before client and stub scheduling add noise
+            sent.setdefault(node_of[uuid], []).append(time.monotonic())
+            return await send_power_action(uuid, signal)
+        
+        api.send_power_action = timed_send
+        executor = PowerExecutor(api, concurrency=args.concurrency, per_node=args.per_node, stagger=stagger)
+        report = await executor.run(servers, args.signal)
+        await api.close()
+    finally:
+        await panel.stop()
+    
+    by_node: Dict[int, List[float]] = {}
+    for at, node, _, _ in panel.power_log:
+        by_node.setdefault(node, []).append(at)
+    return {
+        'signal': args.signal,
+        'stagger_s': stagger,
+        'servers': len(servers),
+        'succeeded': len(report.succeeded),
+        'failed': len(report.failed),
+        'wall_s': round(report.elapsed, 2),
+        'min_gap_sent_ms': min((_min_gap_ms(times) for times in sent.values()), default=0.0),
+        'min_gap_received_ms': min((_min_gap_ms(times) for times in by_node.values()), default=0.0),
+        'peak_in_flight_per_node': max(report.peak_per_node.values(), default=0)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark power fan-out against the stub panel")
+    parser.add_argument('--servers', type=int, default=300)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--signal', default='restart', choices=('start', 'stop', 'restart', 'kill'))
+    parser.add_argument('--stagger', default='0,0.05', help="Comma-separated per-node stagger values to compare")
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--per-node', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    args = parser.parse_args()
+    
+    for stagger in (float(v) for v in args.stagger.split(',') if v.strip()):
+        print(json.dumps(asyncio.run(run(args, stagger))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Fake discord.py objects for driving cogs in-process without a gateway connection.
+
+Interactions record every response and followup, users own fake DM channels that
+can be configured to fail (DMs disabled) or be slow, and ``make_bot`` builds a real
+``PterodactylBot`` that never logs in.
+"""
+import asyncio
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+import discord
+
+class SentMessage:
+    """One recorded reply"""
+    __slots__ = ('kind', 'content', 'embed', 'ephemeral', 'view', 'at')
+    
+    def __init__(self, kind: str, content: Optional[str], embed: Optional[discord.Embed],
+                 ephemeral: bool, view: Optional[discord.ui.View]):
+        self.kind = kind
+        self.content = content
+        self.embed = embed
+        self.ephemeral = ephemeral
+        self.view = view
+        self.at = time.perf_counter()
+
+class FakeDMChannel:
+    """DM channel with a configurable failure rate and delivery latency"""
+    
+    def __init__(self, failure_rate: float = 0.0, latency: float = 0.0, rng: Optional[random.Random] = None):
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.random = rng or random.Random()
+        self.sent: List[discord.Embed] = []
+        self.failures = 0
+    
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            self.failures += 1
+            raise discord.Forbidden(
+                SimpleNamespace(status=403, reason='Forbidden'),
+                {'code': 50007, 'message': 'Cannot send messages to this user'}
+            )
+        self.sent.append(embed)
+
+class FakeUser:
+    """Discord user whose DMs go to a ``FakeDMChannel``"""
+    
+    def __init__(self, user_id: int, name: str, dm_channel: Optional[FakeDMChannel] = None):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.bot = False
+        self.dm_channel = dm_channel or FakeDMChannel()
+    
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+    
+    @property
+    def dms(self) -> List[discord.Embed]:
+        return self.dm_channel.sent
+    
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, **kwargs):
+        await self.dm_channel.send(content, embed=embed, **kwargs)
+
+class FakeUserFactory:
+    """Creates users sharing one DM failure rate and latency profile"""
+    
+    def __init__(self, dm_failure_rate: float = 0.0, dm_latency: float = 0.0, seed: int = 1, start_id: int = 10_000):
+        self.dm_failure_rate = dm_failure_rate
+        self.dm_latency = dm_latency
+        self.random = random.Random(seed)
+        self.created: List[FakeUser] = []
+        self._next_id = start_id
+    
+    def create(self, name: Optional[str] = None) -> FakeUser:
+        user_id = self._next_id
+        self._next_id += 1
+        channel = FakeDMChannel(self.dm_failure_rate, self.dm_latency, self.random)
+        user = FakeUser(user_id, name or f"user{user_id}", channel)
+        self.created.append(user)
+        return user
+    
+    @property
+    def dms_sent(self) -> int:
+        return sum(len(user.dm_channel.sent) for user in self.created)
+    
+    @property
+    def dm_failures(self) -> int:
+        return sum(user.dm_channel.failures for user in self.created)
+
+class FakeResponse:
+    """Records ``interaction.response`` calls and enforces the respond-once rule"""
+    
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+    
+    def is_done(self) -> bool:
+        return self._done
+    
+    def _complete(self):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+        self._interaction.first_response_at = time.perf_counter()
+    
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False):
+        self._complete()
+    
+    async def send_message(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                           ephemeral: bool = False, view: Optional[discord.ui.View] = None, **kwargs):
+        self._complete()
+        self._interaction.messages.append(SentMessage('response', content, embed, ephemeral, view))
+    
+    async def edit_message(self, *, content: Optional[str] = None, embed: Optional[discord.Embed] = None,
+                           view: Optional[discord.ui.View] = None, **kwargs):
+        self._complete()
+        self._interaction.messages.append(SentMessage('edit', content, embed, True, view))
+
+class FakeFollowup:
+    """Records ``interaction.followup.send`` calls"""
+    
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+    
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   ephemeral: bool = False, view: Optional[discord.ui.View] = None, **kwargs):
+        if not self._interaction.response.is_done():
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Webhook')
+        self._interaction.messages.append(SentMessage('followup', content, embed, ephemeral, view))
+
+class FakeInteraction:
+    """Stand-in for ``discord.Interaction`` recording every reply a command makes"""
+    
+    def __init__(self, client, user: FakeUser, command=None):
+        self.client = client
+        self.user = user
+        self.command = command
+        self.guild = None
+        self.channel = None
+        self.extras = {}
+        self.created_at = discord.utils.utcnow()
+        self.started_at = time.perf_counter()
+        self.first_response_at: Optional[float] = None
+        self.messages: List[SentMessage] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+    
+    @property
+    def embeds(self) -> List[discord.Embed]:
+        return [message.embed for message in self.messages if message.embed is not None]
+    
+    @property
+    def failed(self) -> bool:
+        """True when the command replied with an error embed"""
+        return any((embed.title or '').startswith('❌') for embed in self.embeds)
+    
+    @property
+    def time_to_first_response(self) -> Optional[float]:
+        if self.first_response_at is None:
+            return None
+        return self.first_response_at - self.started_at
+
+def make_bot(panel_url: str):
+    """Build a PterodactylBot pointed at ``panel_url`` without connecting to Discord"""
+    os.environ['PANEL_URL'] = panel_url
+    os.environ.pop('PANELS', None)
+    os.environ.setdefault('APP_API_KEY', 'ptla_benchmark')
+    os.environ.setdefault('CLIENT_API_KEY', 'ptlc_benchmark')
+    os.environ.setdefault('ADMIN_IDS', '1')
+    os.environ['LOG_CHANNEL_ID'] = '0'
+    
+    from bot import PterodactylBot
+    return PterodactylBot()
@@ -0,0 +1,203 @@
+"""
+Drive thousands of concurrent ServerCommands invocations in-process through fake
+interactions against the stub panel, measuring event-loop lag and memory per
+in-flight command.
+
+    python -m benchmarks.load_harness --commands 2000 --mix suspend,server_info,set_resources --dm-failure-rate 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.fakes import FakeInteraction, FakeUser, FakeUserFactory, make_bot
+from benchmarks.panel_bench import percentile
+from benchmarks.stub_panel import StubPanel
+
+class LoopLagSampler:
+    """Measures how late a periodic timer fires, i.e. how long the loop was busy"""
+    
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+    
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+    
+    def summary(self) -> Dict:
+        return {
+            'loop_lag_p50_ms': round(percentile(self.samples, 50) * 1000, 2),
+            'loop_lag_p99_ms': round(percentile(self.samples, 99) * 1000, 2),
+            'loop_lag_max_ms': round(max(self.samples, default=0) * 1000, 2)
+        }
+
+def _command_factories(cog, server_ids: List[int], owner: FakeUser, users: FakeUserFactory,
+                       nodes: int) -> Dict[str, Callable[[FakeInteraction, int], object]]:
+    """Map of command name -> coroutine factory for one invocation"""
+    return {
+        'createserver': lambda interaction, i: cog.create_server.callback(
+            cog, interaction, name=f"load-{i}", ram=1024, cpu=100, disk=5120, version='1.20.4',
+            node_id=1 + i % nodes, egg_id=1, user=users.create(f"load{i}")
+        ),
+        'suspend': lambda interaction, i: cog.suspend_server.callback(
+            cog, interaction, server_id=server_ids[i % len(server_ids)], user=owner, reason='load test'
+        ),
+        'unsuspend': lambda interaction, i: cog.unsuspend_server.callback(
+            cog, interaction, server_id=server_ids[i % len(server_ids)], user=owner
+        ),
+        'set_resources': lambda interaction, i: cog.set_resources.callback(
+            cog, interaction, server_id=server_ids[i % len(server_ids)], user=owner, ram=2048, cpu=None, disk=None
+        ),
+        'server_info': lambda interaction, i: cog.server_info.callback(
+            cog, interaction, server_id=server_ids[i % len(server_ids)]
+        ),
+        'list_servers': lambda interaction, i: cog.list_servers.callback(cog, interaction, page=1 + i % 5)
+    }
+
+async def run(args) -> Dict:
+    from utils.cogs.servers import ServerCommands
+    
+    panel = StubPanel(servers=args.servers, users=args.users, nodes=args.nodes, latency=args.latency,
+                      jitter=args.jitter, rate_limit_ratio=args.rate_limit_ratio)
+    url = await panel.start()
+    try:
+        bot = make_bot(url)
+        bot.events.start()
+        cog = ServerCommands(bot)
+        if args.warm_index:
+            await bot.index.refresh()
+        panel_requests_before = panel.request_count
+        users = FakeUserFactory(dm_failure_rate=args.dm_failure_rate, dm_latency=args.dm_latency)
+        admin = FakeUser(1, 'admin')
+        owner = users.create('owner')
+        factories = _command_factories(cog, list(panel.servers), owner, users, args.nodes)
+        mix = [name.strip() for name in args.mix.split(',') if name.strip()]
+        unknown = [name for name in mix if name not in factories]
+        if unknown:
+            raise SystemExit(f"Unknown commands in --mix: {', '.join(unknown)} (choose from {', '.join(factories)})")
+        
+        rng = random.Random(args.seed)
+        plan = [rng.choice(mix) for _ in range(args.commands)]
+        semaphore = asyncio.Semaphore(args.concurrency)
+        in_flight = 0
+        peak_in_flight = 0
+        peak_traced = 0
+        latencies: Dict[str, List[float]] = {name: [] for name in mix}
+        first_response: List[float] = []
+        failures: Dict[str, int] = {name: 0 for name in mix}
+        errors: Dict[str, int] = {}
+        
+        async def invoke(i: int, name: str):
+            nonlocal in_flight, peak_in_flight, peak_traced
+            async with semaphore:
+                interaction = FakeInteraction(bot, admin)
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+                try:
+                    await factories[name](interaction, i)
+                except Exception as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                finally:
+                    if tracemalloc.is_tracing() and in_flight == peak_in_flight:
+                        peak_traced = max(peak_traced, tracemalloc.get_traced_memory()[0])
+                    in_flight -= 1
+                latencies[name].append(time.perf_counter() - interaction.started_at)
+                if interaction.time_to_first_response is not None:
+                    first_response.append(interaction.time_to_first_response)
+                if interaction.failed:
+                    failures[name] += 1
+        
+        lag = LoopLagSampler(args.lag_interval)
+        if args.trace_memory:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0] if args.trace_memory else 0
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        
+        lag.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(invoke(i, name) for i, name in enumerate(plan)))
+        wall = time.perf_counter() - start
+        # DMs and log messages are delivered by event subscribers after the commands return
+        await bot.events.stop(timeout=None)
+        await bot.panels.close()
+        drain = time.perf_counter() - start - wall
+        await lag.stop()
+        
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if args.trace_memory:
+            tracemalloc.stop()
+    finally:
+        await panel.stop()
+    
+    result = {
+        'commands': args.commands,
+        'concurrency': args.concurrency,
+        'wall_s': round(wall, 3),
+        'event_drain_s': round(drain, 3),
+        'throughput_per_s': round(args.commands / wall, 1) if wall else 0.0,
+        'peak_in_flight': peak_in_flight,
+        'first_response_p99_ms': round(percentile(first_response, 99) * 1000, 1),
+        'max_rss_growth_kb': rss_after - rss_before,
+        'dms_sent': users.dms_sent,
+        'dm_failures': users.dm_failures,
+        'panel_requests': panel.request_count - panel_requests_before,
+        'rate_limited': panel.rate_limited_count,
+        'exceptions': errors,
+        'per_command': {
+            name: {
+                'calls': len(samples),
+                'failed': failures[name],
+                'p50_ms': round(percentile(samples, 50) * 1000, 1),
+                'p99_ms': round(percentile(samples, 99) * 1000, 1)
+            } for name, samples in latencies.items()
+        }
+    }
+    result.update(lag.summary())
+    if args.trace_memory and peak_in_flight:
+        result['traced_bytes_per_in_flight'] = round(max(0, peak_traced - baseline) / peak_in_flight)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test of ServerCommands with fake interactions")
+    parser.add_argument('--commands', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--mix', default='suspend,unsuspend,server_info,set_resources')
+    parser.add_argument('--servers', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0)
+    parser.add_argument('--dm-failure-rate', type=float, default=0.0)
+    parser.add_argument('--dm-latency', type=float, default=0.0)
+    parser.add_argument('--lag-interval', type=float, default=0.01)
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help="Skip tracemalloc (it slows everything down)")
+    parser.add_argument('--warm-index', action='store_true',
+                        help="Load the panel index before the run so commands start from cached models")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Scripted load scenarios driving the cog command callbacks against the stub panel.
+
+    python -m benchmarks.panel_bench --scenario all --latency 0.02 --rate-limit-ratio 0.02
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks.fakes import FakeInteraction, FakeUser, make_bot
+from benchmarks.stub_panel import StubPanel
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_calls(calls: List[Callable[[], Awaitable[FakeInteraction]]], concurrency: int) -> Dict:
+    """Run command invocations with bounded concurrency, timing each one"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+    
+    async def timed(call):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            interaction = await call()
+            latencies.append(time.perf_counter() - start)
+            if interaction.failed:
+                failures += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(call) for call in calls))
+    wall = time.perf_counter() - start
+    return {
+        'calls': len(calls),
+        'failed': failures,
+        'wall_s': round(wall, 3),
+        'throughput_per_s': round(len(calls) / wall, 1) if wall else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0
+    }
+
+# ==================== SCENARIOS ====================
+
+async def scenario_create_burst(args) -> Dict:
+    """Burst of /createserver for distinct new users on a fresh panel"""
+    from utils.cogs.servers import ServerCommands
+    
+    panel = StubPanel(servers=0, users=0, nodes=args.nodes, latency=args.latency, jitter=args.jitter,
+                      per_page=args.per_page, rate_limit_ratio=args.rate_limit_ratio)
+    url = await panel.start()
+    try:
+        bot = make_bot(url)
+        bot.events.start()
+        cog = ServerCommands(bot)
+        admin = FakeUser(1, 'admin')
+        
+        def make_call(i: int):
+            async def call():
+                interaction = FakeInteraction(bot, admin)
+                await cog.create_server.callback(
+                    cog, interaction, name=f"bench-{i}", ram=1024, cpu=100, disk=5120,
+                    version='1.20.4', node_id=1 + i % args.nodes, egg_id=1, user=FakeUser(10_000 + i, f"bench{i}")
+                )
+                return interaction
+            return call
+        
+        result = await run_calls([make_call(i) for i in range(args.creates)], args.concurrency)
+        await bot.events.stop()
+        await bot.panels.close()
+    finally:
+        await panel.stop()
+    result.update(panel_requests=panel.request_count, rate_limited=panel.rate_limited_count)
+    return result
+
+async def scenario_search(args) -> Dict:
+    """/server_search over a large panel"""
+    from utils.cogs.servers import ServerCommands
+    
+    panel = StubPanel(servers=args.servers, users=args.users, nodes=args.nodes, latency=args.latency,
+                      jitter=args.jitter, per_page=args.per_page, rate_limit_ratio=args.rate_limit_ratio)
+    url = await panel.start()
+    try:
+        bot = make_bot(url)
+        bot.events.start()
+        cog = ServerCommands(bot)
+        admin = FakeUser(1, 'admin')
+        # Name of the last seeded server, so a complete search has to see every page
+        needle = f"server-{args.servers - 1}"
+        
+        def make_call():
+            async def call():
+                interaction = FakeInteraction(bot, admin)
+                await cog.server_search.callback(cog, interaction, name=needle)
+                return interaction
+            return call
+        
+        result = await run_calls([make_call() for _ in range(args.searches)], args.concurrency)
+        probe = FakeInteraction(bot, admin)
+        await cog.server_search.callback(cog, probe, name=needle)
+        result['found_target'] = any(
+            any(needle in field.name for field in embed.fields) for embed in probe.embeds
+        )
+        await bot.events.stop()
+        await bot.panels.close()
+    finally:
+        await panel.stop()
+    result.update(panel_requests=panel.request_count, rate_limited=panel.rate_limited_count)
+    return result
+
+async def scenario_bulk_suspend(args) -> Dict:
+    """/suspend across many existing servers"""
+    from utils.cogs.servers import ServerCommands
+    
+    panel = StubPanel(servers=args.suspends, users=args.users, nodes=args.nodes, latency=args.latency,
+                      jitter=args.jitter, per_page=args.per_page, rate_limit_ratio=args.rate_limit_ratio)
+    url = await panel.start()
+    try:
+        bot = make_bot(url)
+        bot.events.start()
+        cog = ServerCommands(bot)
+        admin = FakeUser(1, 'admin')
+        owner = FakeUser(2, 'owner')
+        # Steady state: the change feed keeps the index warm
+        await bot.index.refresh()
+        panel_requests_before = panel.request_count
+        
+        def make_call(server_id: int):
+            async def call():
+                interaction = FakeInteraction(bot, admin)
+                await cog.suspend_server.callback(cog, interaction, server_id=server_id, user=owner, reason='benchmark')
+                return interaction
+            return call
+        
+        result = await run_calls([make_call(server_id) for server_id in list(panel.servers)], args.concurrency)
+        result['suspended'] = sum(1 for s in panel.servers.values() if s['suspended'])
+        await bot.events.stop()
+        await bot.panels.close()
+    finally:
+        await panel.stop()
+    result.update(panel_requests=panel.request_count - panel_requests_before, rate_limited=panel.rate_limited_count)
+    return result
+
+SCENARIOS = {
+    'create_burst': scenario_create_burst,
+    'search': scenario_search,
+    'bulk_suspend': scenario_bulk_suspend
+}
+
+async def run(args) -> Dict[str, Dict]:
+    names = list(SCENARIOS) if args.scenario == 'all' else [args.scenario]
+    results = {}
+    for name in names:
+        results[name] = await SCENARIOS[name](args)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cog commands against a stub panel")
+    parser.add_argument('--scenario', choices=['all', *SCENARIOS], default='all')
+    parser.add_argument('--servers', type=int, default=10_000, help="Servers seeded for the search scenario")
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--creates', type=int, default=100)
+    parser.add_argument('--searches', type=int, default=20)
+    parser.add_argument('--suspends', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0)
+    parser.add_argument('--json', action='store_true', help="Print raw JSON results")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f"== {name}")
+        for key, value in result.items():
+            print(f"   {key:<18} {value}")
+
+if __name__ == "__main__":
+    main()
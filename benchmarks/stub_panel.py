@@ -0,0 +1,565 @@
+"""
+In-process stub of the Pterodactyl application and client APIs used by utils/api.py.
+
+Run standalone with ``python -m benchmarks.stub_panel --servers 10000`` or start it
+from a benchmark with ``await StubPanel(...).start()``.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from aiohttp import web
+from typing import Dict, List, Optional
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class StubPanel:
+    """Fake panel with configurable latency, page size and 429 injection"""
+    
+    def __init__(self, servers: int = 100, users: int = 50, nodes: int = 3,
+                 allocations_per_node: int = 2000, latency: float = 0.0, jitter: float = 0.0,
+                 per_page: int = 50, rate_limit_ratio: float = 0.0, seed: int = 1,
+                 backup_seconds: float = 0.0, idle_ratio: float = 0.0):
+        self.latency = latency
+        self.backup_seconds = backup_seconds
+        self.idle_ratio = idle_ratio
+        self.jitter = jitter
+        self.per_page = per_page
+        self.rate_limit_ratio = rate_limit_ratio
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.requests_by_route: Dict[str, int] = {}
+        
+        self.users: Dict[int, Dict] = {}
+        self.servers: Dict[int, Dict] = {}
+        self.nodes: Dict[int, Dict] = {}
+        self.allocations: Dict[int, Dict[int, Dict]] = {}
+        self.eggs: Dict[int, Dict] = {
+            1: {
+                'id': 1, 'uuid': str(uuid.uuid4()), 'name': 'Paper', 'nest': 1, 'author': 'parker@pterodactyl.io',
+                'description': 'High performance Spigot fork', 'docker_image': 'ghcr.io/pterodactyl/yolks:java_17',
+                'startup': 'java -Xms128M -Xmx{{SERVER_MEMORY}}M -jar {{SERVER_JARFILE}}',
+                'created_at': _now(), 'updated_at': _now()
+            }
+        }
+        self.backups: Dict[str, List[Dict]] = {}
+        # Running backups: uuid -> (node, backup, finishes at); peak concurrency per node for benchmarks
+        self._backup_running: Dict[str, tuple] = {}
+        self.backup_peak_per_node: Dict[int, int] = {}
+        # Wings-side runtime state per server uuid and every power signal received, for benchmarks
+        self.runtime: Dict[str, Dict] = {}
+        self.power_log: List[tuple] = []
+        # Nodes whose Wings daemon is down: client requests the panel proxies to them answer 500
+        self.wings_down: set = set()
+        self._by_uuid: Dict[str, Dict] = {}
+        self._alloc_order: Dict[int, List[int]] = {}
+        self._alloc_cursor: Dict[int, int] = {}
+        self._next_ids = {'user': 1, 'server': 1, 'allocation': 1}
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+        
+        # Always leave room for every seeded server plus some headroom for creates
+        allocations_per_node = max(allocations_per_node, -(-servers // max(nodes, 1)) + 500)
+        for node_id in range(1, nodes + 1):
+            self._add_node(node_id, allocations_per_node)
+        for i in range(users):
+            # Seeded users are linked to Discord IDs starting at 10000, like FakeUserFactory
+            self._add_user(f"user{i}@discord.local", f"user{i}", external_id=str(10_000 + i))
+        user_ids = list(self.users)
+        node_ids = list(self.nodes)
+        for i in range(servers):
+            self._add_server(
+                name=f"server-{i}",
+                user_id=user_ids[i % len(user_ids)] if user_ids else 1,
+                node_id=node_ids[i % len(node_ids)],
+                memory=self.random.choice([1024, 2048, 4096, 8192]),
+                cpu=self.random.choice([100, 200]),
+                disk=self.random.choice([5120, 10240, 20480])
+            )
+    
+    # ==================== SEED DATA ====================
+    
+    def _next(self, kind: str) -> int:
+        value = self._next_ids[kind]
+        self._next_ids[kind] += 1
+        return value
+    
+    def _add_node(self, node_id: int, allocations: int):
+        self.nodes[node_id] = {
+            'id': node_id, 'uuid': str(uuid.uuid4()), 'public': True, 'name': f"node-{node_id}",
+            'description': None, 'location_id': 1, 'fqdn': f"node{node_id}.example.com", 'scheme': 'https',
+            'behind_proxy': False, 'maintenance_mode': False, 'memory': 262144, 'memory_overallocate': 0,
+            'disk': 4194304, 'disk_overallocate': 0, 'upload_size': 100, 'daemon_listen': 8080,
+            'daemon_sftp': 2022, 'daemon_base': '/var/lib/pterodactyl/volumes',
+            'created_at': _now(), 'updated_at': _now()
+        }
+        self.allocations[node_id] = {}
+        for port in range(25565, 25565 + allocations):
+            alloc_id = self._next('allocation')
+            self.allocations[node_id][alloc_id] = {
+                'id': alloc_id, 'ip': '0.0.0.0', 'alias': None, 'port': port, 'notes': None, 'assigned': False
+            }
+        self._alloc_order[node_id] = list(self.allocations[node_id])
+        self._alloc_cursor[node_id] = 0
+    
+    def _add_user(self, email: str, username: str, first_name: str = 'Stub', last_name: str = 'User',
+                  external_id: Optional[str] = None) -> Dict:
+        user_id = self._next('user')
+        user = {
+            'id': user_id, 'external_id': external_id, 'uuid': str(uuid.uuid4()), 'username': username,
+            'email': email, 'first_name': first_name, 'last_name': last_name, 'language': 'en',
+            'root_admin': False, '2fa': False, 'created_at': _now(), 'updated_at': _now()
+        }
+        self.users[user_id] = user
+        return user
+    
+    def _take_allocation(self, node_id: int, alloc_id: Optional[int] = None) -> Optional[int]:
+        pool = self.allocations.get(node_id, {})
+        if alloc_id is not None:
+            alloc = pool.get(alloc_id)
+            if alloc is None or alloc['assigned']:
+                return None
+            alloc['assigned'] = True
+            return alloc_id
+        order = self._alloc_order.get(node_id, [])
+        start = self._alloc_cursor.get(node_id, 0)
+        for offset in range(len(order)):
+            index = (start + offset) % len(order)
+            alloc = pool[order[index]]
+            if not alloc['assigned']:
+                alloc['assigned'] = True
+                self._alloc_cursor[node_id] = index + 1
+                return alloc['id']
+        return None
+    
+    def _add_server(self, name: str, user_id: int, node_id: int, memory: int, cpu: int, disk: int,
+                    egg_id: int = 1, allocation_id: Optional[int] = None) -> Optional[Dict]:
+        allocation = self._take_allocation(node_id, allocation_id)
+        if allocation is None:
+            return None
+        server_id = self._next('server')
+        server_uuid = str(uuid.uuid4())
+        server = {
+            'id': server_id, 'external_id': None, 'uuid': server_uuid, 'identifier': server_uuid[:8],
+            'name': name, 'description': '', 'status': None, 'suspended': False,
+            'limits': {'memory': memory, 'swap': 0, 'disk': disk, 'io': 500, 'cpu': cpu, 'threads': None, 'oom_disabled': True},
+            'feature_limits': {'databases': 1, 'allocations': 1, 'backups': 2},
+            'user': user_id, 'node': node_id, 'allocation': allocation, 'nest': 1, 'egg': egg_id,
+            'container': {'startup_command': '', 'image': self.eggs[egg_id]['docker_image'], 'installed': 1, 'environment': {}},
+            'created_at': _now(), 'updated_at': _now()
+        }
+        self.servers[server_id] = server
+        self._by_uuid[server_uuid] = server
+        self._by_uuid[server['identifier']] = server
+        self.backups[server_uuid] = []
+        self.runtime[server_uuid] = {
+            'state': 'running', 'idle': self.idle_ratio > 0 and self.random.random() < self.idle_ratio,
+            'network': 0, 'started_at': time.monotonic()
+        }
+        return server
+    
+    # ==================== HELPERS ====================
+    
+    @staticmethod
+    def _item(kind: str, attrs: Dict) -> Dict:
+        return {'object': kind, 'attributes': attrs}
+    
+    def _with_includes(self, request: web.Request, server: Dict) -> Dict:
+        """Attach the owning user when the request asks for ``include=user``"""
+        if 'user' not in request.query.get('include', '').split(','):
+            return server
+        owner = self.users.get(server['user'])
+        return dict(server, relationships={'user': self._item('user', owner) if owner else None})
+    
+    def _paginate(self, request: web.Request, kind: str, items: List[Dict]) -> web.Response:
+        try:
+            page = max(1, int(request.query.get('page', '1')))
+            per_page = min(int(request.query.get('per_page', self.per_page)), 100)
+        except ValueError:
+            return self._error(422, 'Invalid pagination parameters')
+        total = len(items)
+        total_pages = max(1, -(-total // per_page))
+        chunk = items[(page - 1) * per_page:page * per_page]
+        return web.json_response({
+            'object': 'list',
+            'data': [self._item(kind, item) for item in chunk],
+            'meta': {'pagination': {
+                'total': total, 'count': len(chunk), 'per_page': per_page,
+                'current_page': page, 'total_pages': total_pages, 'links': {}
+            }}
+        })
+    
+    @staticmethod
+    def _filter(request: web.Request, items: List[Dict], fields: List[str]) -> List[Dict]:
+        for field in fields:
+            value = request.query.get(f'filter[{field}]')
+            if value:
+                needle = value.lower()
+                items = [item for item in items if needle in str(item.get(field) or '').lower()]
+        return items
+    
+    @staticmethod
+    def _error(status: int, detail: str) -> web.Response:
+        return web.json_response(
+            {'errors': [{'code': 'StubError', 'status': str(status), 'detail': detail}]},
+            status=status
+        )
+    
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        # Before the simulated latency, so logged times reflect when the client sent the request
+        request['received_at'] = time.monotonic()
+        self.request_count += 1
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        key = f"{request.method} {route}"
+        self.requests_by_route[key] = self.requests_by_route.get(key, 0) + 1
+        
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.rate_limit_ratio and self.random.random() < self.rate_limit_ratio:
+            self.rate_limited_count += 1
+            response = self._error(429, 'Too Many Attempts.')
+            response.headers['Retry-After'] = '1'
+            return response
+        return await handler(request)
+    
+    # ==================== APPLICATION API: USERS ====================
+    
+    async def list_users(self, request: web.Request) -> web.Response:
+        users = self._filter(request, list(self.users.values()), ['email', 'username', 'uuid', 'external_id'])
+        return self._paginate(request, 'user', users)
+    
+    async def create_user(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if any(u['email'] == body.get('email') for u in self.users.values()):
+            return self._error(422, 'The email has already been taken.')
+        user = self._add_user(body['email'], body['username'], body.get('first_name', ''),
+                              body.get('last_name', ''), body.get('external_id'))
+        return web.json_response(self._item('user', user), status=201)
+    
+    async def get_user(self, request: web.Request) -> web.Response:
+        user = self.users.get(int(request.match_info['id']))
+        if not user:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return web.json_response(self._item('user', user))
+    
+    async def get_user_by_external_id(self, request: web.Request) -> web.Response:
+        external_id = request.match_info['external_id']
+        user = next((u for u in self.users.values() if u['external_id'] == external_id), None)
+        if not user:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return web.json_response(self._item('user', user))
+    
+    async def update_user(self, request: web.Request) -> web.Response:
+        user = self.users.get(int(request.match_info['id']))
+        if not user:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        body = await request.json()
+        for key in ('email', 'username', 'first_name', 'last_name', 'external_id'):
+            if key in body:
+                user[key] = body[key]
+        user['updated_at'] = _now()
+        return web.json_response(self._item('user', user))
+    
+    async def delete_user(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info['id'])
+        if user_id not in self.users:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        if any(s['user'] == user_id for s in self.servers.values()):
+            return self._error(400, 'Cannot delete a user with active servers attached to their account.')
+        del self.users[user_id]
+        return web.Response(status=204)
+    
+    # ==================== APPLICATION API: SERVERS ====================
+    
+    async def list_servers(self, request: web.Request) -> web.Response:
+        servers = self._filter(request, list(self.servers.values()), ['name', 'uuid', 'external_id'])
+        return self._paginate(request, 'server', [self._with_includes(request, s) for s in servers])
+    
+    async def create_server(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body.get('user') not in self.users:
+            return self._error(422, 'The selected user is invalid.')
+        if body.get('egg') not in self.eggs:
+            return self._error(422, 'The selected egg is invalid.')
+        allocation_id = body.get('allocation', {}).get('default')
+        node_id = next((n for n, pool in self.allocations.items() if allocation_id in pool), None)
+        if node_id is None:
+            return self._error(422, 'The requested allocation is not available.')
+        limits = body.get('limits', {})
+        server = self._add_server(
+            name=body.get('name', 'server'), user_id=body['user'], node_id=node_id,
+            memory=limits.get('memory', 1024), cpu=limits.get('cpu', 100), disk=limits.get('disk', 5120),
+            egg_id=body['egg'], allocation_id=allocation_id
+        )
+        if server is None:
+            return self._error(422, 'The requested allocation is already assigned.')
+        server['limits'].update({k: v for k, v in limits.items() if k in server['limits']})
+        server['feature_limits'].update(body.get('feature_limits', {}))
+        return web.json_response(self._item('server', server), status=201)
+    
+    def _server_or_404(self, request: web.Request):
+        return self.servers.get(int(request.match_info['id']))
+    
+    async def get_server(self, request: web.Request) -> web.Response:
+        server = self._server_or_404(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return web.json_response(self._item('server', self._with_includes(request, server)))
+    
+    async def delete_server(self, request: web.Request) -> web.Response:
+        server = self._server_or_404(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        del self.servers[server['id']]
+        self._by_uuid.pop(server['uuid'], None)
+        self._by_uuid.pop(server['identifier'], None)
+        self.allocations[server['node']][server['allocation']]['assigned'] = False
+        self.backups.pop(server['uuid'], None)
+        return web.Response(status=204)
+    
+    async def suspend_server(self, request: web.Request) -> web.Response:
+        return self._set_suspended(request, True)
+    
+    async def unsuspend_server(self, request: web.Request) -> web.Response:
+        return self._set_suspended(request, False)
+    
+    def _set_suspended(self, request: web.Request, suspended: bool) -> web.Response:
+        server = self._server_or_404(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        server['suspended'] = suspended
+        server['status'] = 'suspended' if suspended else None
+        server['updated_at'] = _now()
+        return web.Response(status=204)
+    
+    async def update_build(self, request: web.Request) -> web.Response:
+        server = self._server_or_404(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        body = await request.json()
+        allocation = body.get('allocation')
+        if allocation not in self.allocations[server['node']]:
+            return self._error(422, 'The selected allocation is invalid.')
+        if allocation != server['allocation']:
+            self.allocations[server['node']][server['allocation']]['assigned'] = False
+            self.allocations[server['node']][allocation]['assigned'] = True
+            server['allocation'] = allocation
+        server['limits'].update({k: v for k, v in body.get('limits', {}).items() if k in server['limits']})
+        server['feature_limits'].update(body.get('feature_limits', {}))
+        server['updated_at'] = _now()
+        return web.json_response(self._item('server', server))
+    
+    # ==================== APPLICATION API: NODES & EGGS ====================
+    
+    async def list_nodes(self, request: web.Request) -> web.Response:
+        return self._paginate(request, 'node', list(self.nodes.values()))
+    
+    async def get_node(self, request: web.Request) -> web.Response:
+        node = self.nodes.get(int(request.match_info['id']))
+        if not node:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return web.json_response(self._item('node', node))
+    
+    async def list_allocations(self, request: web.Request) -> web.Response:
+        node_id = int(request.match_info['id'])
+        if node_id not in self.nodes:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return self._paginate(request, 'allocation', list(self.allocations[node_id].values()))
+    
+    async def list_eggs(self, request: web.Request) -> web.Response:
+        return self._paginate(request, 'egg', list(self.eggs.values()))
+    
+    async def get_egg(self, request: web.Request) -> web.Response:
+        egg = self.eggs.get(int(request.match_info['id']))
+        if not egg:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        return web.json_response(self._item('egg', egg))
+    
+    # ==================== CLIENT API ====================
+    
+    def _server_by_uuid(self, request: web.Request) -> Optional[Dict]:
+        return self._by_uuid.get(request.match_info['uuid'])
+    
+    async def get_resources(self, request: web.Request) -> web.Response:
+        server = self._server_by_uuid(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        if server['node'] in self.wings_down:
+            return self._error(500, 'An error was encountered while processing this request.')
+        runtime = self.runtime[server['uuid']]
+        running = runtime['state'] == 'running' and not server['suspended']
+        busy = running and not runtime['idle']
+        if busy:
+            runtime['network'] += self.random.randint(100_000, 5_000_000)
+        return web.json_response({
+            'object': 'stats',
+            'attributes': {
+                'current_state': runtime['state'] if not server['suspended'] else 'offline',
+                'is_suspended': server['suspended'],
+                'resources': {
+                    'memory_bytes': self.random.randint(256, server['limits']['memory']) * 1024 * 1024 if running else 0,
+                    'cpu_absolute': round(self.random.uniform(5, server['limits']['cpu']) if busy else self.random.uniform(0, 0.5), 3) if running else 0,
+                    'disk_bytes': self.random.randint(0, server['limits']['disk']) * 1024 * 1024,
+                    'network_rx_bytes': runtime['network'] if running else 0,
+                    'network_tx_bytes': 0,
+                    'uptime': int((time.monotonic() - runtime['started_at']) * 1000) if running else 0
+                }
+            }
+        })
+    
+    async def send_power(self, request: web.Request) -> web.Response:
+        server = self._server_by_uuid(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        signal = (await request.json()).get('signal')
+        if signal not in ('start', 'stop', 'restart', 'kill'):
+            return self._error(422, 'The selected signal is invalid.')
+        if server['suspended']:
+            return self._error(409, 'This server is currently suspended and the functionality requested is unavailable.')
+        runtime = self.runtime[server['uuid']]
+        if signal in ('start', 'restart'):
+            runtime.update(state='running', started_at=time.monotonic(), network=0)
+        else:
+            runtime['state'] = 'offline'
+        self.power_log.append((request['received_at'], server['node'], server['id'], signal))
+        return web.Response(status=204)
+    
+    def _finish_backups(self):
+        """Complete running backups whose time is up"""
+        now = time.monotonic()
+        for backup_uuid, (node_id, backup, finishes_at) in list(self._backup_running.items()):
+            if now >= finishes_at:
+                backup.update(is_successful=True, completed_at=_now())
+                del self._backup_running[backup_uuid]
+    
+    async def list_backups(self, request: web.Request) -> web.Response:
+        server = self._server_by_uuid(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        self._finish_backups()
+        return self._paginate(request, 'backup', self.backups[server['uuid']])
+    
+    def _backup_or_404(self, request: web.Request):
+        server = self._server_by_uuid(request)
+        if not server:
+            return None, None
+        backup = next((b for b in self.backups[server['uuid']] if b['uuid'] == request.match_info['backup']), None)
+        return server, backup
+    
+    async def get_backup(self, request: web.Request) -> web.Response:
+        server, backup = self._backup_or_404(request)
+        if not backup:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        self._finish_backups()
+        return web.json_response(self._item('backup', backup))
+    
+    async def delete_backup(self, request: web.Request) -> web.Response:
+        server, backup = self._backup_or_404(request)
+        if not backup:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        if backup['is_locked']:
+            return self._error(400, 'This backup is locked and cannot be deleted.')
+        self.backups[server['uuid']].remove(backup)
+        self._backup_running.pop(backup['uuid'], None)
+        return web.Response(status=204)
+    
+    async def create_backup(self, request: web.Request) -> web.Response:
+        server = self._server_by_uuid(request)
+        if not server:
+            return self._error(404, 'The requested resource could not be found on the server.')
+        backups = self.backups[server['uuid']]
+        if len(backups) >= server['feature_limits']['backups']:
+            return self._error(400, 'Cannot create a new backup, this server has reached its limit of backups.')
+        body = await request.json() if request.can_read_body else {}
+        done = self.backup_seconds <= 0
+        backup = {
+            'uuid': str(uuid.uuid4()), 'is_successful': done, 'is_locked': False,
+            'name': (body or {}).get('name') or f"Backup at {_now()}", 'ignored_files': [], 'checksum': None,
+            'bytes': self.random.randint(1, 1024) * 1024 * 1024, 'created_at': _now(),
+            'completed_at': _now() if done else None
+        }
+        backups.append(backup)
+        if not done:
+            node_id = server['node']
+            self._backup_running[backup['uuid']] = (node_id, backup, time.monotonic() + self.backup_seconds)
+            running = sum(1 for node, _, _ in self._backup_running.values() if node == node_id)
+            self.backup_peak_per_node[node_id] = max(self.backup_peak_per_node.get(node_id, 0), running)
+        return web.json_response(self._item('backup', backup))
+    
+    # ==================== LIFECYCLE ====================
+    
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        r = app.router
+        r.add_get('/api/application/users', self.list_users)
+        r.add_post('/api/application/users', self.create_user)
+        r.add_get('/api/application/users/{id:\\d+}', self.get_user)
+        r.add_get('/api/application/users/external/{external_id}', self.get_user_by_external_id)
+        r.add_patch('/api/application/users/{id:\\d+}', self.update_user)
+        r.add_delete('/api/application/users/{id:\\d+}', self.delete_user)
+        r.add_get('/api/application/servers', self.list_servers)
+        r.add_post('/api/application/servers', self.create_server)
+        r.add_get('/api/application/servers/{id:\\d+}', self.get_server)
+        r.add_delete('/api/application/servers/{id:\\d+}', self.delete_server)
+        r.add_delete('/api/application/servers/{id:\\d+}/force', self.delete_server)
+        r.add_post('/api/application/servers/{id:\\d+}/suspend', self.suspend_server)
+        r.add_post('/api/application/servers/{id:\\d+}/unsuspend', self.unsuspend_server)
+        r.add_patch('/api/application/servers/{id:\\d+}/build', self.update_build)
+        r.add_get('/api/application/nodes', self.list_nodes)
+        r.add_get('/api/application/nodes/{id:\\d+}', self.get_node)
+        r.add_get('/api/application/nodes/{id:\\d+}/allocations', self.list_allocations)
+        r.add_get('/api/application/nests/{nest:\\d+}/eggs', self.list_eggs)
+        r.add_get('/api/application/nests/{nest:\\d+}/eggs/{id:\\d+}', self.get_egg)
+        r.add_get('/api/client/servers/{uuid}/resources', self.get_resources)
+        r.add_post('/api/client/servers/{uuid}/power', self.send_power)
+        r.add_get('/api/client/servers/{uuid}/backups', self.list_backups)
+        r.add_post('/api/client/servers/{uuid}/backups', self.create_backup)
+        r.add_get('/api/client/servers/{uuid}/backups/{backup}', self.get_backup)
+        r.add_delete('/api/client/servers/{uuid}/backups/{backup}', self.delete_backup)
+        return app
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving and return the panel base URL"""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+    
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub Pterodactyl panel")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--servers', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help="Fixed latency per request in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--backup-seconds', type=float, default=0.0, help="How long each backup takes to complete")
+    parser.add_argument('--idle-ratio', type=float, default=0.0, help="Fraction of servers that sit idle")
+    args = parser.parse_args()
+    
+    panel = StubPanel(
+        servers=args.servers, users=args.users, nodes=args.nodes, latency=args.latency,
+        jitter=args.jitter, per_page=args.per_page, rate_limit_ratio=args.rate_limit_ratio,
+        backup_seconds=args.backup_seconds, idle_ratio=args.idle_ratio
+    )
+    web.run_app(panel.make_app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,384 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import os
+import json
+import signal
 import asyncio
+import math
+import time
 from dotenv import load_dotenv
+from utils.metrics import COMMAND_LATENCY, QUEUE_DEPTH, GATEWAY_LATENCY, MetricsServer
+from utils.tracing import TRACER
+from utils.watchdog import LoopWatchdog
+from utils.embeds import EmbedBuilder
+from utils.panels import PanelRegistry
+from utils.events import EventBus
+from utils.changefeed import ChangeFeed
+from utils.subscribers import register_subscribers
+from utils.backups import BackupOrchestrator
+from utils.scheduler import Scheduler
+from utils.expiry import ExpiryManager
+from utils.idle import IdleDetector
+from utils.power import PowerExecutor
+from utils.health import NodeHealthMonitor
+from utils.statusboard import StatusBoard
+from utils.cluster import Coordinator, shard_config
+from utils.usercache import UserCache
 
 load_dotenv()
 
-class PterodactylBot(commands.Bot):
+COGS = ['cogs.servers', 'cogs.users', 'cogs.panel', 'cogs.utility']
+
+class BotCommandTree(app_commands.CommandTree):
+    """Command tree that times and traces every application command"""
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.client.draining:
+            if interaction.type == discord.InteractionType.application_command:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.warning("Restarting", "The bot is restarting. Try again in a minute."),
+                    ephemeral=True
+                )
+            return False
+        interaction.extras['started_at'] = time.perf_counter()
+        if interaction.type == discord.InteractionType.application_command:
+            # Shutdown waits for these to finish
+            task = asyncio.current_task()
+            interaction.extras['task'] = task
+            self.client.inflight_commands.add(task)
+            # Only commands reach record_command to finish the span; autocomplete never does
+            if interaction.command is not None:
+                interaction.extras['trace_span'] = TRACER.start_span(
+                    f"/{interaction.command.qualified_name}",
+                    user_id=interaction.user.id
+                )
+        return True
+    
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        status = 'check_failed' if isinstance(error, app_commands.CheckFailure) else 'error'
+        self.client.record_command(interaction, status)
+        if isinstance(error, app_commands.TransformerError) and not interaction.response.is_done():
+            # e.g. a panel name typed instead of picked from autocomplete
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Invalid Option", f"`{error.value}` is not a valid choice"),
+                ephemeral=True
+            )
+            return
+        await super().on_error(interaction, error)
+
+class PterodactylBot(commands.AutoShardedBot):
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.members = True
         
+        # One shard unless SHARD_COUNT is set; SHARD_IDS picks this process's share of them
+        shard_count, shard_ids = shard_config()
+        # MEMBER_CACHE=low caches no members and skips chunking: DMs only need the user, fetched on demand
+        member_cache = os.getenv('MEMBER_CACHE', 'full').lower()
+        if member_cache not in ('full', 'low'):
+            raise ValueError("MEMBER_CACHE must be 'full' or 'low'")
+        low_memory = member_cache == 'low'
         super().__init__(
             command_prefix="!",
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=BotCommandTree,
+            shard_count=shard_count,
+            shard_ids=shard_ids,
+            member_cache_flags=discord.MemberCacheFlags.none() if low_memory else discord.MemberCacheFlags.from_intents(intents),
+            chunk_guilds_at_startup=not low_memory
         )
+        self.member_cache = member_cache
+        self.user_cache = UserCache(self, size=int(os.getenv('USER_CACHE_SIZE', '512')))
+        self._started_at = time.monotonic()
+        self._ready_after = None
         
-        self.panel_url = os.getenv('PANEL_URL')
-        self.app_api_key = os.getenv('APP_API_KEY')
-        self.client_api_key = os.getenv('CLIENT_API_KEY')
         self.admin_ids = [int(id.strip()) for id in os.getenv('ADMIN_IDS', '').split(',') if id.strip()]
         self.log_channel_id = int(os.getenv('LOG_CHANNEL_ID', '0'))
         self.maintenance_mode = False
+        self.start_time = time.time()
+        self.state_path = os.getenv('STATE_PATH', 'data/state.json')
+        self.shutdown_grace = float(os.getenv('SHUTDOWN_GRACE_SECONDS', '30'))
+        self.draining = False
+        self.inflight_commands = set()
+        self._shutdown_task = None
+        
+        # Shared by every cog so caches and indexes are built once per panel. Background features
+        # (change feed, scheduler jobs, expiry, idle detection, status board) use the default panel
+        self.panels = PanelRegistry.from_env()
+        self.api = self.panels.default.api
+        self.index = self.panels.default.index
+        self.panel_url = self.panels.default.url
+        self.events = EventBus()
+        self.change_feed = ChangeFeed(self.index, self.events, interval=float(os.getenv('CHANGE_FEED_SECONDS', '60')))
+        register_subscribers(self, self.events)
+        for panel in self.panels:
+            panel.backups = BackupOrchestrator(panel.api, per_node=int(os.getenv('BACKUP_CONCURRENCY_PER_NODE', '2')))
+            panel.power = PowerExecutor(
+                panel.api,
+                concurrency=int(os.getenv('POWER_CONCURRENCY', '10')),
+                per_node=int(os.getenv('POWER_CONCURRENCY_PER_NODE', '4')),
+                stagger=float(os.getenv('POWER_STAGGER_SECONDS', '2'))
+            )
+        self.backups = self.panels.default.backups
+        self.power = self.panels.default.power
+        self.scheduler = Scheduler(
+            os.getenv('SCHEDULER_DB', 'data/scheduler.db'),
+            max_workers=int(os.getenv('SCHEDULER_WORKERS', '4'))
+        )
+        self.scheduler.register('index_refresh', self._refresh_index_job)
+        self.expiry = ExpiryManager(
+            self,
+            os.getenv('EXPIRY_DB', 'data/expiry.db'),
+            grace_hours=float(os.getenv('EXPIRY_GRACE_HOURS', '24')),
+            reminder_hours=[float(h) for h in os.getenv('EXPIRY_REMINDER_HOURS', '72,24').split(',') if h.strip()],
+            batch_size=int(os.getenv('EXPIRY_BATCH_SIZE', '10')),
+            batch_delay=float(os.getenv('EXPIRY_BATCH_DELAY', '2'))
+        )
+        idle_hours = float(os.getenv('IDLE_HOURS', '0'))
+        self.idle = IdleDetector(
+            self,
+            idle_hours=idle_hours,
+            cpu_percent=float(os.getenv('IDLE_CPU_PERCENT', '2')),
+            network_bps=float(os.getenv('IDLE_NETWORK_BPS', '1024')),
+            min_interval=float(os.getenv('IDLE_POLL_MIN', '60')),
+            max_interval=float(os.getenv('IDLE_POLL_MAX', '900')),
+            rate=float(os.getenv('IDLE_SAMPLE_RATE', '5')),
+            auto_stop=os.getenv('IDLE_AUTO_STOP', 'false').lower() == 'true'
+        ) if idle_hours > 0 else None
+        for panel in self.panels:
+            panel.node_health = NodeHealthMonitor(
+                panel.api,
+                panel.index,
+                ttl=float(os.getenv('NODE_HEALTH_TTL', '30')),
+                timeout=float(os.getenv('NODE_PROBE_TIMEOUT', '5')),
+                # Idle samples only exist for the default panel
+                usage=(lambda: self.idle.memory_by_node() if self.idle else {}) if panel is self.panels.default else None
+            )
+        self.node_health = self.panels.default.node_health
+        status_channels = [int(c) for c in os.getenv('STATUS_CHANNEL_IDS', '').split(',') if c.strip()]
+        self.status_board = StatusBoard(
+            self,
+            status_channels,
+            interval=float(os.getenv('STATUS_INTERVAL', '60')),
+            min_edit_interval=float(os.getenv('STATUS_MIN_EDIT_SECONDS', '10'))
+        ) if status_channels else None
+        self._index_task = None
+        # Processes running different shards share jobs, expiries and log delivery through this
+        coordinator_db = os.getenv('COORDINATOR_DB', '')
+        self.coordinator = Coordinator(
+            self,
+            coordinator_db,
+            process_id=os.getenv('PROCESS_ID') or None,
+            interval=float(os.getenv('COORDINATOR_INTERVAL', '5')),
+            lease_seconds=float(os.getenv('COORDINATOR_LEASE_SECONDS', '30'))
+        ) if coordinator_db else None
+        
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        self.metrics_host = os.getenv('METRICS_HOST', '127.0.0.1')
+        self.metrics_server = None
+        threshold_ms = float(os.getenv('LOOP_WATCHDOG_MS', '100'))
+        self.watchdog = LoopWatchdog(threshold=threshold_ms / 1000) if threshold_ms > 0 else None
+        
+        TRACER.configure(
+            buffer_size=int(os.getenv('TRACE_BUFFER_SIZE', '50')),
+            slow_threshold_ms=float(os.getenv('TRACE_SLOW_MS', '1000')),
+            export_path=os.getenv('TRACE_EXPORT_PATH', '')
+        )
+        
+        GATEWAY_LATENCY.set_function(lambda: 0 if math.isnan(self.latency) else self.latency)
+        QUEUE_DEPTH.set(0, queue='log')
+        QUEUE_DEPTH.set(0, queue='dm')
         
     async def setup_hook(self):
         """Load all cogs"""
-        cogs = ['cogs.servers', 'cogs.users', 'cogs.panel', 'cogs.utility']
-        for cog in cogs:
+        if self.watchdog:
+            self.watchdog.start()
+        
+        await self.load_state()
+        self.events.start()
+        
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, lambda: asyncio.create_task(self.close()))
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform; KeyboardInterrupt still closes the bot
+                pass
+        
+        for cog in COGS:
             try:
                 await self.load_extension(cog)
                 print(f"✅ Loaded {cog}")
             except Exception as e:
                 print(f"❌ Failed to load {cog}: {e}")
         
+        # Cogs register their job handlers on load, so persisted jobs start after them
+        await self.scheduler.start(dispatch=False)
+        refresh_cron = os.getenv('INDEX_REFRESH_CRON', '')
+        if refresh_cron:
+            await self.scheduler.schedule_cron('index_refresh', 'index_refresh', refresh_cron, catch_up='skip')
+        await self.expiry.start()
+        if self.coordinator:
+            # Background tasks start once this process holds the lease
+            self.coordinator.start()
+        else:
+            await self.start_background()
+        if self.status_board:
+            # Waits for the gateway to be ready before the first post
+            self.status_board.start()
+        print(f"✅ Scheduler started with {len(self.scheduler.jobs)} job(s)")
+        
         await self.tree.sync()
         print("✅ Commands synced")
+        
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(self.metrics_host, self.metrics_port)
+            await self.metrics_server.start()
+            print(f"✅ Metrics on http://{self.metrics_host}:{self.metrics_port}/metrics")
+    
+    async def start_background(self):
+        """Change feed, scheduled jobs and idle detection; with a coordinator only the lease holder runs them"""
+        if self._index_task is None:
+            self._index_task = asyncio.create_task(self.change_feed.run())
+        await self.scheduler.resume()
+        if self.idle:
+            self.idle.start()
+    
+    async def stop_background(self):
+        if self._index_task:
+            self._index_task.cancel()
+            await asyncio.gather(self._index_task, return_exceptions=True)
+            self._index_task = None
+        await self.scheduler.pause()
+        if self.idle:
+            await self.idle.stop()
+    
+    # ==================== SHUTDOWN ====================
+    
+    async def close(self):
+        # Signal handlers and discord.py may both call this; everyone waits on the one shutdown
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+        await asyncio.shield(self._shutdown_task)
+    
+    async def _shutdown(self):
+        """
+        Refuse new commands, give in-flight ones ``SHUTDOWN_GRACE_SECONDS`` to
+        finish, stop background work, deliver queued DMs and log messages,
+        then persist state and close the panel sessions and the gateway.
+        """
+        self.draining = True
+        print(f"⏳ Shutting down, waiting for {len(self.inflight_commands)} command(s) and interaction(s)")
+        if self.inflight_commands:
+            _, pending = await asyncio.wait(self.inflight_commands, timeout=self.shutdown_grace)
+            if pending:
+                print(f"⚠️ {len(pending)} command(s) still running after {self.shutdown_grace:.0f}s, stopping anyway")
+        
+        if self.coordinator:
+            await self.coordinator.stop()
+        await self.stop_background()
+        await self.scheduler.stop()
+        await self.expiry.stop()
+        if self.status_board:
+            await self.status_board.stop()
+        # Commands and jobs have published their last events; deliver them while the HTTP session is open
+        await self.events.stop(timeout=self.shutdown_grace)
+        await self.save_state()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        if self.watchdog:
+            await self.watchdog.stop()
+        await self.panels.close()
+        await super().close()
+        print("✅ Shutdown complete")
+    
+    async def load_state(self):
+        """Restore what ``save_state`` kept from the previous run"""
+        try:
+            state = await asyncio.to_thread(self._read_state)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read {self.state_path}: {e}")
+            return
+        self.maintenance_mode = state.get('maintenance_mode', self.maintenance_mode)
+    
+    async def save_state(self):
+        try:
+            await asyncio.to_thread(self._write_state, {'maintenance_mode': self.maintenance_mode})
+        except OSError as e:
+            print(f"⚠️ Could not save {self.state_path}: {e}")
+    
+    def _read_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+    
+    def _write_state(self, state: dict):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename so a crash mid-write never leaves a truncated file
+        temporary = f"{self.state_path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, self.state_path)
+    
+    # ==================== RELOAD ====================
+    
+    async def reload_cogs(self, names=None) -> dict:
+        """
+        Reload cog extensions in place (all loaded ones by default); returns
+        ``{name: error or None}``. The API clients, indexes, event bus,
+        scheduler and other shared state live on the bot and are kept; a cog
+        that fails to reload keeps running its previous version.
+        """
+        results = {}
+        for name in names or list(self.extensions):
+            try:
+                await self.reload_extension(name)
+                results[name] = None
+            except commands.ExtensionError as e:
+                results[name] = str(e.__cause__ or e)
+        return results
+    
+    async def _refresh_index_job(self, job):
+        """Scheduler handler for ``index_refresh`` jobs: a full reload on top of the change feed"""
+        if not await self.index.refresh():
+            raise RuntimeError("Panel index refresh failed")
+    
+    def track_inflight(self):
+        """Have shutdown wait for the current task, e.g. a button callback, until it finishes"""
+        task = asyncio.current_task()
+        self.inflight_commands.add(task)
+        task.add_done_callback(self.inflight_commands.discard)
+    
+    def record_command(self, interaction: discord.Interaction, status: str):
+        """Observe command latency for the metrics endpoint and close its trace"""
+        self.inflight_commands.discard(interaction.extras.pop('task', None))
+        span = interaction.extras.pop('trace_span', None)
+        if span:
+            span.finish('ok' if status == 'ok' else 'error')
+        started_at = interaction.extras.get('started_at')
+        if started_at is None or interaction.command is None:
+            return
+        COMMAND_LATENCY.observe(
+            time.perf_counter() - started_at,
+            command=interaction.command.qualified_name,
+            status=status
+        )
+    
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self.record_command(interaction, 'ok')
     
     async def on_ready(self):
-        print(f"✅ {self.user} is online!")
-        print(f"📊 Servers: {len(self.guilds)}")
+        if self._ready_after is None:
+            # Includes member chunking when MEMBER_CACHE=full
+            self._ready_after = time.monotonic() - self._started_at
+        print(f"✅ {self.user} is online after {self._ready_after:.1f}s (member cache: {self.member_cache})")
+        print(f"📊 Servers: {len(self.guilds)} on shard(s) {', '.join(str(shard) for shard in self.shards)}")
         print(f"👥 Admin IDs: {self.admin_ids}")
         
         await self.change_presence(
@@ -53,46 +391,71 @@ class PterodactylBot(commands.Bot):
     async def log_action(self, embed: discord.Embed):
         """Log actions to admin channel"""
         if self.log_channel_id:
+            QUEUE_DEPTH.inc(queue='log')
+            span = TRACER.child_span("discord.log_action")
             try:
-                channel = self.get_channel(self.log_channel_id)
-                if channel:
-                    await channel.send(embed=embed)
+                if self.coordinator:
+                    # The log channel may be on a shard another process runs
+                    await self.coordinator.send_or_enqueue(self.log_channel_id, embed)
+                else:
+                    channel = self.get_channel(self.log_channel_id)
+                    if channel:
+                        await channel.send(embed=embed)
             except Exception as e:
                 print(f"Failed to log action: {e}")
+                if span:
+                    span.status = 'error'
+            finally:
+                QUEUE_DEPTH.dec(queue='log')
+                if span:
+                    span.finish()
     
-    async def send_user_dm(self, user: discord.User, embed: discord.Embed) -> bool:
+    async def send_user_dm(self, user: discord.User, embed: discord.Embed, about: str = None) -> bool:
         """
-        Send DM to user with fallback logging
+        Send DM to user with fallback logging; ``about`` says in the log what the DM was for
         Returns True if successful, False otherwise
         """
+        QUEUE_DEPTH.inc(queue='dm')
+        span = TRACER.child_span("discord.send_user_dm", user_id=user.id)
         try:
             await user.send(embed=embed)
             return True
         except discord.Forbidden:
             # User has DMs disabled
+            if span:
+                span.status = 'error'
             await self.log_action(
                 discord.Embed(
                     title="⚠️ DM Delivery Failed",
-                    description=f"Could not send DM to {user.mention} ({user.id})\n**Reason:** User has DMs disabled",
+                    description=f"Could not send DM to {user.mention} ({user.id})\n**Reason:** User has DMs disabled"
+                                + (f"\n**About:** {about}" if about else ""),
                     color=discord.Color.orange()
                 )
             )
             return False
         except Exception as e:
+            if span:
+                span.status = 'error'
             await self.log_action(
                 discord.Embed(
                     title="❌ DM Delivery Error",
-                    description=f"Failed to send DM to {user.mention} ({user.id})\n**Error:** {str(e)}",
+                    description=f"Failed to send DM to {user.mention} ({user.id})\n**Error:** {str(e)}"
+                                + (f"\n**About:** {about}" if about else ""),
                     color=discord.Color.red()
                 )
             )
             return False
+        finally:
+            QUEUE_DEPTH.dec(queue='dm')
+            if span:
+                span.finish()
 
 def main():
     bot = PterodactylBot()
     
-    if not bot.panel_url or not bot.app_api_key:
-        print("❌ Missing required environment variables!")
+    missing = bot.panels.missing_credentials()
+    if missing:
+        print(f"❌ Missing panel URL or application API key for: {', '.join(missing)}")
         return
     
     bot.run(os.getenv('DISCORD_TOKEN'))
@@ -1,12 +1,25 @@
 import aiohttp
 import asyncio
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List
 import random
 import string
+import time
+from utils.metrics import PANEL_REQUESTS, PANEL_LATENCY, normalize_endpoint
+from utils.tracing import TRACER
+from utils.concurrency import RateLimiter
+from utils.models import (
+    Server, User, Node, Allocation, Backup, ResourceUsage, json_loads, parse_item, parse_list
+)
 
 class PterodactylAPI:
-    def __init__(self, panel_url: str, app_key: str, client_key: str):
+    def __init__(self, panel_url: str, app_key: str, client_key: str, name: str = 'main',
+                 rate: float = 0, burst: int = 10, connections: int = 20):
         self.panel_url = panel_url.rstrip('/')
+        self.name = name
+        # Optional requests-per-second cap so one busy panel can't trip its own rate limit
+        self.limiter = RateLimiter(rate, burst) if rate > 0 else None
+        self.connections = connections
+        self._session: Optional[aiohttp.ClientSession] = None
         self.app_key = app_key
         self.client_key = client_key
         self.app_headers = {
@@ -20,27 +33,78 @@ class PterodactylAPI:
             'Accept': 'application/json'
         }
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session, so connections to the panel are kept alive and reused between requests"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.connections))
+        return self._session
+    
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     async def _request(self, method: str, endpoint: str, headers: dict, data: dict = None) -> Dict:
         """Make API request"""
         url = f"{self.panel_url}/api/{endpoint}"
+        metric_endpoint = normalize_endpoint(endpoint)
+        status = 'error'
+        if self.limiter:
+            await self.limiter.acquire()
+        start = time.perf_counter()
+        span = TRACER.child_span(f"{method} {metric_endpoint}", method=method, endpoint=endpoint, panel=self.name)
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.request(method, url, headers=headers, json=data) as resp:
-                    if resp.status == 204:
-                        return {'success': True}
-                    
-                    response_data = await resp.json()
-                    
-                    if resp.status >= 400:
-                        error_msg = response_data.get('errors', [{}])[0].get('detail', 'Unknown error')
-                        return {'success': False, 'error': error_msg, 'status': resp.status}
-                    
-                    return {'success': True, 'data': response_data}
-            except aiohttp.ClientError as e:
-                return {'success': False, 'error': f'Connection error: {str(e)}'}
-            except Exception as e:
-                return {'success': False, 'error': str(e)}
+        try:
+            async with self._get_session().request(method, url, headers=headers, json=data) as resp:
+                status = str(resp.status)
+                if resp.status == 204:
+                    return {'success': True}
+                
+                body = await resp.read()
+                response_data = json_loads(body) if body else {}
+                
+                if resp.status >= 400:
+                    error_msg = response_data.get('errors', [{}])[0].get('detail', 'Unknown error')
+                    return {'success': False, 'error': error_msg, 'status': resp.status}
+                
+                return {'success': True, 'data': response_data}
+        except aiohttp.ClientError as e:
+            return {'success': False, 'error': f'Connection error: {str(e)}'}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        finally:
+            PANEL_LATENCY.observe(time.perf_counter() - start, panel=self.name, method=method, endpoint=metric_endpoint)
+            PANEL_REQUESTS.inc(panel=self.name, method=method, endpoint=metric_endpoint, status=status)
+            if span:
+                span.set_attribute('http.status', status)
+                span.finish('ok' if status.isdigit() and int(status) < 400 else 'error')
+    
+    async def _fetch_all(self, endpoint: str, model, per_page: int = 100, concurrency: int = 4,
+                         headers: Optional[dict] = None) -> Optional[List]:
+        """Fetch every page of a list endpoint and convert the items to ``model``; None on failure"""
+        headers = headers or self.app_headers
+        separator = '&' if '?' in endpoint else '?'
+        first = await self._request('GET', f'{endpoint}{separator}per_page={per_page}&page=1', headers)
+        if not first['success']:
+            return None
+        
+        items = parse_list(first['data'], model)
+        total_pages = first['data'].get('meta', {}).get('pagination', {}).get('total_pages', 1)
+        if total_pages <= 1:
+            return items
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_page(page: int):
+            async with semaphore:
+                return await self._request('GET', f'{endpoint}{separator}per_page={per_page}&page={page}', headers)
+        
+        results = await asyncio.gather(*(fetch_page(page) for page in range(2, total_pages + 1)))
+        for result in results:
+            if not result['success']:
+                return None
+            items.extend(parse_list(result['data'], model))
+        return items
     
     # ==================== USER MANAGEMENT ====================
     
@@ -51,7 +115,15 @@ class PterodactylAPI:
             return result['data']['data'][0]
         return None
     
-    async def create_user(self, email: str, username: str, first_name: str, last_name: str) -> Dict:
+    async def get_user_by_external_id(self, external_id: str) -> Optional[Dict]:
+        """Get user by external ID (the linked Discord user ID)"""
+        result = await self._request('GET', f'application/users/external/{external_id}', self.app_headers)
+        if result['success']:
+            return result['data']
+        return None
+    
+    async def create_user(self, email: str, username: str, first_name: str, last_name: str,
+                          external_id: Optional[str] = None) -> Dict:
         """Create a new user"""
         password = self._generate_password()
         
@@ -62,6 +134,8 @@ class PterodactylAPI:
             'last_name': last_name,
             'password': password
         }
+        if external_id:
+            data['external_id'] = external_id
         
         result = await self._request('POST', 'application/users', self.app_headers, data)
         if result['success']:
@@ -72,10 +146,25 @@ class PterodactylAPI:
         """List all users"""
         return await self._request('GET', f'application/users?page={page}', self.app_headers)
     
+    async def fetch_all_users(self) -> Optional[List[User]]:
+        """Every panel user as compact models"""
+        return await self._fetch_all('application/users', User)
+    
     async def delete_user(self, user_id: int) -> Dict:
         """Delete a user"""
         return await self._request('DELETE', f'application/users/{user_id}', self.app_headers)
     
+    async def set_user_external_id(self, user: User, external_id: str) -> Dict:
+        """Link an existing user to a Discord user ID"""
+        data = {
+            'email': user.email,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'external_id': external_id
+        }
+        return await self._request('PATCH', f'application/users/{user.id}', self.app_headers, data)
+    
     async def update_user_password(self, user_id: int, password: str) -> Dict:
         """Update user password"""
         data = {'password': password}
@@ -138,6 +227,17 @@ class PterodactylAPI:
         """Get server details"""
         return await self._request('GET', f'application/servers/{server_id}', self.app_headers)
     
+    async def fetch_all_servers(self) -> Optional[List[Server]]:
+        """Every server on the panel as compact models"""
+        return await self._fetch_all('application/servers?include=user', Server)
+    
+    async def get_server_model(self, server_id: int) -> Optional[Server]:
+        """Get a single server, with its owner, as a compact model"""
+        result = await self._request('GET', f'application/servers/{server_id}?include=user', self.app_headers)
+        if result['success']:
+            return parse_item(result['data'], Server)
+        return None
+    
     async def delete_server(self, server_id: int, force: bool = False) -> Dict:
         """Delete a server"""
         endpoint = f'application/servers/{server_id}'
@@ -154,27 +254,58 @@ class PterodactylAPI:
         return await self._request('POST', f'application/servers/{server_id}/unsuspend', self.app_headers)
     
     async def update_server_build(self, server_id: int, ram: int = None, cpu: int = None, 
-                                 disk: int = None) -> Dict:
-        """Update server resource limits"""
-        data = {
-            'allocation': 1,  # Keep existing allocation
-            'limits': {}
-        }
-        
-        # Get current server details
-        server = await self.get_server(server_id)
-        if not server['success']:
-            return server
+                                 disk: int = None, current: Optional[Server] = None) -> Dict:
+        """
+        Update server resource limits. The build payload starts from ``current``
+        (e.g. the cached model) when given, so the update is a single PATCH; the
+        server is re-fetched and the update retried once if the panel rejects
+        it (409/422) or answers with a build other than the one sent.
+        """
+        fresh = current is None
+        if fresh:
+            current = await self.get_server_model(server_id)
+            if current is None:
+                return {'success': False, 'error': f'Server {server_id} not found'}
         
-        current_limits = server['data']['attributes']['limits']
+        endpoint = f'application/servers/{server_id}/build'
+        payload = self._build_payload(current, ram, cpu, disk)
+        result = await self._request('PATCH', endpoint, self.app_headers, payload)
+        if fresh or not self._needs_retry(result, payload):
+            return result
         
-        data['limits']['memory'] = ram if ram is not None else current_limits['memory']
-        data['limits']['cpu'] = cpu if cpu is not None else current_limits['cpu']
-        data['limits']['disk'] = disk if disk is not None else current_limits['disk']
-        data['limits']['swap'] = current_limits.get('swap', 0)
-        data['limits']['io'] = current_limits.get('io', 500)
-        
-        return await self._request('PATCH', f'application/servers/{server_id}/build', self.app_headers, data)
+        # The cached build was stale (e.g. swap or the allocation changed on the panel); retry from fresh state
+        current = await self.get_server_model(server_id)
+        if current is None:
+            return result
+        return await self._request('PATCH', endpoint, self.app_headers, self._build_payload(current, ram, cpu, disk))
+    
+    def _needs_retry(self, result: Dict, payload: Dict) -> bool:
+        if not result['success']:
+            return result.get('status') in (409, 422)
+        # No body to check against; take the panel's word for it
+        if not result.get('data'):
+            return False
+        return self._build_payload(parse_item(result['data'], Server)) != payload
+    
+    @staticmethod
+    def _build_payload(server: Server, ram: int = None, cpu: int = None, disk: int = None) -> Dict:
+        """Full build payload for ``server`` with the given limits changed"""
+        return {
+            'allocation': server.allocation,
+            'limits': {
+                'memory': ram if ram is not None else server.memory,
+                'swap': server.swap,
+                'disk': disk if disk is not None else server.disk,
+                'io': server.io,
+                'cpu': cpu if cpu is not None else server.cpu,
+                'threads': server.threads
+            },
+            'feature_limits': {
+                'databases': server.databases,
+                'allocations': server.allocations,
+                'backups': server.backups
+            }
+        }
     
     # ==================== NODE MANAGEMENT ====================
     
@@ -186,6 +317,14 @@ class PterodactylAPI:
         """Get node details"""
         return await self._request('GET', f'application/nodes/{node_id}', self.app_headers)
     
+    async def fetch_all_nodes(self) -> Optional[List[Node]]:
+        """Every node as compact models"""
+        return await self._fetch_all('application/nodes', Node)
+    
+    async def fetch_node_allocations(self, node_id: int) -> Optional[List[Allocation]]:
+        """Every allocation of a node as compact models"""
+        return await self._fetch_all(f'application/nodes/{node_id}/allocations', Allocation)
+    
     # ==================== EGG MANAGEMENT ====================
     
     async def list_eggs(self, nest_id: int = 1) -> Dict:
@@ -203,13 +342,36 @@ class PterodactylAPI:
         """Get server resource usage (Client API)"""
         return await self._request('GET', f'client/servers/{server_uuid}/resources', self.client_headers)
     
+    async def get_resource_usage(self, server_uuid: str) -> Optional[ResourceUsage]:
+        """Current resource usage as a compact model; None on failure"""
+        result = await self.get_server_resources(server_uuid)
+        return parse_item(result['data'], ResourceUsage) if result['success'] else None
+    
+    async def send_power_action(self, server_uuid: str, signal: str) -> Dict:
+        """Send a power signal (start, stop, restart or kill) to a server"""
+        return await self._request('POST', f'client/servers/{server_uuid}/power', self.client_headers, {'signal': signal})
+    
     async def list_backups(self, server_uuid: str) -> Dict:
         """List server backups"""
         return await self._request('GET', f'client/servers/{server_uuid}/backups', self.client_headers)
     
-    async def create_backup(self, server_uuid: str) -> Dict:
+    async def fetch_all_backups(self, server_uuid: str) -> Optional[List[Backup]]:
+        """Every backup of a server as compact models"""
+        return await self._fetch_all(f'client/servers/{server_uuid}/backups', Backup, per_page=50,
+                                     headers=self.client_headers)
+    
+    async def create_backup(self, server_uuid: str, name: Optional[str] = None) -> Dict:
         """Create server backup"""
-        return await self._request('POST', f'client/servers/{server_uuid}/backups', self.client_headers)
+        data = {'name': name} if name else None
+        return await self._request('POST', f'client/servers/{server_uuid}/backups', self.client_headers, data)
+    
+    async def get_backup(self, server_uuid: str, backup_uuid: str) -> Dict:
+        """Get backup details"""
+        return await self._request('GET', f'client/servers/{server_uuid}/backups/{backup_uuid}', self.client_headers)
+    
+    async def delete_backup(self, server_uuid: str, backup_uuid: str) -> Dict:
+        """Delete a backup"""
+        return await self._request('DELETE', f'client/servers/{server_uuid}/backups/{backup_uuid}', self.client_headers)
     
     # ==================== UTILITY ====================
     
@@ -0,0 +1,189 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from utils.api import PterodactylAPI
+from utils.concurrency import KeyedLimiter, backoff_delays
+from utils.metrics import REGISTRY
+from utils.models import Backup, Server, parse_item
+
+BACKUPS = REGISTRY.counter(
+    'bot_backups_total',
+    'Orchestrated backups by result',
+    ('result',)
+)
+
+BACKUP_DURATION = REGISTRY.histogram(
+    'bot_backup_duration_seconds',
+    'Time from requesting a backup until the panel reported it finished',
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
+BACKUPS_IN_FLIGHT = REGISTRY.gauge(
+    'bot_backups_in_flight',
+    'Backups currently running per node',
+    ('panel', 'node')
+)
+
+@dataclass
+class BackupResult:
+    """Outcome of backing up one server"""
+    server: Server
+    success: bool
+    error: Optional[str] = None
+    backup: Optional[Backup] = None
+    rotated: int = 0
+    seconds: float = 0.0
+
+@dataclass
+class BackupReport:
+    """Summary of an orchestrated backup run"""
+    results: List[BackupResult] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float = 0.0
+    peak_per_node: Dict[int, int] = field(default_factory=dict)
+    
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+    
+    @property
+    def succeeded(self) -> List[BackupResult]:
+        return [r for r in self.results if r.success]
+    
+    @property
+    def failed(self) -> List[BackupResult]:
+        return [r for r in self.results if not r.success]
+    
+    @property
+    def rotated(self) -> int:
+        return sum(r.rotated for r in self.results)
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(r.backup.bytes for r in self.succeeded if r.backup)
+    
+    @property
+    def servers_per_minute(self) -> float:
+        return len(self.succeeded) / self.elapsed * 60 if self.elapsed else 0.0
+    
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.total_bytes / 1024 / 1024 / self.elapsed if self.elapsed else 0.0
+
+class BackupOrchestrator:
+    """
+    Backs up many servers at once: at most ``per_node`` concurrent backups per
+    Wings node (and ``total`` overall), rotating the oldest backups out when a
+    server is at its ``feature_limits.backups`` and polling with backoff
+    """
+    
+    def __init__(self, api: PterodactylAPI, per_node: int = 2, total: int = 20,
+                 poll_initial: float = 2.0, poll_max: float = 30.0, timeout: float = 3600):
+        self.api = api
+        self.per_node = per_node
+        self.total = total
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self.running: Optional[BackupReport] = None
+        # Servers with a backup underway, from a run or a single /manage backup
+        self.in_progress: Set[int] = set()
+    
+    async def run(self, servers: List[Server], rotate: bool = True) -> BackupReport:
+        """
+        Back up every server in ``servers``; returns once all have finished or
+        failed. Raises RuntimeError if another run is in progress.
+        """
+        # Checked and claimed without awaiting in between, so two callers can't both start
+        if self.running is not None:
+            raise RuntimeError("Another backup run is still in progress")
+        limiter = KeyedLimiter(self.per_node, self.total)
+        report = self.running = BackupReport()
+        
+        async def backup(server: Server):
+            async with limiter.slot(server.node):
+                BACKUPS_IN_FLIGHT.inc(panel=self.api.name, node=str(server.node))
+                try:
+                    result = await self.backup_server(server, rotate)
+                finally:
+                    BACKUPS_IN_FLIGHT.dec(panel=self.api.name, node=str(server.node))
+            BACKUPS.inc(result='success' if result.success else 'failed')
+            report.results.append(result)
+        
+        try:
+            await asyncio.gather(*(backup(server) for server in servers))
+        finally:
+            report.finished_at = time.perf_counter()
+            report.peak_per_node = dict(limiter.peak)
+            self.running = None
+        return report
+    
+    async def backup_server(self, server: Server, rotate: bool = True) -> BackupResult:
+        """Rotate if needed, start a backup and wait for the panel to finish it"""
+        start = time.perf_counter()
+        if server.backups <= 0:
+            return BackupResult(server, False, "Server has no backup slots")
+        if server.id in self.in_progress:
+            return BackupResult(server, False, "A backup of this server is already running")
+        self.in_progress.add(server.id)
+        try:
+            return await self._backup_server(server, rotate, start)
+        finally:
+            self.in_progress.discard(server.id)
+    
+    async def _backup_server(self, server: Server, rotate: bool, start: float) -> BackupResult:
+        rotated = 0
+        if rotate:
+            rotated, error = await self._rotate(server)
+            if error:
+                return BackupResult(server, False, error, rotated=rotated)
+        
+        created = await self.api.create_backup(server.uuid)
+        if not created['success']:
+            return BackupResult(server, False, created.get('error', 'Unknown error'), rotated=rotated)
+        
+        backup = await self._wait(server, parse_item(created['data'], Backup))
+        seconds = time.perf_counter() - start
+        if backup is None:
+            return BackupResult(server, False, "Timed out waiting for backup", rotated=rotated, seconds=seconds)
+        BACKUP_DURATION.observe(seconds)
+        if not backup.is_successful:
+            return BackupResult(server, False, "Backup failed on the node", backup, rotated, seconds)
+        return BackupResult(server, True, None, backup, rotated, seconds)
+    
+    async def _rotate(self, server: Server) -> Tuple[int, Optional[str]]:
+        """Delete the oldest completed, unlocked backups so one more fits; (deleted, error)"""
+        backups = await self.api.fetch_all_backups(server.uuid)
+        if backups is None:
+            return 0, None
+        excess = len(backups) - server.backups + 1
+        if excess <= 0:
+            return 0, None
+        # A backup still in progress can't be deleted and isn't the one to lose anyway
+        candidates = sorted(
+            (b for b in backups if b.completed_at is not None and not b.is_locked),
+            key=lambda b: b.created_at or ''
+        )
+        if len(candidates) < excess:
+            return 0, "Backup limit reached and every backup is locked or in progress"
+        deleted = 0
+        for old in candidates[:excess]:
+            result = await self.api.delete_backup(server.uuid, old.uuid)
+            if not result['success']:
+                return deleted, f"Could not delete old backup {old.name or old.uuid}: {result.get('error', 'Unknown error')}"
+            deleted += 1
+        return deleted, None
+    
+    async def _wait(self, server: Server, backup: Backup) -> Optional[Backup]:
+        """Poll until the backup has completed (successfully or not); None on timeout"""
+        deadline = time.monotonic() + self.timeout
+        delays = backoff_delays(self.poll_initial, maximum=self.poll_max)
+        while backup.completed_at is None:
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(next(delays))
+            result = await self.api.get_backup(server.uuid, backup.uuid)
+            if result['success']:
+                backup = parse_item(result['data'], Backup)
+        return backup
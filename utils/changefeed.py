@@ -0,0 +1,135 @@
+import time
+import asyncio
+from typing import Dict, List
+from utils.events import (
+    EventBus, Event, ServerCreated, ServerDeleted, ServerSuspended, ServerUnsuspended,
+    LimitsChanged, UserCreated, UserDeleted
+)
+from utils.index import PanelIndex
+from utils.metrics import REGISTRY
+from utils.models import Server, User
+
+FEED_POLLS = REGISTRY.counter(
+    'panel_change_feed_polls_total',
+    'Change feed polls by result',
+    ('result',)
+)
+
+FEED_CHANGES = REGISTRY.counter(
+    'panel_change_feed_changes_total',
+    'Records the change feed found changed on the panel',
+    ('kind', 'change')
+)
+
+FEED_DURATION = REGISTRY.histogram(
+    'panel_change_feed_duration_seconds',
+    'Time spent fetching and diffing one change feed poll'
+)
+
+def _limits(server: Server) -> tuple:
+    return (server.memory, server.swap, server.disk, server.io, server.cpu, server.threads,
+            server.databases, server.allocations, server.backups)
+
+class ChangeFeed:
+    """
+    Detects changes made outside the bot by diffing full panel listings against
+    the index, applying only the records that changed and publishing typed events
+    """
+    
+    def __init__(self, index: PanelIndex, bus: EventBus, interval: float = 60):
+        self.index = index
+        self.bus = bus
+        self.interval = interval
+        self.last_poll = 0.0
+        self.last_changes = 0
+    
+    async def run(self):
+        """Poll forever; the first pass only loads the index"""
+        while True:
+            try:
+                if not self.index.loaded:
+                    if not await self.index.refresh():
+                        print("⚠️ Failed to load panel index")
+                elif await self.poll() is None:
+                    print("⚠️ Change feed poll failed")
+            except Exception as e:
+                # A bad record or a failing subscriber must not end the feed
+                FEED_POLLS.inc(result='error')
+                print(f"Change feed poll failed: {e}")
+            await asyncio.sleep(self.interval)
+    
+    async def poll(self):
+        """Fetch, diff and apply one round of changes; returns the events or None on failure"""
+        start = time.perf_counter()
+        # Records the bot writes while the listings are in flight are newer than them
+        fetch_started = time.monotonic()
+        api = self.index.api
+        servers, users, nodes = await asyncio.gather(
+            api.fetch_all_servers(), api.fetch_all_users(), api.fetch_all_nodes()
+        )
+        if servers is None or users is None or nodes is None:
+            # Deletions can only be detected from complete listings
+            FEED_POLLS.inc(result='error')
+            return None
+        
+        # Users first so new servers resolve their owners
+        events: List[Event] = self._diff_users({user.id: user for user in users}, fetch_started)
+        events.extend(self._diff_servers({server.id: server for server in servers}, fetch_started))
+        self.index.upsert_nodes(nodes)
+        self.index.forget_changes(before=fetch_started)
+        self.index.refreshed_at = time.monotonic()
+        
+        for event in events:
+            self.bus.publish(event)
+        self.last_poll = time.time()
+        self.last_changes = len(events)
+        FEED_POLLS.inc(result='ok')
+        FEED_DURATION.observe(time.perf_counter() - start)
+        return events
+    
+    # ==================== DIFFING ====================
+    
+    def _diff_users(self, fresh: Dict[int, User], fetched_at: float) -> List[Event]:
+        events: List[Event] = []
+        # Records the bot changed after the fetch started are skipped: the listing is older than them.
+        # The feed's own writes aren't stamped, so relinking a user here doesn't hide its servers' changes
+        changed = lambda user_id: self.index.changed_since('user', user_id, fetched_at)
+        for user_id in [user_id for user_id in self.index.users if user_id not in fresh and not changed(user_id)]:
+            user = self.index.remove_user(user_id, stamp=False)
+            FEED_CHANGES.inc(kind='user', change='deleted')
+            events.append(UserDeleted(user))
+        for user_id, user in fresh.items():
+            # Frozen models compare field by field; equal records are skipped
+            cached = self.index.users.get(user_id)
+            if cached == user or changed(user_id):
+                continue
+            self.index.upsert_user(user, stamp=False)
+            if cached is None:
+                FEED_CHANGES.inc(kind='user', change='created')
+                events.append(UserCreated(user))
+            else:
+                FEED_CHANGES.inc(kind='user', change='updated')
+        return events
+    
+    def _diff_servers(self, fresh: Dict[int, Server], fetched_at: float) -> List[Event]:
+        events: List[Event] = []
+        changed = lambda server_id: self.index.changed_since('server', server_id, fetched_at)
+        for server_id in [server_id for server_id in self.index.servers if server_id not in fresh and not changed(server_id)]:
+            server = self.index.remove_server(server_id, stamp=False)
+            FEED_CHANGES.inc(kind='server', change='deleted')
+            events.append(ServerDeleted(server))
+        for server_id, server in fresh.items():
+            cached = self.index.servers.get(server_id)
+            if cached == server or changed(server_id):
+                continue
+            self.index.upsert_server(server, stamp=False)
+            if cached is None:
+                FEED_CHANGES.inc(kind='server', change='created')
+                events.append(ServerCreated(server))
+                continue
+            FEED_CHANGES.inc(kind='server', change='updated')
+            if cached.suspended != server.suspended:
+                events.append(ServerSuspended(server) if server.suspended else ServerUnsuspended(server))
+            if _limits(cached) != _limits(server):
+                events.append(LimitsChanged(cached, server))
+        return events
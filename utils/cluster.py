@@ -0,0 +1,361 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+import threading
+import discord
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils.metrics import REGISTRY
+
+LEADER = REGISTRY.gauge(
+    'bot_cluster_leader',
+    'Whether this process holds the background lease (1) or not (0)'
+)
+
+OUTBOX_MESSAGES = REGISTRY.counter(
+    'bot_outbox_messages_total',
+    'Log channel messages handed between processes through the coordinator',
+    ('result',)
+)
+
+BACKGROUND_ROLE = 'background'
+
+def parse_shard_ids(spec: str) -> Optional[List[int]]:
+    """``"0-3,8"`` → ``[0, 1, 2, 3, 8]``; None for an empty spec"""
+    ids = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+            if start > end:
+                raise ValueError(f"Invalid shard range '{part}'")
+            ids.update(range(start, end + 1))
+        else:
+            ids.add(int(part))
+    return sorted(ids) or None
+
+def shard_config() -> Tuple[Optional[int], Optional[List[int]]]:
+    """
+    (shard_count, shard_ids) from ``SHARD_COUNT`` and ``SHARD_IDS``. Without
+    ``SHARD_COUNT`` the bot runs one shard; ``SHARD_COUNT=auto`` uses Discord's
+    recommendation and runs every shard in this process.
+    """
+    count = os.getenv('SHARD_COUNT', '').strip().lower()
+    ids = parse_shard_ids(os.getenv('SHARD_IDS', ''))
+    if count == 'auto':
+        if ids:
+            raise ValueError("SHARD_IDS needs an explicit SHARD_COUNT")
+        return None, None
+    shard_count = int(count) if count else 1
+    if ids and ids[-1] >= shard_count:
+        raise ValueError(f"SHARD_IDS must be below SHARD_COUNT ({shard_count})")
+    return shard_count, ids
+
+@dataclass
+class ProcessInfo:
+    """One bot process as last reported to the coordinator"""
+    id: str
+    shards: str
+    guilds: int
+    leader: bool
+    seen_at: float
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        role TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel_id INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        claimed_by TEXT,
+        claimed_until REAL NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS processes (
+        id TEXT PRIMARY KEY,
+        shards TEXT NOT NULL,
+        guilds INTEGER NOT NULL,
+        seen_at REAL NOT NULL
+    )
+    """
+)
+
+class CoordinatorStore:
+    """
+    SQLite tables shared by every process of a deployment; like the job store,
+    calls run in a worker thread. Writes take an immediate transaction so two
+    processes never both win a lease or both claim an outbox message.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(outbox)')}
+            if 'claimed_until' not in columns:
+                # Outbox tables created before messages were leased
+                self._conn.execute('ALTER TABLE outbox ADD COLUMN claimed_by TEXT')
+                self._conn.execute('ALTER TABLE outbox ADD COLUMN claimed_until REAL NOT NULL DEFAULT 0')
+        return self._conn
+    
+    def _transaction(self, work):
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = work(conn)
+                conn.execute('COMMIT')
+                return result
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def _acquire(self, role: str, holder: str, ttl: float) -> bool:
+        def work(conn):
+            now = time.time()
+            row = conn.execute('SELECT holder, expires_at FROM leases WHERE role = ?', (role,)).fetchone()
+            if row and row[0] != holder and row[1] > now:
+                return False
+            conn.execute('INSERT OR REPLACE INTO leases VALUES (?, ?, ?)', (role, holder, now + ttl))
+            return True
+        return self._transaction(work)
+    
+    def _release(self, role: str, holder: str):
+        self._transaction(lambda conn: conn.execute('DELETE FROM leases WHERE role = ? AND holder = ?', (role, holder)))
+    
+    def _holder(self, role: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT holder FROM leases WHERE role = ? AND expires_at > ?', (role, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _enqueue(self, channel_id: int, payload: str):
+        self._transaction(lambda conn: conn.execute(
+            'INSERT INTO outbox (channel_id, payload, created_at) VALUES (?, ?, ?)', (channel_id, payload, time.time())
+        ))
+    
+    def _pending_channels(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self._connect().execute(
+                'SELECT DISTINCT channel_id FROM outbox WHERE claimed_until < ?', (time.time(),)
+            )]
+    
+    def _claim(self, channel_ids: Sequence[int], holder: str, lease: float, limit: int) -> List[Tuple[int, int, str]]:
+        def work(conn):
+            now = time.time()
+            marks = ','.join('?' * len(channel_ids))
+            # Unclaimed rows, and rows whose claimant didn't confirm delivery before its lease ran out
+            rows = conn.execute(
+                f'SELECT id, channel_id, payload FROM outbox WHERE channel_id IN ({marks}) AND claimed_until < ? '
+                'ORDER BY id LIMIT ?',
+                (*channel_ids, now, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE outbox SET claimed_by = ?, claimed_until = ? WHERE id = ?',
+                [(holder, now + lease, row[0]) for row in rows]
+            )
+            return rows
+        return self._transaction(work)
+    
+    def _ack(self, message_id: int, holder: str):
+        self._transaction(lambda conn: conn.execute(
+            'DELETE FROM outbox WHERE id = ? AND claimed_by = ?', (message_id, holder)
+        ))
+    
+    def _heartbeat(self, process_id: str, shards: str, guilds: int):
+        self._transaction(lambda conn: conn.execute(
+            'INSERT OR REPLACE INTO processes VALUES (?, ?, ?, ?)', (process_id, shards, guilds, time.time())
+        ))
+    
+    def _processes(self, since: float) -> List[Tuple[str, str, int, float]]:
+        with self._lock:
+            return self._connect().execute(
+                'SELECT id, shards, guilds, seen_at FROM processes WHERE seen_at > ? ORDER BY id', (since,)
+            ).fetchall()
+    
+    def _remove(self, process_id: str):
+        self._transaction(lambda conn: conn.execute('DELETE FROM processes WHERE id = ?', (process_id,)))
+    
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    async def acquire(self, role: str, holder: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._acquire, role, holder, ttl)
+    
+    async def release(self, role: str, holder: str):
+        await asyncio.to_thread(self._release, role, holder)
+    
+    async def holder(self, role: str) -> Optional[str]:
+        return await asyncio.to_thread(self._holder, role)
+    
+    async def enqueue(self, channel_id: int, payload: Dict):
+        await asyncio.to_thread(self._enqueue, channel_id, json.dumps(payload))
+    
+    async def pending_channels(self) -> List[int]:
+        return await asyncio.to_thread(self._pending_channels)
+    
+    async def claim(self, channel_ids: Sequence[int], holder: str, lease: float,
+                    limit: int = 50) -> List[Tuple[int, int, Dict]]:
+        """Lease up to ``limit`` pending messages to ``holder`` for ``lease`` seconds"""
+        rows = await asyncio.to_thread(self._claim, channel_ids, holder, lease, limit)
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+    
+    async def ack(self, message_id: int, holder: str):
+        """Remove a message ``holder`` has sent"""
+        await asyncio.to_thread(self._ack, message_id, holder)
+    
+    async def heartbeat(self, process_id: str, shards: str, guilds: int):
+        await asyncio.to_thread(self._heartbeat, process_id, shards, guilds)
+    
+    async def processes(self, since: float) -> List[Tuple[str, str, int, float]]:
+        return await asyncio.to_thread(self._processes, since)
+    
+    async def remove(self, process_id: str):
+        await asyncio.to_thread(self._remove, process_id)
+    
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+class Coordinator:
+    """
+    Lets several bot processes (each running a range of shards) share one
+    deployment. Every ``interval`` seconds a process reports in, renews or
+    tries to take the background lease, picks up jobs and expiries other
+    processes wrote to the shared stores, and delivers log messages queued
+    for channels only it can see. The lease holder runs the background
+    features (change feed, scheduled jobs, idle detection); if it stops
+    renewing, another process takes over after ``lease_seconds``.
+    """
+    
+    def __init__(self, bot, path: str, process_id: Optional[str] = None,
+                 interval: float = 5, lease_seconds: float = 30):
+        self.bot = bot
+        self.store = CoordinatorStore(path)
+        self.process_id = process_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.interval = interval
+        self.lease_seconds = max(lease_seconds, interval * 2)
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        LEADER.set_function(lambda: 1 if self.is_leader else 0)
+    
+    def shards(self) -> str:
+        ids = self.bot.shard_ids if self.bot.shard_ids is not None else range(self.bot.shard_count or 1)
+        return ','.join(str(shard) for shard in ids)
+    
+    # ==================== LEASE ====================
+    
+    async def _elect(self):
+        try:
+            leader = await self.store.acquire(BACKGROUND_ROLE, self.process_id, self.lease_seconds)
+        except sqlite3.Error as e:
+            # Can't prove the lease is still ours; let it lapse rather than risk two leaders
+            print(f"Coordinator lease check failed: {e}")
+            leader = False
+        if leader and not self.is_leader:
+            self.is_leader = True
+            print(f"✅ {self.process_id} now runs background tasks")
+            await self.bot.start_background()
+        elif not leader and self.is_leader:
+            self.is_leader = False
+            print(f"⚠️ {self.process_id} lost the background lease")
+            await self.bot.stop_background()
+    
+    # ==================== OUTBOX ====================
+    
+    async def send_or_enqueue(self, channel_id: int, embed: discord.Embed) -> bool:
+        """Send to ``channel_id`` if this process can see it, else queue it for one that can; True if sent here"""
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            await channel.send(embed=embed)
+            return True
+        await self.store.enqueue(channel_id, embed.to_dict())
+        OUTBOX_MESSAGES.inc(result='queued')
+        return False
+    
+    async def deliver(self) -> int:
+        """
+        Send queued messages for channels on this process's shards. Messages
+        are leased while being sent and removed only once sent; one that fails
+        (or whose process dies mid-send) is retried after the lease runs out.
+        """
+        visible = [channel_id for channel_id in await self.store.pending_channels() if self.bot.get_channel(channel_id)]
+        if not visible:
+            return 0
+        delivered = 0
+        for message_id, channel_id, payload in await self.store.claim(visible, self.process_id, self.lease_seconds):
+            try:
+                await self.bot.get_channel(channel_id).send(embed=discord.Embed.from_dict(payload))
+            except Exception as e:
+                OUTBOX_MESSAGES.inc(result='failed')
+                print(f"Failed to deliver queued message to {channel_id}: {e}")
+                continue
+            await self.store.ack(message_id, self.process_id)
+            OUTBOX_MESSAGES.inc(result='delivered')
+            delivered += 1
+        return delivered
+    
+    # ==================== LIFECYCLE ====================
+    
+    async def tick(self):
+        await self._elect()
+        await self.store.heartbeat(self.process_id, self.shards(), len(self.bot.guilds))
+        # Jobs and expiries set by commands on other processes
+        await self.bot.scheduler.sync()
+        await self.bot.expiry.sync()
+        await self.deliver()
+    
+    async def processes(self) -> List[ProcessInfo]:
+        """Processes that reported in recently"""
+        leader = await self.store.holder(BACKGROUND_ROLE)
+        rows = await self.store.processes(time.time() - self.lease_seconds)
+        return [ProcessInfo(row[0], row[1], row[2], row[0] == leader, row[3]) for row in rows]
+    
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Coordinator tick failed: {e}")
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            # Hand over straight away instead of after the lease runs out
+            self.is_leader = False
+            await self.store.release(BACKGROUND_ROLE, self.process_id)
+        await self.store.remove(self.process_id)
+        await self.store.close()
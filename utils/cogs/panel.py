@@ -1,66 +1,64 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.api import PterodactylAPI
 from utils.embeds import EmbedBuilder
-from utils.checks import is_admin, not_in_maintenance
-from typing import Optional
+from utils.checks import is_admin, not_in_maintenance, ConfirmView
+from utils.models import Server
+from utils.scheduler import Job
+from utils.power import STAGGERED_SIGNALS
+from utils.drain import DrainPlanner
+from utils.panels import PanelContext, PanelOption
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+import io
+import json
+import time
 
 class PanelCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api = PterodactylAPI(bot.panel_url, bot.app_api_key, bot.client_api_key)
+        self.drain_planners = {panel.name: DrainPlanner(panel.api, panel.index) for panel in bot.panels}
+        bot.scheduler.register('backup_run', self.scheduled_backup)
     
-    @app_commands.command(name="nodes", description="List all panel nodes")
+    @app_commands.command(name="nodes", description="Show node health and capacity")
+    @app_commands.describe(
+        refresh="Probe every node now instead of using recent results",
+        panel="Panel to show (defaults to the main panel)"
+    )
     @is_admin()
-    async def list_nodes(self, interaction: discord.Interaction):
-        """List all nodes"""
+    async def list_nodes(self, interaction: discord.Interaction, refresh: bool = False, panel: Optional[PanelOption] = None):
+        """Node health dashboard"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.list_nodes()
-        
-        if not result['success']:
+        if not await panel.index.ensure_loaded():
             await interaction.followup.send(
-                embed=EmbedBuilder.error("Failed to fetch nodes", result.get('error', 'Unknown error')),
+                embed=EmbedBuilder.error("Failed to fetch nodes", "Could not load the node list from the panel"),
                 ephemeral=True
             )
             return
         
-        nodes = result['data']['data']
+        healths = await panel.node_health.check_all(force=refresh)
         
-        if not nodes:
+        if not healths:
             await interaction.followup.send(
                 embed=EmbedBuilder.info("No Nodes", "No nodes configured in the panel"),
                 ephemeral=True
             )
             return
         
-        embed = discord.Embed(
-            title="🖥️ Panel Nodes",
-            color=discord.Color.purple(),
-            timestamp=discord.utils.utcnow()
-        )
-        
-        for node in nodes:
-            attrs = node['attributes']
-            status = "🟢 Online" if attrs.get('maintenance_mode') is False else "🔴 Maintenance"
-            
-            embed.add_field(
-                name=f"{attrs['name']} (ID: {attrs['id']})",
-                value=f"Status: {status}\nFQDN: `{attrs['fqdn']}`\nMemory: {attrs['memory']} MB\nDisk: {attrs['disk']} MB",
-                inline=False
-            )
-        
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await interaction.followup.send(embed=EmbedBuilder.node_dashboard(healths), ephemeral=True)
     
     @app_commands.command(name="eggs", description="List available eggs")
-    @app_commands.describe(nest_id="Nest ID (default: 1 for Minecraft)")
+    @app_commands.describe(nest_id="Nest ID (default: 1 for Minecraft)", panel="Panel to use (defaults to the main panel)")
     @is_admin()
-    async def list_eggs(self, interaction: discord.Interaction, nest_id: int = 1):
+    async def list_eggs(self, interaction: discord.Interaction, nest_id: int = 1, panel: Optional[PanelOption] = None):
         """List eggs in a nest"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.list_eggs(nest_id=nest_id)
+        result = await panel.api.list_eggs(nest_id=nest_id)
         
         if not result['success']:
             await interaction.followup.send(
@@ -95,24 +93,36 @@ class PanelCommands(commands.Cog):
         await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="panel_status", description="Check panel API status")
+    @app_commands.describe(panel="Panel to check (defaults to every panel)")
     @is_admin()
-    async def panel_status(self, interaction: discord.Interaction):
+    async def panel_status(self, interaction: discord.Interaction, panel: Optional[PanelOption] = None):
         """Check panel connectivity"""
         await interaction.response.defer(ephemeral=True)
         
-        is_online = await self.api.test_connection()
+        panels = [panel] if panel else list(self.bot.panels)
+        online = await asyncio.gather(*(p.api.test_connection() for p in panels))
         
-        if is_online:
+        if len(panels) > 1:
+            reachable = sum(online)
+            builder = EmbedBuilder.success if reachable == len(panels) else EmbedBuilder.warning
+            embed = builder("Panel Status", f"{reachable}/{len(panels)} panels reachable")
+            for p, is_online in zip(panels, online):
+                embed.add_field(
+                    name=f"{'🟢' if is_online else '🔴'} {p.name}",
+                    value=f"{p.url}\n{'Operational' if is_online else 'Unreachable'}",
+                    inline=True
+                )
+        elif online[0]:
             embed = EmbedBuilder.success(
                 "Panel Online",
-                f"✅ Successfully connected to {self.bot.panel_url}"
+                f"✅ Successfully connected to {panels[0].url}"
             )
             embed.add_field(name="API Status", value="🟢 Operational", inline=True)
             embed.add_field(name="Bot Status", value="🟢 Ready", inline=True)
         else:
             embed = EmbedBuilder.error(
                 "Panel Offline",
-                f"❌ Failed to connect to {self.bot.panel_url}"
+                f"❌ Failed to connect to {panels[0].url}"
             )
             embed.add_field(name="API Status", value="🔴 Unreachable", inline=True)
         
@@ -124,6 +134,7 @@ class PanelCommands(commands.Cog):
     async def maintenance_on(self, interaction: discord.Interaction, message: str = None):
         """Enable maintenance mode"""
         self.bot.maintenance_mode = True
+        await self.bot.save_state()
         
         await interaction.response.send_message(
             embed=EmbedBuilder.warning(
@@ -150,6 +161,7 @@ class PanelCommands(commands.Cog):
     async def maintenance_off(self, interaction: discord.Interaction):
         """Disable maintenance mode"""
         self.bot.maintenance_mode = False
+        await self.bot.save_state()
         
         await interaction.response.send_message(
             embed=EmbedBuilder.success(
@@ -169,46 +181,472 @@ class PanelCommands(commands.Cog):
         await self.bot.log_action(log_embed)
     
     @app_commands.command(name="backup_list", description="List backups for a server")
-    @app_commands.describe(server_uuid="Server UUID")
+    @app_commands.describe(
+        server="Server ID, UUID or short identifier",
+        page="Page number",
+        panel="Panel to use (defaults to the main panel)"
+    )
     @is_admin()
-    async def backup_list(self, interaction: discord.Interaction, server_uuid: str):
+    async def backup_list(self, interaction: discord.Interaction, server: str, page: int = 1,
+                          panel: Optional[PanelOption] = None):
         """List server backups"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.list_backups(server_uuid)
-        
-        if not result['success']:
+        await panel.index.ensure_loaded()
+        target = panel.index.find_server(server)
+        if not target:
             await interaction.followup.send(
-                embed=EmbedBuilder.error("Failed to fetch backups", result.get('error', 'Unknown error')),
+                embed=EmbedBuilder.error("Server Not Found", f"No server matches `{server}`"),
                 ephemeral=True
             )
             return
         
-        backups = result['data']['data']
+        backups = await panel.api.fetch_all_backups(target.uuid)
+        
+        if backups is None:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Failed to fetch backups", "Could not load backups from the panel"),
+                ephemeral=True
+            )
+            return
         
         if not backups:
             await interaction.followup.send(
-                embed=EmbedBuilder.info("No Backups", "No backups found for this server"),
+                embed=EmbedBuilder.info("No Backups", f"No backups found for **{target.name}**"),
                 ephemeral=True
             )
             return
         
+        backups.sort(key=lambda b: b.created_at or '', reverse=True)
+        per_page = 10
+        total_pages = max(1, -(-len(backups) // per_page))
+        page = min(max(page, 1), total_pages)
+        
         embed = discord.Embed(
-            title=f"💾 Backups for {server_uuid[:8]}...",
+            title=f"💾 Backups for {target.name} (Page {page}/{total_pages})",
             color=discord.Color.blue(),
             timestamp=discord.utils.utcnow()
         )
         
-        for backup in backups[:10]:
-            attrs = backup['attributes']
-            status = "✅ Complete" if attrs.get('is_successful') else "⏳ In Progress"
+        for backup in backups[(page - 1) * per_page:page * per_page]:
+            if backup.completed_at is None:
+                status = "⏳ In Progress"
+            elif backup.is_successful:
+                status = "✅ Complete"
+            else:
+                status = "❌ Failed"
+            if backup.is_locked:
+                status += " 🔒"
+            created = datetime.fromisoformat(backup.created_at) if backup.created_at else None
             embed.add_field(
-                name=f"{attrs['name']}",
-                value=f"Status: {status}\nSize: {attrs.get('bytes', 0) / 1024 / 1024:.2f} MB\nCreated: <t:{int(attrs.get('created_at', 0))}:R>",
+                name=backup.name,
+                value=(
+                    f"Status: {status}\nSize: {backup.bytes / 1024 / 1024:.2f} MB\n"
+                    f"Created: {discord.utils.format_dt(created, 'R') if created else 'Unknown'}"
+                ),
                 inline=False
             )
         
+        embed.set_footer(text=f"{len(backups)}/{target.backups} backup slots used")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="backup_run", description="Back up many servers at once")
+    @app_commands.describe(
+        server_id="Only this server",
+        node_id="Only servers on this node",
+        owner="Only servers owned by this user",
+        name="Only servers whose name contains this",
+        rotate="Delete the oldest backups when a server is at its backup limit",
+        panel="Panel to use (defaults to the main panel)"
+    )
+    @is_admin()
+    @not_in_maintenance()
+    async def backup_run(
+        self,
+        interaction: discord.Interaction,
+        server_id: Optional[int] = None,
+        node_id: Optional[int] = None,
+        owner: Optional[discord.User] = None,
+        name: Optional[str] = None,
+        rotate: bool = True,
+        panel: Optional[PanelOption] = None
+    ):
+        """Start an orchestrated backup run"""
+        panel = panel or self.bot.panels.default
+        if panel.backups.running:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.warning("Backup Run In Progress", "Wait for the current backup run to finish"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        if not await panel.index.ensure_loaded():
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Backup Failed", "Could not load the server list from the panel"),
+                ephemeral=True
+            )
+            return
+        
+        servers = self._select_servers(panel, server_id, node_id, owner.id if owner else None, name)
+        
+        if not servers:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("No Servers", "No servers match those filters"),
+                ephemeral=True
+            )
+            return
+        
+        if len(servers) > 1:
+            view = ConfirmView()
+            await interaction.followup.send(
+                embed=EmbedBuilder.warning(
+                    "Confirm Backup Run",
+                    f"Back up **{len(servers)}** servers across {len({s.node for s in servers})} node(s)?"
+                    + ("\n\nThe oldest completed, unlocked backups are deleted where a server is at its limit." if rotate else "")
+                ),
+                view=view,
+                ephemeral=True
+            )
+            await view.wait()
+            if not view.value:
+                return
+        
+        await interaction.followup.send(
+            embed=EmbedBuilder.info(
+                "Backup Run Started",
+                f"Backing up {len(servers)} server(s), at most {panel.backups.per_node} at a time per node. "
+                "The report will be posted here and in the log channel."
+            ),
+            ephemeral=True
+        )
+        
+        try:
+            embed = await self._run_backups(panel, servers, rotate, interaction.user.mention)
+        except RuntimeError:
+            # Another run started while this one waited for confirmation
+            await interaction.followup.send(
+                embed=EmbedBuilder.warning("Backup Run In Progress", "Wait for the current backup run to finish"),
+                ephemeral=True
+            )
+            return
+        try:
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except discord.HTTPException:
+            # The interaction token expires after 15 minutes; the log channel still has the report
+            pass
+    
+    @app_commands.command(name="backup_schedule", description="Schedule recurring backups with a cron expression")
+    @app_commands.describe(
+        cron="Cron expression in UTC, e.g. '0 3 * * *' for 03:00 daily",
+        node_id="Only servers on this node",
+        owner="Only servers owned by this user",
+        name="Only servers whose name contains this",
+        rotate="Delete the oldest backups when a server is at its backup limit",
+        catch_up="What to do about runs missed while the bot was offline",
+        panel="Panel to back up (defaults to the main panel)"
+    )
+    @app_commands.choices(catch_up=[
+        app_commands.Choice(name="Run once", value="once"),
+        app_commands.Choice(name="Skip", value="skip")
+    ])
+    @is_admin()
+    @not_in_maintenance()
+    async def backup_schedule(
+        self,
+        interaction: discord.Interaction,
+        cron: str,
+        node_id: Optional[int] = None,
+        owner: Optional[discord.User] = None,
+        name: Optional[str] = None,
+        rotate: bool = True,
+        catch_up: str = 'once',
+        panel: Optional[PanelOption] = None
+    ):
+        """Create or replace a scheduled backup job"""
+        await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
+        
+        job_id = f"backup:panel={panel.name}:node={node_id or '*'}:owner={owner.id if owner else '*'}:name={name or '*'}"
+        payload = {
+            'panel': panel.name,
+            'node_id': node_id,
+            'owner_id': owner.id if owner else None,
+            'name': name,
+            'rotate': rotate,
+            'created_by': interaction.user.id
+        }
+        try:
+            job = await self.bot.scheduler.schedule_cron(job_id, 'backup_run', cron, payload, catch_up=catch_up)
+        except ValueError as e:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Invalid Schedule", str(e)),
+                ephemeral=True
+            )
+            return
+        
+        embed = EmbedBuilder.success(
+            "Backups Scheduled",
+            f"`{job.spec}` (UTC), next run <t:{int(job.next_run)}:R>"
+        )
+        embed.add_field(name="Job ID", value=f"`{job.id}`", inline=False)
         await interaction.followup.send(embed=embed, ephemeral=True)
+        await self.bot.log_action(EmbedBuilder.info(
+            "Backup Job Scheduled",
+            f"{interaction.user.mention} scheduled `{job.id}` on `{job.spec}`"
+        ))
+    
+    @app_commands.command(name="idle_servers", description="List servers that have been idle, optionally stopping them")
+    @app_commands.describe(
+        stop="Stop every listed server to free node capacity",
+        panel="Panel to use (defaults to the main panel)"
+    )
+    @is_admin()
+    @not_in_maintenance()
+    async def idle_servers(self, interaction: discord.Interaction, stop: bool = False,
+                           panel: Optional[PanelOption] = None):
+        """Show servers flagged by the idle detector"""
+        detector = self.bot.idle
+        if not detector:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.info("Idle Detection Disabled", "Set `IDLE_HOURS` above 0 to enable idle detection"),
+                ephemeral=True
+            )
+            return
+        if panel is not None and panel is not self.bot.panels.default:
+            # The detector samples one panel's servers; see IdleDetector
+            await interaction.response.send_message(
+                embed=EmbedBuilder.info(
+                    "Idle Detection Not Available",
+                    f"Idle detection only samples servers on the default panel (`{self.bot.panels.default.name}`)"
+                ),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        flagged = detector.flagged()
+        if not flagged:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info(
+                    "No Idle Servers",
+                    f"No running server has been idle for {detector.idle_seconds / 3600:g}h "
+                    f"({len(detector.activity)} servers tracked)"
+                ),
+                ephemeral=True
+            )
+            return
+        
+        now = time.time()
+        total_memory = sum(a.last.memory_bytes for _, a in flagged) // (1024 * 1024)
+        embed = discord.Embed(
+            title=f"💤 Idle Servers ({len(flagged)})",
+            description=f"Idle for at least {detector.idle_seconds / 3600:g}h, using **{total_memory} MB** of RAM in total",
+            color=discord.Color.dark_grey(),
+            timestamp=discord.utils.utcnow()
+        )
+        for server, activity in flagged[:25]:
+            embed.add_field(
+                name=f"{server.name} (ID: {server.id})",
+                value=(
+                    f"Idle {activity.idle_for(now) / 3600:.1f}h | Node {server.node}\n"
+                    f"RAM {activity.last.memory_bytes // (1024 * 1024)} MB | CPU {activity.last.cpu_absolute:.1f}%"
+                ),
+                inline=False
+            )
+        if len(flagged) > 25:
+            embed.set_footer(text=f"Showing 25 of {len(flagged)} servers")
+        
+        if not stop:
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        view = ConfirmView()
+        await interaction.followup.send(
+            content=f"Stop these {len(flagged)} server(s)?",
+            embed=embed,
+            view=view,
+            ephemeral=True
+        )
+        await view.wait()
+        if not view.value:
+            return
+        
+        stopped = 0
+        for server, activity in flagged:
+            if await detector.stop_server(server, activity):
+                stopped += 1
+        await interaction.followup.send(
+            embed=EmbedBuilder.success(
+                "Idle Servers Stopped",
+                f"Stopped {stopped} of {len(flagged)} idle server(s), freeing about {total_memory} MB of RAM"
+            ),
+            ephemeral=True
+        )
+    
+    @app_commands.command(name="power", description="Start, stop, restart or kill one or many servers")
+    @app_commands.describe(
+        signal="Power action to send",
+        server="Only this server (ID, UUID or identifier)",
+        node_id="Only servers on this node",
+        owner="Only servers owned by this user",
+        name="Only servers whose name contains this",
+        panel="Panel to use (defaults to the main panel)"
+    )
+    @app_commands.choices(signal=[
+        app_commands.Choice(name="Start", value="start"),
+        app_commands.Choice(name="Stop", value="stop"),
+        app_commands.Choice(name="Restart", value="restart"),
+        app_commands.Choice(name="Kill", value="kill")
+    ])
+    @is_admin()
+    @not_in_maintenance()
+    async def power(
+        self,
+        interaction: discord.Interaction,
+        signal: str,
+        server: Optional[str] = None,
+        node_id: Optional[int] = None,
+        owner: Optional[discord.User] = None,
+        name: Optional[str] = None,
+        panel: Optional[PanelOption] = None
+    ):
+        """Send a power signal to the matching servers"""
+        if server is None and node_id is None and owner is None and not name:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("No Target", "Choose a server or at least one filter"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
+        
+        if not await panel.index.ensure_loaded():
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Power Action Failed", "Could not load the server list from the panel"),
+                ephemeral=True
+            )
+            return
+        
+        server_id = None
+        if server is not None:
+            target = panel.index.find_server(server)
+            if target is None:
+                await interaction.followup.send(
+                    embed=EmbedBuilder.error("Server Not Found", f"No server matches `{server}`"),
+                    ephemeral=True
+                )
+                return
+            server_id = target.id
+        
+        servers = [s for s in self._select_servers(panel, server_id, node_id, owner.id if owner else None, name) if not s.suspended]
+        if not servers:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("No Servers", "No unsuspended servers match those filters"),
+                ephemeral=True
+            )
+            return
+        
+        if len(servers) > 1 or signal == 'kill':
+            view = ConfirmView()
+            stagger = ""
+            if signal in STAGGERED_SIGNALS and len(servers) > 1:
+                stagger = f"\n\nStarts are spaced {panel.power.stagger:g}s apart on each node."
+            await interaction.followup.send(
+                embed=EmbedBuilder.warning(
+                    f"Confirm {signal.capitalize()}",
+                    f"Send **{signal}** to **{len(servers)}** server(s) across {len({s.node for s in servers})} node(s)?"
+                    + stagger
+                ),
+                view=view,
+                ephemeral=True
+            )
+            await view.wait()
+            if not view.value:
+                return
+        
+        report = await panel.power.run(servers, signal)
+        embed = EmbedBuilder.power_report(report)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        
+        embed.add_field(name="👮 Sent By", value=interaction.user.mention, inline=False)
+        await self.bot.log_action(embed)
+    
+    @app_commands.command(name="drain_plan", description="Plan moving every server off a node")
+    @app_commands.describe(
+        node_id="Node to drain",
+        same_location="Only place servers on nodes in the same location",
+        panel="Panel to use (defaults to the main panel)"
+    )
+    @is_admin()
+    async def drain_plan(self, interaction: discord.Interaction, node_id: int, same_location: bool = False,
+                         panel: Optional[PanelOption] = None):
+        """Compute a placement of a node's servers onto the other nodes"""
+        await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
+        
+        plan = await self.drain_planners[panel.name].plan(node_id, same_location=same_location)
+        if plan is None:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Drain Plan Failed", f"Node ID {node_id} was not found or the panel index could not be loaded"),
+                ephemeral=True
+            )
+            return
+        
+        if not plan.moves and not plan.unplaced:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("Nothing To Drain", f"Node **{plan.source.name}** has no servers"),
+                ephemeral=True
+            )
+            return
+        
+        data = json.dumps(plan.to_dict(), indent=2).encode()
+        await interaction.followup.send(
+            embed=EmbedBuilder.drain_plan(plan),
+            file=discord.File(io.BytesIO(data), filename=f"drain-node-{node_id}.json"),
+            ephemeral=True
+        )
+    
+    def _select_servers(self, panel: PanelContext, server_id: Optional[int], node_id: Optional[int],
+                        owner_id: Optional[int], name: Optional[str]) -> List[Server]:
+        """Index servers on ``panel`` matching the backup filters"""
+        servers = panel.index.servers_for_owner(owner_id) if owner_id else panel.index.sorted_servers()
+        if server_id is not None:
+            servers = [s for s in servers if s.id == server_id]
+        if node_id is not None:
+            servers = [s for s in servers if s.node == node_id]
+        if name:
+            servers = [s for s in servers if name.lower() in s.name.lower()]
+        return servers
+    
+    async def _run_backups(self, panel: PanelContext, servers: List[Server], rotate: bool, started_by: str) -> discord.Embed:
+        """Run the panel's orchestrator and post its report to the log channel"""
+        report = await panel.backups.run(servers, rotate=rotate)
+        embed = EmbedBuilder.backup_report(report)
+        embed.add_field(name="👮 Started By", value=started_by, inline=False)
+        if len(self.bot.panels) > 1:
+            embed.add_field(name="🦖 Panel", value=panel.name, inline=False)
+        await self.bot.log_action(embed)
+        return embed
+    
+    async def scheduled_backup(self, job: Job):
+        """Scheduler handler for ``backup_run`` jobs"""
+        payload = job.payload
+        # Jobs scheduled before panels were selectable have no panel and use the default
+        panel = self.bot.panels.get(payload.get('panel'))
+        if panel is None:
+            raise RuntimeError(f"Panel '{payload['panel']}' is no longer configured")
+        if panel.backups.running:
+            raise RuntimeError("Another backup run is still in progress")
+        if not await panel.index.ensure_loaded():
+            raise RuntimeError("Could not load the server list from the panel")
+        servers = self._select_servers(panel, None, payload.get('node_id'), payload.get('owner_id'), payload.get('name'))
+        if servers:
+            await self._run_backups(panel, servers, payload.get('rotate', True), f"Scheduled job `{job.id}`")
 
 async def setup(bot):
     await bot.add_cog(PanelCommands(bot))
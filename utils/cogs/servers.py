@@ -1,15 +1,25 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.api import PterodactylAPI
 from utils.embeds import EmbedBuilder
 from utils.checks import is_admin, not_in_maintenance, ConfirmView
+from utils.models import Server, User, parse_item
+from utils.events import ServerCreated, ServerDeleted, ServerSuspended, ServerUnsuspended
+from utils.panels import PanelContext, PanelOption
 from typing import Optional
+from datetime import datetime, timezone
+import dataclasses
+import time
 
 class ServerCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api = PterodactylAPI(bot.panel_url, bot.app_api_key, bot.client_api_key)
+        self.api = bot.api
+        self.index = bot.index
+    
+    async def _current_server(self, panel: PanelContext, server_id: int) -> Optional[Server]:
+        """Cached server model, fetched from the panel on a cache miss"""
+        return panel.index.get_server(server_id) or await panel.api.get_server_model(server_id)
     
     @app_commands.command(name="createserver", description="Create a new server for a user")
     @app_commands.describe(
@@ -20,7 +30,8 @@ class ServerCommands(commands.Cog):
         version="Server version/type",
         node_id="Node ID",
         egg_id="Egg ID",
-        user="Discord user to assign server to"
+        user="Discord user to assign server to",
+        panel="Panel to use (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -34,10 +45,12 @@ class ServerCommands(commands.Cog):
         version: str,
         node_id: int,
         egg_id: int,
-        user: discord.User
+        user: discord.User,
+        panel: Optional[PanelOption] = None
     ):
         """Create a new Pterodactyl server"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
         try:
             # Validate resources
@@ -63,18 +76,22 @@ class ServerCommands(commands.Cog):
                 return
             
             # Validate node
-            node_check = await self.api.get_node(node_id)
-            if not node_check['success']:
-                await interaction.followup.send(
-                    embed=EmbedBuilder.error("Invalid Node", f"Node ID {node_id} does not exist"),
-                    ephemeral=True
-                )
-                return
-            
-            node_name = node_check['data']['attributes']['name']
+            node = panel.index.get_node(node_id)
+            if node:
+                node_name = node.name
+            else:
+                node_check = await panel.api.get_node(node_id)
+                if not node_check['success']:
+                    await interaction.followup.send(
+                        embed=EmbedBuilder.error("Invalid Node", f"Node ID {node_id} does not exist"),
+                        ephemeral=True
+                    )
+                    return
+                
+                node_name = node_check['data']['attributes']['name']
             
             # Validate egg
-            egg_check = await self.api.get_egg(egg_id)
+            egg_check = await panel.api.get_egg(egg_id)
             if not egg_check['success']:
                 await interaction.followup.send(
                     embed=EmbedBuilder.error("Invalid Egg", f"Egg ID {egg_id} does not exist"),
@@ -82,20 +99,33 @@ class ServerCommands(commands.Cog):
                 )
                 return
             
-            # Create or get user
+            # Create or get user (linked by Discord ID, falling back to the email match)
             email = f"{user.name}@discord.local"
             username = user.name.lower().replace(" ", "_")
             
-            pterodactyl_user = await self.api.get_user_by_email(email)
+            pterodactyl_user = panel.index.get_user_by_discord_id(user.id) or panel.index.get_user_by_email(email)
+            if not pterodactyl_user:
+                found = await panel.api.get_user_by_external_id(str(user.id)) or await panel.api.get_user_by_email(email)
+                if found:
+                    pterodactyl_user = parse_item(found, User)
+                    panel.index.upsert_user(pterodactyl_user)
             new_user = False
             password = None
             
+            if pterodactyl_user and pterodactyl_user.discord_id is None:
+                # Link accounts created before owners were tracked
+                link_result = await panel.api.set_user_external_id(pterodactyl_user, str(user.id))
+                if link_result['success']:
+                    pterodactyl_user = parse_item(link_result['data'], User)
+                    panel.index.upsert_user(pterodactyl_user)
+            
             if not pterodactyl_user:
-                user_result = await self.api.create_user(
+                user_result = await panel.api.create_user(
                     email=email,
                     username=username,
                     first_name=user.name,
-                    last_name="Discord"
+                    last_name="Discord",
+                    external_id=str(user.id)
                 )
                 
                 if not user_result['success']:
@@ -105,14 +135,15 @@ class ServerCommands(commands.Cog):
                     )
                     return
                 
-                pterodactyl_user = user_result['data']['attributes']
+                pterodactyl_user = parse_item(user_result['data'], User)
                 password = user_result.get('password')
                 new_user = True
+                panel.index.upsert_user(pterodactyl_user)
             
-            ptero_user_id = pterodactyl_user['id']
+            ptero_user_id = pterodactyl_user.id
             
             # Create server
-            server_result = await self.api.create_server(
+            server_result = await panel.api.create_server(
                 user_id=ptero_user_id,
                 name=name,
                 ram=ram,
@@ -129,8 +160,9 @@ class ServerCommands(commands.Cog):
                 )
                 return
             
-            server_data = server_result['data']['attributes']
-            server_id = server_data['id']
+            server = dataclasses.replace(
+                parse_item(server_result['data'], Server), owner_discord_id=user.id
+            )
             
             # Send success to admin
             await interaction.followup.send(
@@ -138,7 +170,7 @@ class ServerCommands(commands.Cog):
                     "Server Created",
                     f"Server **{name}** has been created for {user.mention}",
                     **{
-                        "Server ID": str(server_id),
+                        "Server ID": str(server.id),
                         "Node": node_name,
                         "RAM": f"{ram} MB",
                         "CPU": f"{cpu}%",
@@ -148,42 +180,18 @@ class ServerCommands(commands.Cog):
                 ephemeral=True
             )
             
-            # ========== MANDATORY DM TO USER ==========
-            dm_embed = EmbedBuilder.dm_server_created(
-                server_name=name,
-                server_id=str(server_id),
-                node=node_name,
-                ram=ram,
-                cpu=cpu,
-                disk=disk,
+            # DM, audit log and cache update happen in the event subscribers
+            self.bot.events.publish(ServerCreated(
+                server,
+                source='command',
+                actor=interaction.user,
+                recipient=user,
+                node_name=node_name,
                 version=version,
-                panel_url=self.bot.panel_url,
-                username=username,
-                password=password if new_user else None
-            )
-            
-            dm_success = await self.bot.send_user_dm(user, dm_embed)
-            
-            # Log action
-            log_embed = EmbedBuilder.log_server_action(
-                action="created",
-                admin=interaction.user.mention,
-                user=user.mention,
-                server_info={
-                    'id': server_id,
-                    'name': name,
-                    'resources': {'ram': ram, 'cpu': cpu, 'disk': disk}
-                }
-            )
-            
-            if not dm_success:
-                log_embed.add_field(
-                    name="⚠️ DM Status",
-                    value="Failed to send DM to user",
-                    inline=False
-                )
-            
-            await self.bot.log_action(log_embed)
+                username=pterodactyl_user.username,
+                password=password if new_user else None,
+                panel=panel.name
+            ))
             
         except Exception as e:
             await interaction.followup.send(
@@ -194,7 +202,8 @@ class ServerCommands(commands.Cog):
     @app_commands.command(name="delete_server", description="Delete a server")
     @app_commands.describe(
         server_id="Server ID to delete",
-        user="User who owns the server"
+        user="User to notify (defaults to the server's linked owner)",
+        panel="Panel to use (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -202,19 +211,21 @@ class ServerCommands(commands.Cog):
         self,
         interaction: discord.Interaction,
         server_id: int,
-        user: discord.User
+        user: Optional[discord.User] = None,
+        panel: Optional[PanelOption] = None
     ):
         """Delete a server with confirmation"""
+        panel = panel or self.bot.panels.default
         # Get server info first
-        server_info = await self.api.get_server(server_id)
-        if not server_info['success']:
+        server = await self._current_server(panel, server_id)
+        if not server:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error("Server Not Found", f"Server ID {server_id} does not exist"),
                 ephemeral=True
             )
             return
         
-        server_name = server_info['data']['attributes']['name']
+        server_name = server.name
         
         # Confirmation
         view = ConfirmView()
@@ -233,7 +244,7 @@ class ServerCommands(commands.Cog):
             return
         
         # Delete server
-        result = await self.api.delete_server(server_id, force=True)
+        result = await panel.api.delete_server(server_id, force=True)
         
         if not result['success']:
             await interaction.followup.send(
@@ -251,28 +262,16 @@ class ServerCommands(commands.Cog):
             ephemeral=True
         )
         
-        # ========== MANDATORY DM TO USER ==========
-        dm_embed = EmbedBuilder.dm_server_deleted(
-            server_id=str(server_id),
-            deleted_by=interaction.user.mention
-        )
-        
-        await self.bot.send_user_dm(user, dm_embed)
-        
-        # Log action
-        log_embed = EmbedBuilder.log_server_action(
-            action="deleted",
-            admin=interaction.user.mention,
-            user=user.mention,
-            server_info={'id': server_id, 'name': server_name}
-        )
-        await self.bot.log_action(log_embed)
+        self.bot.events.publish(ServerDeleted(
+            server, source='command', actor=interaction.user, recipient=user, panel=panel.name
+        ))
     
     @app_commands.command(name="suspend", description="Suspend a server")
     @app_commands.describe(
         server_id="Server ID to suspend",
-        user="User who owns the server",
-        reason="Reason for suspension"
+        user="User to notify (defaults to the server's linked owner)",
+        reason="Reason for suspension",
+        panel="Panel to use (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -280,13 +279,15 @@ class ServerCommands(commands.Cog):
         self,
         interaction: discord.Interaction,
         server_id: int,
-        user: discord.User,
-        reason: str = "Administrative action"
+        user: Optional[discord.User] = None,
+        reason: str = "Administrative action",
+        panel: Optional[PanelOption] = None
     ):
         """Suspend a server"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.suspend_server(server_id)
+        result = await panel.api.suspend_server(server_id)
         
         if not result['success']:
             await interaction.followup.send(
@@ -304,28 +305,22 @@ class ServerCommands(commands.Cog):
             ephemeral=True
         )
         
-        # ========== MANDATORY DM TO USER ==========
-        dm_embed = EmbedBuilder.dm_server_suspended(
-            server_id=str(server_id),
-            reason=reason
-        )
-        
-        await self.bot.send_user_dm(user, dm_embed)
-        
-        # Log action
-        log_embed = EmbedBuilder.log_server_action(
-            action="suspended",
-            admin=interaction.user.mention,
-            user=user.mention,
-            server_info={'id': server_id}
-        )
-        log_embed.add_field(name="Reason", value=reason, inline=False)
-        await self.bot.log_action(log_embed)
+        server = await self._current_server(panel, server_id)
+        if server:
+            self.bot.events.publish(ServerSuspended(
+                dataclasses.replace(server, suspended=True),
+                source='command',
+                actor=interaction.user,
+                recipient=user,
+                reason=reason,
+                panel=panel.name
+            ))
     
     @app_commands.command(name="unsuspend", description="Unsuspend a server")
     @app_commands.describe(
         server_id="Server ID to unsuspend",
-        user="User who owns the server"
+        user="User to notify (defaults to the server's linked owner)",
+        panel="Panel to use (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -333,12 +328,14 @@ class ServerCommands(commands.Cog):
         self,
         interaction: discord.Interaction,
         server_id: int,
-        user: discord.User
+        user: Optional[discord.User] = None,
+        panel: Optional[PanelOption] = None
     ):
         """Unsuspend a server"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.unsuspend_server(server_id)
+        result = await panel.api.unsuspend_server(server_id)
         
         if not result['success']:
             await interaction.followup.send(
@@ -356,27 +353,24 @@ class ServerCommands(commands.Cog):
             ephemeral=True
         )
         
-        # ========== MANDATORY DM TO USER ==========
-        dm_embed = EmbedBuilder.dm_server_unsuspended(server_id=str(server_id))
-        
-        await self.bot.send_user_dm(user, dm_embed)
-        
-        # Log action
-        log_embed = EmbedBuilder.log_server_action(
-            action="unsuspended",
-            admin=interaction.user.mention,
-            user=user.mention,
-            server_info={'id': server_id}
-        )
-        await self.bot.log_action(log_embed)
+        server = await self._current_server(panel, server_id)
+        if server:
+            self.bot.events.publish(ServerUnsuspended(
+                dataclasses.replace(server, suspended=False),
+                source='command',
+                actor=interaction.user,
+                recipient=user,
+                panel=panel.name
+            ))
     
     @app_commands.command(name="set_resources", description="Update server resources")
     @app_commands.describe(
         server_id="Server ID",
-        user="User who owns the server",
+        user="User to notify (defaults to the server's linked owner)",
         ram="New RAM in MB (optional)",
         cpu="New CPU percentage (optional)",
-        disk="New disk space in MB (optional)"
+        disk="New disk space in MB (optional)",
+        panel="Panel to use (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -384,13 +378,15 @@ class ServerCommands(commands.Cog):
         self,
         interaction: discord.Interaction,
         server_id: int,
-        user: discord.User,
+        user: Optional[discord.User] = None,
         ram: Optional[int] = None,
         cpu: Optional[int] = None,
-        disk: Optional[int] = None
+        disk: Optional[int] = None,
+        panel: Optional[PanelOption] = None
     ):
         """Update server resource limits"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
         if not any([ram, cpu, disk]):
             await interaction.followup.send(
@@ -399,7 +395,15 @@ class ServerCommands(commands.Cog):
             )
             return
         
-        result = await self.api.update_server_build(server_id, ram=ram, cpu=cpu, disk=disk)
+        # A cache miss is fetched here rather than inside the update, so the event has a 'before' either way
+        before = await self._current_server(panel, server_id)
+        if before is None:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Update Failed", f"Server {server_id} not found"),
+                ephemeral=True
+            )
+            return
+        result = await panel.update_build(self.bot.events, before, ram, cpu, disk, actor=interaction.user, recipient=user)
         
         if not result['success']:
             await interaction.followup.send(
@@ -421,47 +425,28 @@ class ServerCommands(commands.Cog):
             ),
             ephemeral=True
         )
-        
-        # ========== MANDATORY DM TO USER ==========
-        dm_embed = EmbedBuilder.dm_resources_updated(
-            server_id=str(server_id),
-            ram=ram,
-            cpu=cpu,
-            disk=disk
-        )
-        
-        await self.bot.send_user_dm(user, dm_embed)
-        
-        # Log action
-        log_embed = EmbedBuilder.log_server_action(
-            action="updated",
-            admin=interaction.user.mention,
-            user=user.mention,
-            server_info={
-                'id': server_id,
-                'resources': {'ram': ram, 'cpu': cpu, 'disk': disk}
-            }
-        )
-        await self.bot.log_action(log_embed)
     
     @app_commands.command(name="list_servers", description="List all servers")
+    @app_commands.describe(page="Page number", panel="Panel to list (defaults to the main panel)")
     @is_admin()
-    async def list_servers(self, interaction: discord.Interaction, page: int = 1):
+    async def list_servers(self, interaction: discord.Interaction, page: int = 1, panel: Optional[PanelOption] = None):
         """List servers with pagination"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.list_servers(page=page)
-        
-        if not result['success']:
+        if not await panel.index.ensure_loaded():
             await interaction.followup.send(
-                embed=EmbedBuilder.error("Failed to fetch servers", result.get('error', 'Unknown error')),
+                embed=EmbedBuilder.error("Failed to fetch servers", "Could not load the server list from the panel"),
                 ephemeral=True
             )
             return
         
-        servers = result['data']['data']
+        servers = panel.index.sorted_servers()
+        per_page = 10
+        total_pages = max(1, -(-len(servers) // per_page))
+        page_servers = servers[(page - 1) * per_page:page * per_page]
         
-        if not servers:
+        if not page_servers:
             await interaction.followup.send(
                 embed=EmbedBuilder.info("No Servers", "No servers found on this page"),
                 ephemeral=True
@@ -469,62 +454,62 @@ class ServerCommands(commands.Cog):
             return
         
         embed = discord.Embed(
-            title=f"🖥️ Servers (Page {page})",
+            title=f"🖥️ Servers (Page {page}/{total_pages})" + (f" · {panel.name}" if len(self.bot.panels) > 1 else ""),
             color=discord.Color.blue(),
             timestamp=discord.utils.utcnow()
         )
         
-        for server in servers[:10]:
-            attrs = server['attributes']
-            status = "🔴 Suspended" if attrs.get('suspended') else "🟢 Active"
+        for server in page_servers:
+            status = "🔴 Suspended" if server.suspended else "🟢 Active"
             embed.add_field(
-                name=f"{attrs['name']} (ID: {attrs['id']})",
-                value=f"Status: {status}\nUUID: `{attrs['uuid'][:16]}...`",
+                name=f"{server.name} (ID: {server.id})",
+                value=f"Status: {status}\nUUID: `{server.uuid[:16]}...`",
                 inline=False
             )
         
+        embed.set_footer(text=f"{len(servers)} servers total")
         await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="server_info", description="Get detailed server information")
-    @app_commands.describe(server_id="Server ID")
+    @app_commands.describe(server_id="Server ID", panel="Panel to use (defaults to the main panel)")
     @is_admin()
-    async def server_info(self, interaction: discord.Interaction, server_id: int):
+    async def server_info(self, interaction: discord.Interaction, server_id: int, panel: Optional[PanelOption] = None):
         """Display detailed server information"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.get_server(server_id)
+        server = await panel.api.get_server_model(server_id)
         
-        if not result['success']:
+        if not server:
             await interaction.followup.send(
                 embed=EmbedBuilder.error("Server Not Found", f"Server ID {server_id} does not exist"),
                 ephemeral=True
             )
             return
         
+        panel.index.upsert_server(server)
         await interaction.followup.send(
-            embed=EmbedBuilder.server_info(result['data']),
+            embed=EmbedBuilder.server_info(server),
             ephemeral=True
         )
     
     @app_commands.command(name="server_search", description="Search for servers by name")
-    @app_commands.describe(name="Server name to search for")
+    @app_commands.describe(name="Server name to search for", panel="Only search this panel (defaults to all panels)")
     @is_admin()
-    async def server_search(self, interaction: discord.Interaction, name: str):
+    async def server_search(self, interaction: discord.Interaction, name: str, panel: Optional[PanelOption] = None):
         """Search servers by name"""
         await interaction.response.defer(ephemeral=True)
         
-        result = await self.api.list_servers()
+        # Every panel's index is searched at once and the results merged
+        matches, failed = await self.bot.panels.search_servers(name, [panel] if panel else None)
         
-        if not result['success']:
+        if not matches and failed:
             await interaction.followup.send(
-                embed=EmbedBuilder.error("Search Failed", result.get('error', 'Unknown error')),
+                embed=EmbedBuilder.error("Search Failed", f"Could not load the server list from: {', '.join(failed)}"),
                 ephemeral=True
             )
             return
         
-        servers = result['data']['data']
-        matches = [s for s in servers if name.lower() in s['attributes']['name'].lower()]
-        
         if not matches:
             await interaction.followup.send(
                 embed=EmbedBuilder.info("No Results", f"No servers found matching '{name}'"),
@@ -537,14 +522,207 @@ class ServerCommands(commands.Cog):
             color=discord.Color.blue()
         )
         
-        for server in matches[:10]:
-            attrs = server['attributes']
+        multi = len(self.bot.panels) > 1
+        for found_on, server in matches[:10]:
             embed.add_field(
-                name=f"{attrs['name']} (ID: {attrs['id']})",
-                value=f"UUID: `{attrs['uuid'][:16]}...`",
+                name=f"{server.name} (ID: {server.id})",
+                value=f"UUID: `{server.uuid[:16]}...`" + (f"\nPanel: {found_on.name}" if multi else ""),
                 inline=False
             )
         
+        footer = []
+        if len(matches) > 10:
+            footer.append(f"Showing 10 of {len(matches)} matches")
+        if failed:
+            footer.append(f"Unavailable: {', '.join(failed)}")
+        if footer:
+            embed.set_footer(text=" · ".join(footer))
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="my_servers", description="List the servers you own")
+    async def my_servers(self, interaction: discord.Interaction):
+        """List servers linked to the invoking Discord user"""
+        await interaction.response.defer(ephemeral=True)
+        
+        # Servers on every panel, fetched concurrently
+        servers, failed = await self.bot.panels.servers_for_owner(interaction.user.id)
+        
+        if not servers and failed:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Failed to fetch servers", "Could not load the server list from the panel"),
+                ephemeral=True
+            )
+            return
+        
+        if not servers:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("No Servers", "You don't own any servers on the panel"),
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title=f"🖥️ Your Servers ({len(servers)})",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        multi = len(self.bot.panels) > 1
+        for found_on, server in servers[:25]:
+            status = "🔴 Suspended" if server.suspended else "🟢 Active"
+            # Expiries are tracked for the default panel only
+            expiry = self.bot.expiry.get(server.id) if found_on is self.bot.panels.default else None
+            if expiry:
+                status += f" | Expires <t:{int(expiry.expires_at)}:R>"
+            embed.add_field(
+                name=f"{server.name} (ID: {server.id})" + (f" · {found_on.name}" if multi else ""),
+                value=f"Status: {status}\nRAM: {server.memory} MB | CPU: {server.cpu}% | Disk: {server.disk} MB",
+                inline=False
+            )
+        
+        footer = []
+        if len(servers) > 25:
+            footer.append(f"Showing 25 of {len(servers)} servers")
+        if failed:
+            footer.append(f"Unavailable: {', '.join(failed)}")
+        if footer:
+            embed.set_footer(text=" · ".join(footer))
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="set_expiry", description="Set or extend when a server expires")
+    @app_commands.describe(
+        server_id="Server ID",
+        days="Expire this many days from now",
+        date="Expiry date in UTC as YYYY-MM-DD or YYYY-MM-DD HH:MM"
+    )
+    @is_admin()
+    @not_in_maintenance()
+    async def set_expiry(
+        self,
+        interaction: discord.Interaction,
+        server_id: int,
+        days: Optional[app_commands.Range[int, 1, 3650]] = None,
+        date: Optional[str] = None
+    ):
+        """Set a server's expiry date"""
+        if (days is None) == (date is None):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Invalid Expiry", "Give either `days` or `date`"),
+                ephemeral=True
+            )
+            return
+        
+        if days is not None:
+            expires_at = time.time() + days * 86400
+        else:
+            try:
+                fmt = '%Y-%m-%d %H:%M' if ' ' in date.strip() else '%Y-%m-%d'
+                expires_at = datetime.strptime(date.strip(), fmt).replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error("Invalid Date", "Use `YYYY-MM-DD` or `YYYY-MM-DD HH:MM` (UTC)"),
+                    ephemeral=True
+                )
+                return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        server = await self._current_server(self.bot.panels.default, server_id)
+        if not server:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Server Not Found", f"Server ID {server_id} does not exist"),
+                ephemeral=True
+            )
+            return
+        
+        try:
+            record, lifted = await self.bot.expiry.set_expiry(server_id, expires_at, set_by=interaction.user.id)
+        except RuntimeError as e:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Expiry Update Failed", str(e)),
+                ephemeral=True
+            )
+            return
+        
+        suspend_at = self.bot.expiry.suspend_at(record)
+        description = (
+            f"**{server.name}** (ID: {server_id}) expires <t:{int(record.expires_at)}:F> "
+            f"and is suspended <t:{int(suspend_at)}:R> unless renewed"
+        )
+        if lifted:
+            description += "\n\nIts expiry suspension has been lifted."
+        await interaction.followup.send(
+            embed=EmbedBuilder.success("Expiry Set", description),
+            ephemeral=True
+        )
+        await self.bot.log_action(EmbedBuilder.info(
+            "Server Expiry Set",
+            f"{interaction.user.mention} set **{server.name}** (ID: {server_id}) to expire <t:{int(record.expires_at)}:F>"
+        ))
+    
+    @app_commands.command(name="clear_expiry", description="Remove a server's expiry date")
+    @app_commands.describe(server_id="Server ID")
+    @is_admin()
+    @not_in_maintenance()
+    async def clear_expiry(self, interaction: discord.Interaction, server_id: int):
+        """Stop tracking a server's expiry"""
+        await interaction.response.defer(ephemeral=True)
+        
+        if not await self.bot.expiry.clear(server_id):
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("No Expiry", f"Server ID {server_id} has no expiry date"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.followup.send(
+            embed=EmbedBuilder.success("Expiry Cleared", f"Server ID {server_id} no longer expires"),
+            ephemeral=True
+        )
+        await self.bot.log_action(EmbedBuilder.info(
+            "Server Expiry Cleared",
+            f"{interaction.user.mention} removed the expiry of server ID {server_id}"
+        ))
+    
+    @app_commands.command(name="expiring", description="List servers expiring soon")
+    @app_commands.describe(days="Look this many days ahead")
+    @is_admin()
+    async def expiring(self, interaction: discord.Interaction, days: app_commands.Range[int, 1, 365] = 7):
+        """List servers that expire within the given number of days"""
+        await interaction.response.defer(ephemeral=True)
+        
+        records = self.bot.expiry.upcoming(days * 86400)
+        if not records:
+            await interaction.followup.send(
+                embed=EmbedBuilder.info("Nothing Expiring", f"No servers expire in the next {days} day(s)"),
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title=f"⏳ Expiring Within {days} Day(s) ({len(records)})",
+            color=discord.Color.gold(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        for record in records[:25]:
+            server = self.index.get_server(record.server_id)
+            name = server.name if server else "Unknown"
+            owner = f"<@{server.owner_discord_id}>" if server and server.owner_discord_id else "Not linked"
+            embed.add_field(
+                name=f"{name} (ID: {record.server_id})",
+                value=(
+                    f"Expires <t:{int(record.expires_at)}:R> | Suspends <t:{int(self.bot.expiry.suspend_at(record))}:R>\n"
+                    f"Owner: {owner}"
+                ),
+                inline=False
+            )
+        
+        if len(records) > 25:
+            embed.set_footer(text=f"Showing 25 of {len(records)} servers")
+        
         await interaction.followup.send(embed=embed, ephemeral=True)
 
 async def setup(bot):
@@ -1,25 +1,30 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.api import PterodactylAPI
 from utils.embeds import EmbedBuilder
 from utils.checks import is_admin, not_in_maintenance, ConfirmView
+from utils.models import User, parse_item
+from utils.panels import PanelOption
+from typing import Optional
+import asyncio
 import random
 import string
 
 class UserCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api = PterodactylAPI(bot.panel_url, bot.app_api_key, bot.client_api_key)
+        self.api = bot.api
+        self.index = bot.index
     
     @app_commands.command(name="user_list", description="List all Pterodactyl users")
-    @app_commands.describe(page="Page number")
+    @app_commands.describe(page="Page number", panel="Panel to list (defaults to the main panel)")
     @is_admin()
-    async def user_list(self, interaction: discord.Interaction, page: int = 1):
+    async def user_list(self, interaction: discord.Interaction, page: int = 1, panel: Optional[PanelOption] = None):
         """List all users"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
-        result = await self.api.list_users(page=page)
+        result = await panel.api.list_users(page=page)
         
         if not result['success']:
             await interaction.followup.send(
@@ -38,7 +43,7 @@ class UserCommands(commands.Cog):
             return
         
         embed = discord.Embed(
-            title=f"👥 Panel Users (Page {page})",
+            title=f"👥 Panel Users (Page {page})" + (f" · {panel.name}" if len(self.bot.panels) > 1 else ""),
             color=discord.Color.blue(),
             timestamp=discord.utils.utcnow()
         )
@@ -55,26 +60,41 @@ class UserCommands(commands.Cog):
         await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="user_search", description="Search for a user by email or username")
-    @app_commands.describe(query="Email or username to search for")
+    @app_commands.describe(query="Email or username to search for", panel="Only search this panel (defaults to all panels)")
     @is_admin()
-    async def user_search(self, interaction: discord.Interaction, query: str):
+    async def user_search(self, interaction: discord.Interaction, query: str, panel: Optional[PanelOption] = None):
         """Search for users"""
         await interaction.response.defer(ephemeral=True)
         
-        # Try email search first
-        user = await self.api.get_user_by_email(query)
-        
-        if user:
-            attrs = user['attributes']
+        # Every panel's index is searched at once: exact email matches first, then partial email/username
+        panels = [panel] if panel else list(self.bot.panels)
+        matches, failed = await self.bot.panels.search_users(query, panels)
+        if failed:
+            # Panels whose index couldn't load still get an exact email lookup
+            failed_panels = [p for p in panels if p.name in failed]
+            found = await asyncio.gather(*(p.api.get_user_by_email(query) for p in failed_panels))
+            matches.extend((p, parse_item(result, User)) for p, result in zip(failed_panels, found) if result)
+        
+        if matches:
+            found_on, user = matches[0]
             embed = discord.Embed(
-                title=f"👤 User Found: {attrs['username']}",
+                title=f"👤 User Found: {user.username}",
                 color=discord.Color.green()
             )
-            embed.add_field(name="🆔 ID", value=attrs['id'], inline=True)
-            embed.add_field(name="📧 Email", value=attrs['email'], inline=True)
-            embed.add_field(name="👤 Name", value=f"{attrs['first_name']} {attrs['last_name']}", inline=True)
-            embed.add_field(name="👑 Admin", value="✅" if attrs.get('root_admin') else "❌", inline=True)
-            embed.add_field(name="🔐 2FA", value="✅" if attrs.get('2fa') else "❌", inline=True)
+            embed.add_field(name="🆔 ID", value=user.id, inline=True)
+            embed.add_field(name="📧 Email", value=user.email, inline=True)
+            embed.add_field(name="👤 Name", value=f"{user.first_name} {user.last_name}", inline=True)
+            embed.add_field(name="👑 Admin", value="✅" if user.root_admin else "❌", inline=True)
+            embed.add_field(name="🔐 2FA", value="✅" if user.two_factor else "❌", inline=True)
+            if user.discord_id:
+                embed.add_field(name="🔗 Discord", value=f"<@{user.discord_id}>", inline=True)
+            if len(self.bot.panels) > 1:
+                embed.add_field(name="🦖 Panel", value=found_on.name, inline=True)
+            if len(matches) > 1:
+                others = [f"`{p.name}` {u.username} ({u.email}, ID: {u.id})" for p, u in matches[1:6]]
+                if len(matches) > 6:
+                    others.append(f"... and {len(matches) - 6} more")
+                embed.add_field(name="🔎 Other Matches", value="\n".join(others)[:1024], inline=False)
             
             await interaction.followup.send(embed=embed, ephemeral=True)
         else:
@@ -84,11 +104,12 @@ class UserCommands(commands.Cog):
             )
     
     @app_commands.command(name="delete_user", description="Delete a Pterodactyl user")
-    @app_commands.describe(user_id="User ID to delete")
+    @app_commands.describe(user_id="User ID to delete", panel="Panel the user is on (defaults to the main panel)")
     @is_admin()
     @not_in_maintenance()
-    async def delete_user(self, interaction: discord.Interaction, user_id: int):
+    async def delete_user(self, interaction: discord.Interaction, user_id: int, panel: Optional[PanelOption] = None):
         """Delete a user with confirmation"""
+        panel = panel or self.bot.panels.default
         # Confirmation
         view = ConfirmView()
         await interaction.response.send_message(
@@ -106,7 +127,7 @@ class UserCommands(commands.Cog):
             return
         
         # Delete user
-        result = await self.api.delete_user(user_id)
+        result = await panel.api.delete_user(user_id)
         
         if not result['success']:
             await interaction.followup.send(
@@ -115,6 +136,8 @@ class UserCommands(commands.Cog):
             )
             return
         
+        panel.index.remove_user(user_id)
+        
         await interaction.followup.send(
             embed=EmbedBuilder.success(
                 "User Deleted",
@@ -126,7 +149,7 @@ class UserCommands(commands.Cog):
         # Log action
         log_embed = discord.Embed(
             title="🗑️ User Deleted",
-            description=f"User ID {user_id} deleted by {interaction.user.mention}",
+            description=f"User ID {user_id} deleted from {panel.name} by {interaction.user.mention}",
             color=discord.Color.red(),
             timestamp=discord.utils.utcnow()
         )
@@ -135,7 +158,8 @@ class UserCommands(commands.Cog):
     @app_commands.command(name="change_password", description="Change a user's password")
     @app_commands.describe(
         user_id="User ID",
-        new_password="New password (leave empty for random)"
+        new_password="New password (leave empty for random)",
+        panel="Panel the user is on (defaults to the main panel)"
     )
     @is_admin()
     @not_in_maintenance()
@@ -143,15 +167,17 @@ class UserCommands(commands.Cog):
         self,
         interaction: discord.Interaction,
         user_id: int,
-        new_password: str = None
+        new_password: str = None,
+        panel: Optional[PanelOption] = None
     ):
         """Change user password"""
         await interaction.response.defer(ephemeral=True)
+        panel = panel or self.bot.panels.default
         
         if not new_password:
             new_password = ''.join(random.choices(string.ascii_letters + string.digits + "!@#$%^&*", k=16))
         
-        result = await self.api.update_user_password(user_id, new_password)
+        result = await panel.api.update_user_password(user_id, new_password)
         
         if not result['success']:
             await interaction.followup.send(
@@ -172,7 +198,7 @@ class UserCommands(commands.Cog):
         # Log action
         log_embed = discord.Embed(
             title="🔑 Password Changed",
-            description=f"Password changed for user ID {user_id} by {interaction.user.mention}",
+            description=f"Password changed for user ID {user_id} on {panel.name} by {interaction.user.mention}",
             color=discord.Color.blue(),
             timestamp=discord.utils.utcnow()
         )
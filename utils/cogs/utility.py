@@ -2,67 +2,18 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.embeds import EmbedBuilder
+from utils.checks import is_admin
+from utils.tracing import TRACER
+from utils.panels import PanelOption
+from utils.views import ManageView, register_views
+from typing import Optional
 import time
 
-class ManageView(discord.ui.View):
-    """Interactive management panel"""
-    def __init__(self, bot):
-        super().__init__(timeout=None)
-        self.bot = bot
-    
-    @discord.ui.button(label="📊 Server List", style=discord.ButtonStyle.primary, custom_id="manage_servers")
-    async def show_servers(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id not in self.bot.admin_ids:
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error("Access Denied", "Admin only"),
-                ephemeral=True
-            )
-            return
-        
-        await interaction.response.send_message(
-            embed=EmbedBuilder.info("Server List", "Use `/list_servers` to view all servers"),
-            ephemeral=True
-        )
-    
-    @discord.ui.button(label="👥 User List", style=discord.ButtonStyle.primary, custom_id="manage_users")
-    async def show_users(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id not in self.bot.admin_ids:
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error("Access Denied", "Admin only"),
-                ephemeral=True
-            )
-            return
-        
-        await interaction.response.send_message(
-            embed=EmbedBuilder.info("User List", "Use `/user_list` to view all users"),
-            ephemeral=True
-        )
-    
-    @discord.ui.button(label="🖥️ Nodes", style=discord.ButtonStyle.secondary, custom_id="manage_nodes")
-    async def show_nodes(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id not in self.bot.admin_ids:
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error("Access Denied", "Admin only"),
-                ephemeral=True
-            )
-            return
-        
-        await interaction.response.send_message(
-            embed=EmbedBuilder.info("Nodes", "Use `/nodes` to view all nodes"),
-            ephemeral=True
-        )
-    
-    @discord.ui.button(label="❓ Help", style=discord.ButtonStyle.success, custom_id="manage_help")
-    async def show_help(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_message(
-            embed=EmbedBuilder.info("Help", "Use `/help` to see all available commands"),
-            ephemeral=True
-        )
-
 class UtilityCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.start_time = time.time()
+        # Kept on the bot so /reload doesn't reset the uptime
+        self.start_time = bot.start_time
     
     @app_commands.command(name="ping", description="Check bot latency")
     async def ping(self, interaction: discord.Interaction):
@@ -101,7 +52,10 @@ class UtilityCommands(commands.Cog):
                     "`/set_resources` - Update server resources\n"
                     "`/list_servers` - List all servers\n"
                     "`/server_info` - Get server details\n"
-                    "`/server_search` - Search for servers"
+                    "`/server_search` - Search for servers\n"
+                    "`/set_expiry` - Set when a server expires\n"
+                    "`/clear_expiry` - Remove a server's expiry\n"
+                    "`/expiring` - List servers expiring soon"
                 ),
                 inline=False
             )
@@ -120,10 +74,15 @@ class UtilityCommands(commands.Cog):
             embed.add_field(
                 name="🔧 Panel & Infrastructure",
                 value=(
-                    "`/nodes` - List all nodes\n"
+                    "`/nodes` - Node health dashboard\n"
                     "`/eggs` - List available eggs\n"
                     "`/panel_status` - Check panel status\n"
                     "`/backup_list` - List server backups\n"
+                    "`/backup_run` - Back up many servers at once\n"
+                    "`/backup_schedule` - Schedule recurring backups\n"
+                    "`/idle_servers` - List (and stop) idle servers\n"
+                    "`/power` - Start/stop/restart/kill servers\n"
+                    "`/drain_plan` - Plan moving servers off a node\n"
                     "`/maintenance_on` - Enable maintenance mode\n"
                     "`/maintenance_off` - Disable maintenance mode"
                 ),
@@ -135,7 +94,13 @@ class UtilityCommands(commands.Cog):
             value=(
                 "`/ping` - Check bot latency\n"
                 "`/help` - Show this help message\n"
-                "`/manage` - Interactive management panel (Admin only)"
+                "`/my_servers` - List the servers you own\n"
+                "`/manage` - Interactive management panel (Admin only)\n"
+                "`/trace_last` - Show a recent command's timing waterfall (Admin only)\n"
+                "`/loop_stats` - Event loop lag and blocking calls (Admin only)\n"
+                "`/jobs` - List scheduled jobs (Admin only)\n"
+                "`/job_cancel` - Remove a scheduled job (Admin only)\n"
+                "`/reload` - Hot-reload cogs (Admin only)"
             ),
             inline=False
         )
@@ -143,9 +108,10 @@ class UtilityCommands(commands.Cog):
         embed.add_field(
             name="📌 Important Notes",
             value=(
-                "• All server actions send DMs to the affected user\n"
+                "• All server actions send DMs to the server's owner\n"
                 "• Commands marked with 🔒 are admin-only\n"
-                "• Server IDs can be found with `/list_servers`"
+                "• Server IDs can be found with `/list_servers`\n"
+                "• Most commands take an optional `panel`; without it they use the default panel"
             ),
             inline=False
         )
@@ -155,7 +121,8 @@ class UtilityCommands(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(name="manage", description="Interactive management panel")
-    async def manage_panel(self, interaction: discord.Interaction):
+    @app_commands.describe(panel="Panel to manage (defaults to the main panel)")
+    async def manage_panel(self, interaction: discord.Interaction, panel: Optional[PanelOption] = None):
         """Show interactive management panel"""
         if interaction.user.id not in self.bot.admin_ids:
             await interaction.response.send_message(
@@ -163,6 +130,7 @@ class UtilityCommands(commands.Cog):
                 ephemeral=True
             )
             return
+        panel = panel or self.bot.panels.default
         
         embed = discord.Embed(
             title="🎛️ Pterodactyl Management Panel",
@@ -173,17 +141,17 @@ class UtilityCommands(commands.Cog):
         
         embed.add_field(
             name="📊 Quick Stats",
-            value=f"Panel: {self.bot.panel_url}\nMaintenance: {'🔴 Active' if self.bot.maintenance_mode else '🟢 Inactive'}",
+            value=f"Panel: {panel.url}\nMaintenance: {'🔴 Active' if self.bot.maintenance_mode else '🟢 Inactive'}",
             inline=False
         )
         
         embed.set_footer(text=f"Admin: {interaction.user.name}")
         
-        view = ManageView(self.bot)
+        view = ManageView(self.bot, panel)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
     
     @app_commands.command(name="stats", description="Show bot statistics")
-    async def bot_stats(self, interaction: discord.Interaction):
+    async def show_stats(self, interaction: discord.Interaction):
         """Display bot statistics"""
         uptime = int(time.time() - self.start_time)
         
@@ -197,9 +165,214 @@ class UtilityCommands(commands.Cog):
         embed.add_field(name="⏱️ Uptime", value=f"<t:{int(self.start_time)}:R>", inline=True)
         embed.add_field(name="🌐 Servers", value=str(len(self.bot.guilds)), inline=True)
         embed.add_field(name="🔧 Maintenance", value="🔴 Active" if self.bot.maintenance_mode else "🟢 Inactive", inline=True)
-        embed.add_field(name="🖥️ Panel", value=self.bot.panel_url, inline=False)
+        ready = f" · ready in {self.bot._ready_after:.1f}s" if self.bot._ready_after is not None else ""
+        embed.add_field(
+            name="🧠 Member Cache",
+            value=f"{self.bot.member_cache}{ready} · {len(self.bot.user_cache)} fetched users kept",
+            inline=True
+        )
+        if len(self.bot.panels) > 1:
+            panels = "\n".join(
+                f"{panel.name}: {panel.url}" + (" (default)" if panel is self.bot.panels.default else "")
+                for panel in self.bot.panels
+            )
+            embed.add_field(name="🖥️ Panels", value=panels[:1024], inline=False)
+        else:
+            embed.add_field(name="🖥️ Panel", value=self.bot.panel_url, inline=False)
+        
+        if self.bot.coordinator:
+            processes = await self.bot.coordinator.processes()
+            lines = [
+                f"{'👑 ' if process.leader else ''}`{process.id}` · shards {process.shards} · {process.guilds} guilds"
+                for process in processes
+            ]
+            embed.add_field(
+                name=f"🧩 Processes ({sum(process.guilds for process in processes)} guilds)",
+                value="\n".join(lines)[:1024] or "None reporting",
+                inline=False
+            )
+        elif self.bot.shard_count and self.bot.shard_count > 1:
+            embed.add_field(name="🧩 Shards", value=str(self.bot.shard_count), inline=True)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="trace_last", description="Show the span waterfall of a recent command")
+    @app_commands.describe(
+        slow_only="Only consider traces slower than the slow threshold",
+        command="Command name to filter by, e.g. createserver"
+    )
+    @is_admin()
+    async def trace_last(self, interaction: discord.Interaction, slow_only: bool = False, command: Optional[str] = None):
+        """Render the most recent trace as a waterfall"""
+        name = f"/{command.lstrip('/')}" if command else None
+        trace = TRACER.last(slow_only=slow_only, name=name)
+        
+        if not trace:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.info("No Traces", "No matching traces have been recorded yet"),
+                ephemeral=True
+            )
+            return
+        
+        root = trace.root
+        embed = discord.Embed(
+            title=f"🔬 Trace {root.name}",
+            description=f"```\n{trace.waterfall()[:3900]}\n```",
+            color=discord.Color.red() if root.status != 'ok' else discord.Color.blurple(),
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="⏱️ Total", value=f"{trace.duration_ms:.1f} ms", inline=True)
+        embed.add_field(name="🧩 Spans", value=str(len(trace.spans)), inline=True)
+        embed.add_field(name="🐢 Slow Threshold", value=f"{TRACER.slow_threshold_ms:.0f} ms", inline=True)
+        embed.set_footer(text=f"Trace ID: {trace.trace_id}")
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="loop_stats", description="Show event loop lag and the worst blocking calls")
+    @is_admin()
+    async def loop_stats(self, interaction: discord.Interaction):
+        """Display event loop watchdog results"""
+        watchdog = self.bot.watchdog
+        if not watchdog:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.info("Watchdog Disabled", "Set `LOOP_WATCHDOG_MS` above 0 to enable the event loop watchdog"),
+                ephemeral=True
+            )
+            return
+        
+        p99 = watchdog.lag_percentile(99)
+        embed = discord.Embed(
+            title="🐌 Event Loop Health",
+            color=discord.Color.green() if p99 < watchdog.threshold else discord.Color.orange(),
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="Current Lag", value=f"{watchdog.current_lag * 1000:.1f} ms", inline=True)
+        embed.add_field(name="p50 / p99", value=f"{watchdog.lag_percentile(50) * 1000:.1f} / {p99 * 1000:.1f} ms", inline=True)
+        embed.add_field(name="Blocks", value=f"{watchdog.blocks} over {watchdog.threshold * 1000:.0f} ms", inline=True)
+        
+        for offender in watchdog.worst_offenders(5):
+            embed.add_field(
+                name=f"{offender.location}"[:256],
+                value=(
+                    f"{offender.count}x, total {offender.total * 1000:.0f} ms, worst {offender.worst * 1000:.0f} ms\n"
+                    f"```\n{offender.stack[-900:] or 'no stack sample'}\n```"
+                ),
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="jobs", description="List scheduled jobs")
+    @is_admin()
+    async def list_jobs(self, interaction: discord.Interaction):
+        """Show every scheduled job with its next run and last result"""
+        scheduler = self.bot.scheduler
+        jobs = scheduler.list_jobs()
+        if not jobs:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.info("No Jobs", "Nothing is scheduled. Use `/backup_schedule` to add backups."),
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="⏰ Scheduled Jobs",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        for job in jobs[:25]:
+            trigger = f"`{job.spec}`" if job.is_cron else "One-shot"
+            next_run = f"<t:{int(job.next_run)}:R>" if job.next_run else "—"
+            status = "🔄 Running" if job.id in scheduler.running else (job.last_status or "Never run")
+            embed.add_field(
+                name=job.id[:256],
+                value=(
+                    f"**Handler:** {job.handler} · **Trigger:** {trigger}\n"
+                    f"**Next:** {next_run} · **Runs:** {job.runs} ({job.failures} failed)\n"
+                    f"**Last:** {status[:200]}"
+                ),
+                inline=False
+            )
+        embed.set_footer(text=f"{len(jobs)} job(s) · {scheduler.max_workers} worker(s)")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="job_cancel", description="Remove a scheduled job")
+    @app_commands.describe(job_id="Job ID as shown by /jobs")
+    @is_admin()
+    async def job_cancel(self, interaction: discord.Interaction, job_id: str):
+        """Cancel a scheduled job"""
+        await interaction.response.defer(ephemeral=True)
+        
+        if not await self.bot.scheduler.cancel(job_id):
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Job Not Found", f"No job with ID `{job_id}`"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.followup.send(
+            embed=EmbedBuilder.success("Job Cancelled", f"`{job_id}` will no longer run"),
+            ephemeral=True
+        )
+        await self.bot.log_action(EmbedBuilder.info(
+            "Job Cancelled",
+            f"{interaction.user.mention} cancelled scheduled job `{job_id}`"
+        ))
+    
+    @job_cancel.autocomplete('job_id')
+    async def job_id_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=job.id[:100], value=job.id[:100])
+            for job in self.bot.scheduler.list_jobs()
+            if current.lower() in job.id.lower()
+        ][:25]
+    
+    @app_commands.command(name="reload", description="Hot-reload bot cogs without restarting")
+    @app_commands.describe(
+        cog="Cog to reload (defaults to all)",
+        sync="Also sync slash commands with Discord (needed when command options changed)"
+    )
+    @is_admin()
+    async def reload(self, interaction: discord.Interaction, cog: Optional[str] = None, sync: bool = False):
+        """Reload cogs while keeping the API clients, caches and queues"""
+        await interaction.response.defer(ephemeral=True)
+        
+        if cog and cog not in self.bot.extensions:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Unknown Cog", f"`{cog}` is not loaded"),
+                ephemeral=True
+            )
+            return
+        
+        start = time.perf_counter()
+        results = await self.bot.reload_cogs([cog] if cog else None)
+        if sync:
+            await self.bot.tree.sync()
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        failed = {name: error for name, error in results.items() if error}
+        lines = [f"{'❌' if error else '✅'} `{name}`" + (f": {error[:200]}" if error else "") for name, error in results.items()]
+        summary = "\n".join(lines)[:4000]
+        if failed:
+            embed = EmbedBuilder.warning("Reload Incomplete", f"{summary}\n\nFailed cogs keep running their previous version.")
+        else:
+            embed = EmbedBuilder.success("Cogs Reloaded", summary)
+        embed.set_footer(text=f"{elapsed:.0f} ms" + (" · commands synced" if sync else ""))
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        
+        await self.bot.log_action(EmbedBuilder.info(
+            "Cogs Reloaded",
+            f"{interaction.user.mention} reloaded {len(results) - len(failed)}/{len(results)} cog(s)"
+        ))
+    
+    @reload.autocomplete('cog')
+    async def reload_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.bot.extensions
+            if current.lower() in name.lower()
+        ][:25]
 
 async def setup(bot):
     await bot.add_cog(UtilityCommands(bot))
+    register_views(bot)
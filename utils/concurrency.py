@@ -0,0 +1,94 @@
+import time
+import random
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, Iterator, Optional
+
+class KeyedLimiter:
+    """
+    Caps concurrent work per key (e.g. per node) and optionally overall, so one
+    busy key can't starve the others and no key is overloaded
+    """
+    
+    def __init__(self, per_key: int, total: Optional[int] = None):
+        self.per_key = per_key
+        self._total = asyncio.Semaphore(total) if total else None
+        self._semaphores: Dict[Hashable, asyncio.Semaphore] = {}
+        self.active: Dict[Hashable, int] = {}
+        self.peak: Dict[Hashable, int] = {}
+    
+    @asynccontextmanager
+    async def slot(self, key: Hashable):
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.per_key)
+        async with semaphore:
+            if self._total:
+                await self._total.acquire()
+            self.active[key] = self.active.get(key, 0) + 1
+            self.peak[key] = max(self.peak.get(key, 0), self.active[key])
+            try:
+                yield
+            finally:
+                self.active[key] -= 1
+                if self._total:
+                    self._total.release()
+
+class RateLimiter:
+    """Spaces calls out to at most ``rate`` per second (with bursts of up to ``burst``)"""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+    
+    async def __aexit__(self, *exc):
+        return False
+
+class Spacer:
+    """
+    Lets calls through at least ``interval`` seconds apart. Unlike
+    ``RateLimiter``, a late wakeup isn't made up for by a shorter next gap.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            wait = self._next - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next = time.monotonic() + self.interval
+    
+    async def __aenter__(self):
+        await self.acquire()
+    
+    async def __aexit__(self, *exc):
+        return False
+
+def backoff_delays(initial: float = 1.0, factor: float = 2.0, maximum: float = 30.0,
+                   jitter: float = 0.1) -> Iterator[float]:
+    """Endless exponential backoff delays with proportional jitter"""
+    delay = initial
+    while True:
+        yield delay * (1 + random.uniform(-jitter, jitter))
+        delay = min(delay * factor, maximum)
@@ -0,0 +1,198 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.api import PterodactylAPI
+from utils.index import PanelIndex
+from utils.models import Allocation, Node, Server
+
+@dataclass
+class NodeCapacity:
+    """Committed resources and free allocations of one node while a plan is built"""
+    node: Node
+    memory_limit: float
+    disk_limit: float
+    memory: int = 0
+    disk: int = 0
+    free_allocations: List[Allocation] = field(default_factory=list)
+    servers: int = 0
+    
+    @classmethod
+    def for_node(cls, node: Node) -> 'NodeCapacity':
+        # Overallocation is a percentage on top of the node's size; -1 disables the check
+        memory = float('inf') if node.memory_overallocate < 0 else node.memory * (1 + node.memory_overallocate / 100)
+        disk = float('inf') if node.disk_overallocate < 0 else node.disk * (1 + node.disk_overallocate / 100)
+        return cls(node, memory, disk)
+    
+    def fits(self, server: Server) -> bool:
+        return (self.memory + server.memory <= self.memory_limit
+                and self.disk + server.disk <= self.disk_limit
+                and bool(self.free_allocations))
+    
+    def place(self, server: Server) -> Allocation:
+        self.memory += server.memory
+        self.disk += server.disk
+        self.servers += 1
+        return self.free_allocations.pop()
+
+@dataclass(frozen=True)
+class Move:
+    """Transfer of one server to a target node and allocation"""
+    server: Server
+    target: Node
+    allocation: Allocation
+
+@dataclass(frozen=True)
+class NodeDelta:
+    """Committed memory/disk and server count of a node before and after the plan"""
+    node: Node
+    memory_before: int
+    memory_after: int
+    disk_before: int
+    disk_after: int
+    servers_before: int
+    servers_after: int
+    memory_limit: float
+    disk_limit: float
+
+@dataclass
+class DrainPlan:
+    """Placement of every server on ``source`` onto other nodes"""
+    source: Node
+    moves: List[Move] = field(default_factory=list)
+    unplaced: List[Tuple[Server, str]] = field(default_factory=list)
+    deltas: List[NodeDelta] = field(default_factory=list)
+    seconds: float = 0.0
+    
+    @property
+    def complete(self) -> bool:
+        return not self.unplaced
+    
+    def to_dict(self) -> Dict:
+        """Machine-readable plan: one transfer per move with the target allocation"""
+        return {
+            'source_node': {'id': self.source.id, 'name': self.source.name},
+            'complete': self.complete,
+            'moves': [
+                {
+                    'server_id': m.server.id, 'uuid': m.server.uuid, 'name': m.server.name,
+                    'memory': m.server.memory, 'disk': m.server.disk,
+                    'from_node': self.source.id, 'to_node': m.target.id,
+                    'allocation_id': m.allocation.id, 'allocation': f"{m.allocation.ip}:{m.allocation.port}"
+                }
+                for m in self.moves
+            ],
+            'unplaced': [{'server_id': s.id, 'name': s.name, 'reason': reason} for s, reason in self.unplaced],
+            'nodes': [
+                {
+                    'id': d.node.id, 'name': d.node.name,
+                    'memory_before': d.memory_before, 'memory_after': d.memory_after,
+                    'disk_before': d.disk_before, 'disk_after': d.disk_after,
+                    'servers_before': d.servers_before, 'servers_after': d.servers_after,
+                    'memory_limit': None if d.memory_limit == float('inf') else d.memory_limit,
+                    'disk_limit': None if d.disk_limit == float('inf') else d.disk_limit
+                }
+                for d in self.deltas
+            ]
+        }
+
+def plan_drain(source: Node, nodes: Iterable[Node], servers: Iterable[Server],
+               free_allocations: Dict[int, List[Allocation]], same_location: bool = False) -> DrainPlan:
+    """
+    Best-fit decreasing: the largest servers (by memory, then disk) are placed
+    first, each on the eligible node it leaves with the least spare memory.
+    Nodes in maintenance and without free allocations are never targets.
+    """
+    start = time.perf_counter()
+    capacities: Dict[int, NodeCapacity] = {}
+    for node in nodes:
+        capacities[node.id] = NodeCapacity.for_node(node)
+        capacities[node.id].free_allocations = list(free_allocations.get(node.id, ()))
+    
+    to_move: List[Server] = []
+    for server in servers:
+        capacity = capacities.get(server.node)
+        if capacity is not None:
+            capacity.memory += server.memory
+            capacity.disk += server.disk
+            capacity.servers += 1
+        if server.node == source.id:
+            to_move.append(server)
+    
+    before = {node_id: (c.memory, c.disk, c.servers) for node_id, c in capacities.items()}
+    targets = [
+        c for c in capacities.values()
+        if c.node.id != source.id and not c.node.maintenance_mode
+        and (not same_location or c.node.location_id == source.location_id)
+    ]
+    
+    plan = DrainPlan(source)
+    for server in sorted(to_move, key=lambda s: (s.memory, s.disk), reverse=True):
+        best: Optional[NodeCapacity] = None
+        best_spare = float('inf')
+        for capacity in targets:
+            if capacity.fits(server):
+                spare = capacity.memory_limit - capacity.memory - server.memory
+                if spare < best_spare:
+                    best, best_spare = capacity, spare
+        if best is None:
+            plan.unplaced.append((server, "No node has enough memory, disk and a free allocation"))
+            continue
+        plan.moves.append(Move(server, best.node, best.place(server)))
+    
+    source_capacity = capacities.get(source.id)
+    if source_capacity is not None:
+        for move in plan.moves:
+            source_capacity.memory -= move.server.memory
+            source_capacity.disk -= move.server.disk
+            source_capacity.servers -= 1
+    
+    touched = {source.id} | {move.target.id for move in plan.moves}
+    for node_id in sorted(touched):
+        capacity = capacities.get(node_id)
+        if capacity is None:
+            continue
+        memory, disk, count = before[node_id]
+        plan.deltas.append(NodeDelta(
+            capacity.node, memory, capacity.memory, disk, capacity.disk, count, capacity.servers,
+            capacity.memory_limit, capacity.disk_limit
+        ))
+    plan.seconds = time.perf_counter() - start
+    return plan
+
+class DrainPlanner:
+    """Builds drain plans from the panel index plus each candidate node's free allocations"""
+    
+    def __init__(self, api: PterodactylAPI, index: PanelIndex, concurrency: int = 4):
+        self.api = api
+        self.index = index
+        self.concurrency = concurrency
+    
+    async def free_allocations(self, node_ids: Iterable[int]) -> Dict[int, List[Allocation]]:
+        """Unassigned allocations per node, fetched concurrently; nodes that fail to load get none"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch(node_id: int):
+            async with semaphore:
+                return node_id, await self.api.fetch_node_allocations(node_id)
+        
+        results = await asyncio.gather(*(fetch(node_id) for node_id in node_ids))
+        return {
+            node_id: [a for a in allocations if not a.assigned] if allocations else []
+            for node_id, allocations in results
+        }
+    
+    async def plan(self, source_id: int, same_location: bool = False) -> Optional[DrainPlan]:
+        """Plan draining ``source_id``; None if the index can't be loaded or the node is unknown"""
+        if not await self.index.ensure_loaded():
+            return None
+        source = self.index.get_node(source_id)
+        if source is None:
+            return None
+        candidates = [
+            node.id for node in self.index.nodes.values()
+            if node.id != source_id and not node.maintenance_mode
+            and (not same_location or node.location_id == source.location_id)
+        ]
+        free = await self.free_allocations(candidates)
+        return plan_drain(source, self.index.nodes.values(), self.index.servers.values(), free, same_location)
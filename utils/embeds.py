@@ -1,6 +1,248 @@
+import time
+import string
 import discord
-from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence, Tuple
+from utils.models import Server, Node
+
+class EmbedTemplate:
+    """
+    An embed whose static parts (title, colour, field names and layout, footer)
+    are prepared once and cloned by ``render`` with only the variable parts
+    filled in. Title, description, field values and the footer may hold
+    ``str.format`` placeholders; a field is left out when any of its
+    placeholders (or the value named by its optional fourth ``requires`` item)
+    is None or missing.
+    """
+    
+    __slots__ = ('title', 'description', 'color', 'footer', 'fields')
+    
+    def __init__(self, title: Optional[str] = None, description: Optional[str] = None,
+                 color: Optional[discord.Color] = None, fields: Sequence[Tuple] = (), footer: Optional[str] = None):
+        self.title = self._compile(title)
+        self.description = self._compile(description)
+        self.color = color.value if color is not None else None
+        self.footer = self._compile(footer)
+        self.fields = [
+            (str(field[0]), bool(field[2]), field[3] if len(field) > 3 else None) + self._compile(field[1])
+            for field in fields
+        ]
+    
+    @staticmethod
+    def _compile(text: Optional[str]) -> Tuple:
+        """(prefix, key, suffix, template, keys): text that is one plain placeholder between
+        two literals is filled by concatenation, anything else with ``format_map``"""
+        if text is None:
+            return '', None, '', None, ()
+        parts = list(string.Formatter().parse(text))
+        keys = tuple(key for _, key, _, _ in parts if key is not None)
+        if (len(keys) == 1 and parts[0][1] is not None and not parts[0][2] and not parts[0][3]
+                and (len(parts) == 1 or (len(parts) == 2 and parts[1][1] is None))):
+            return parts[0][0], keys[0], parts[1][0] if len(parts) == 2 else '', None, keys
+        return '', None, '', text, keys
+    
+    @staticmethod
+    def _fill(compiled: Tuple, values: Dict[str, Any]) -> Optional[str]:
+        prefix, key, suffix, template, keys = compiled
+        if key is not None:
+            value = values.get(key)
+            return None if value is None else f"{prefix}{value}{suffix}"
+        if keys and any(values.get(k) is None for k in keys):
+            return None
+        return template.format_map(values) if keys else template
+    
+    def render(self, color: Optional[discord.Color] = None, **values) -> discord.Embed:
+        """A new embed with the placeholders filled from ``values``"""
+        fields = []
+        get = values.get
+        for name, inline, requires, prefix, key, suffix, template, keys in self.fields:
+            if requires is not None and get(requires) is None:
+                continue
+            if key is not None:
+                value = get(key)
+                if value is None:
+                    continue
+                value = f"{prefix}{value}{suffix}"
+            elif keys:
+                if any(get(k) is None for k in keys):
+                    continue
+                value = template.format_map(values)
+            else:
+                value = template
+            fields.append((name, value, inline))
+        
+        embed = discord.Embed(
+            title=self._fill(self.title, values),
+            description=self._fill(self.description, values),
+            color=color if color is not None else self.color,
+            timestamp=discord.utils.utcnow()
+        )
+        for name, value, inline in fields:
+            embed.add_field(name=name, value=value, inline=inline)
+        footer = self._fill(self.footer, values)
+        if footer is not None:
+            embed.set_footer(text=footer)
+        return embed
+
+# ==================== TEMPLATES ====================
+
+SUCCESS = EmbedTemplate("✅ {title}", "{description}", discord.Color.green())
+ERROR = EmbedTemplate("❌ {title}", "{description}", discord.Color.red())
+WARNING = EmbedTemplate("⚠️ {title}", "{description}", discord.Color.yellow())
+INFO = EmbedTemplate("ℹ️ {title}", "{description}", discord.Color.blue())
+
+DM_SERVER_CREATED = EmbedTemplate(
+    "✅ SERVER CREATED",
+    "Your new server has been successfully created!",
+    discord.Color.green(),
+    [
+        ("📛 Server Name", "{server_name}", True),
+        ("🆔 Server ID", "{server_id}", True),
+        ("🖥️ Node", "{node}", True),
+        ("💾 RAM", "{ram} MB", True),
+        ("⚙️ CPU", "{cpu}%", True),
+        ("💿 Disk", "{disk} MB", True),
+        ("🎮 Version", "{version}", True),
+        ("🌐 Panel URL", "{panel_url}", False),
+        ("👤 Username", "{username}", True),
+        ("🔑 Password", "||{password}||", True),
+        ("⚠️ Important", "Save your password! This is the only time you'll see it.", False, 'password')
+    ],
+    "Access your server at the panel URL above"
+)
+
+DM_SERVER_DELETED = EmbedTemplate(
+    "❌ SERVER DELETED",
+    "Your server has been permanently deleted.",
+    discord.Color.red(),
+    [
+        ("🆔 Server ID", "{server_id}", True),
+        ("👮 Deleted By", "{deleted_by}", True),
+        ("📅 Date & Time", "<t:{now}:F>", False)
+    ],
+    "This action cannot be undone"
+)
+
+DM_SERVER_SUSPENDED = EmbedTemplate(
+    "⚠️ SERVER SUSPENDED",
+    "Your server has been suspended and is temporarily unavailable.",
+    discord.Color.orange(),
+    [
+        ("🆔 Server ID", "{server_id}", True),
+        ("📋 Reason", "{reason}", False),
+        ("📅 Suspended At", "<t:{now}:F>", False)
+    ],
+    "Contact support if you believe this is an error"
+)
+
+DM_SERVER_UNSUSPENDED = EmbedTemplate(
+    "✅ SERVER UNSUSPENDED",
+    "Your server has been restored and is now available again!",
+    discord.Color.green(),
+    [
+        ("🆔 Server ID", "{server_id}", True),
+        ("📅 Restored At", "<t:{now}:F>", False)
+    ],
+    "Your server is now fully operational"
+)
+
+DM_SERVER_EXPIRING = EmbedTemplate(
+    "⏳ SERVER EXPIRING SOON",
+    "Your server **{server_name}** expires <t:{expires_at}:R>. Renew it to keep it running.",
+    discord.Color.gold(),
+    [
+        ("🆔 Server ID", "{server_id}", True),
+        ("📅 Expires At", "<t:{expires_at}:F>", False),
+        ("⚠️ Suspended At", "<t:{suspend_at}:F>", False)
+    ],
+    "Contact support to renew your server"
+)
+
+DM_RESOURCES_UPDATED = EmbedTemplate(
+    "🔧 SERVER RESOURCES UPDATED",
+    "Your server resources have been modified.",
+    discord.Color.blue(),
+    [
+        ("🆔 Server ID", "{server_id}", False),
+        ("📊 New Resources", "{changes}", False),
+        ("📅 Updated At", "<t:{now}:F>", False)
+    ],
+    "Restart your server for changes to take full effect"
+)
+
+DM_MAINTENANCE_ENABLED = EmbedTemplate(
+    "🔧 MAINTENANCE MODE ENABLED",
+    "{message}",
+    discord.Color.orange(),
+    footer="We'll notify you when maintenance is complete"
+)
+
+DM_MAINTENANCE_COMPLETE = EmbedTemplate(
+    "✅ MAINTENANCE COMPLETE",
+    "{message}",
+    discord.Color.green(),
+    footer="Thank you for your patience"
+)
+
+LOG_SERVER_ACTION = EmbedTemplate(
+    "📋 Server {action}",
+    fields=[
+        ("👮 Admin", "{admin}", True),
+        ("👤 User", "{user}", True),
+        ("🆔 Server ID", "{server_id}", True),
+        ("📛 Server Name", "{name}", True),
+        ("📊 Resources", "RAM: {ram} MB\nCPU: {cpu}%\nDisk: {disk} MB", True, 'resources')
+    ]
+)
+
+LOG_COLORS = {
+    'created': discord.Color.green(),
+    'deleted': discord.Color.red(),
+    'suspended': discord.Color.orange(),
+    'unsuspended': discord.Color.blue(),
+    'updated': discord.Color.purple()
+}
+
+SERVER_INFO = EmbedTemplate(
+    "🖥️ {name}",
+    color=discord.Color.blue(),
+    fields=[
+        ("🆔 ID", "{id}", True),
+        ("🔑 UUID", "{short_uuid}...", True),
+        ("📊 Status", "{status}", True),
+        ("💾 RAM", "{memory} MB", True),
+        ("⚙️ CPU", "{cpu}%", True),
+        ("💿 Disk", "{disk} MB", True),
+        ("👤 Owner", "<@{owner}>", True)
+    ],
+    footer="Server UUID: {uuid}"
+)
+
+NODE_INFO = EmbedTemplate(
+    "🖥️ {name}",
+    color=discord.Color.purple(),
+    fields=[
+        ("🆔 ID", "{id}", True),
+        ("🌐 FQDN", "{fqdn}", True),
+        ("📍 Location", "{location}", True),
+        ("💾 Memory", "{memory} MB", True),
+        ("💿 Disk", "{disk} MB", True),
+        ("🔌 Daemon Port", "{port}", True)
+    ]
+)
+
+USER_INFO = EmbedTemplate(
+    "👤 {username}",
+    color=discord.Color.blue(),
+    fields=[
+        ("🆔 ID", "{id}", True),
+        ("📧 Email", "{email}", True),
+        ("👤 Name", "{first_name} {last_name}", True),
+        ("👑 Admin", "{admin}", True),
+        ("🔐 2FA", "{two_factor}", True),
+        ("🎮 Servers", "{servers}", True),
+        ("🔗 Discord", "<@{discord_id}>", True)
+    ]
+)
 
 class EmbedBuilder:
     """Centralized embed builder for consistent styling"""
@@ -8,12 +250,7 @@ class EmbedBuilder:
     @staticmethod
     def success(title: str, description: str = None, **kwargs) -> discord.Embed:
         """Green success embed"""
-        embed = discord.Embed(
-            title=f"✅ {title}",
-            description=description,
-            color=discord.Color.green(),
-            timestamp=datetime.utcnow()
-        )
+        embed = SUCCESS.render(title=title, description=description)
         for key, value in kwargs.items():
             embed.add_field(name=key, value=value, inline=True)
         return embed
@@ -21,32 +258,17 @@ class EmbedBuilder:
     @staticmethod
     def error(title: str, description: str = None) -> discord.Embed:
         """Red error embed"""
-        return discord.Embed(
-            title=f"❌ {title}",
-            description=description,
-            color=discord.Color.red(),
-            timestamp=datetime.utcnow()
-        )
+        return ERROR.render(title=title, description=description)
     
     @staticmethod
     def warning(title: str, description: str = None) -> discord.Embed:
         """Yellow warning embed"""
-        return discord.Embed(
-            title=f"⚠️ {title}",
-            description=description,
-            color=discord.Color.yellow(),
-            timestamp=datetime.utcnow()
-        )
+        return WARNING.render(title=title, description=description)
     
     @staticmethod
     def info(title: str, description: str = None) -> discord.Embed:
         """Blue info embed"""
-        return discord.Embed(
-            title=f"ℹ️ {title}",
-            description=description,
-            color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
-        )
+        return INFO.render(title=title, description=description)
     
     # ==================== USER DM EMBEDS ====================
     
@@ -55,93 +277,37 @@ class EmbedBuilder:
                          cpu: int, disk: int, version: str, panel_url: str, 
                          username: str, password: Optional[str] = None) -> discord.Embed:
         """DM embed when server is created"""
-        embed = discord.Embed(
-            title="✅ SERVER CREATED",
-            description="Your new server has been successfully created!",
-            color=discord.Color.green(),
-            timestamp=datetime.utcnow()
+        return DM_SERVER_CREATED.render(
+            server_name=server_name, server_id=server_id, node=node, ram=ram, cpu=cpu, disk=disk,
+            version=version, panel_url=panel_url, username=username, password=password or None
         )
-        
-        embed.add_field(name="📛 Server Name", value=server_name, inline=True)
-        embed.add_field(name="🆔 Server ID", value=server_id, inline=True)
-        embed.add_field(name="🖥️ Node", value=node, inline=True)
-        embed.add_field(name="💾 RAM", value=f"{ram} MB", inline=True)
-        embed.add_field(name="⚙️ CPU", value=f"{cpu}%", inline=True)
-        embed.add_field(name="💿 Disk", value=f"{disk} MB", inline=True)
-        embed.add_field(name="🎮 Version", value=version, inline=True)
-        embed.add_field(name="🌐 Panel URL", value=panel_url, inline=False)
-        embed.add_field(name="👤 Username", value=username, inline=True)
-        
-        if password:
-            embed.add_field(name="🔑 Password", value=f"||{password}||", inline=True)
-            embed.add_field(name="⚠️ Important", value="Save your password! This is the only time you'll see it.", inline=False)
-        
-        embed.set_footer(text="Access your server at the panel URL above")
-        return embed
     
     @staticmethod
     def dm_server_deleted(server_id: str, deleted_by: str) -> discord.Embed:
         """DM embed when server is deleted"""
-        embed = discord.Embed(
-            title="❌ SERVER DELETED",
-            description="Your server has been permanently deleted.",
-            color=discord.Color.red(),
-            timestamp=datetime.utcnow()
-        )
-        
-        embed.add_field(name="🆔 Server ID", value=server_id, inline=True)
-        embed.add_field(name="👮 Deleted By", value=deleted_by, inline=True)
-        embed.add_field(name="📅 Date & Time", value=f"<t:{int(datetime.utcnow().timestamp())}:F>", inline=False)
-        
-        embed.set_footer(text="This action cannot be undone")
-        return embed
+        return DM_SERVER_DELETED.render(server_id=server_id, deleted_by=deleted_by, now=int(time.time()))
     
     @staticmethod
     def dm_server_suspended(server_id: str, reason: str = "Administrative action") -> discord.Embed:
         """DM embed when server is suspended"""
-        embed = discord.Embed(
-            title="⚠️ SERVER SUSPENDED",
-            description="Your server has been suspended and is temporarily unavailable.",
-            color=discord.Color.orange(),
-            timestamp=datetime.utcnow()
-        )
-        
-        embed.add_field(name="🆔 Server ID", value=server_id, inline=True)
-        embed.add_field(name="📋 Reason", value=reason, inline=False)
-        embed.add_field(name="📅 Suspended At", value=f"<t:{int(datetime.utcnow().timestamp())}:F>", inline=False)
-        
-        embed.set_footer(text="Contact support if you believe this is an error")
-        return embed
+        return DM_SERVER_SUSPENDED.render(server_id=server_id, reason=reason, now=int(time.time()))
     
     @staticmethod
     def dm_server_unsuspended(server_id: str) -> discord.Embed:
         """DM embed when server is unsuspended"""
-        embed = discord.Embed(
-            title="✅ SERVER UNSUSPENDED",
-            description="Your server has been restored and is now available again!",
-            color=discord.Color.green(),
-            timestamp=datetime.utcnow()
+        return DM_SERVER_UNSUSPENDED.render(server_id=server_id, now=int(time.time()))
+    
+    @staticmethod
+    def dm_server_expiring(server_id: str, server_name: str, expires_at: float, suspend_at: float) -> discord.Embed:
+        """DM embed reminding the owner that their server is about to expire"""
+        return DM_SERVER_EXPIRING.render(
+            server_id=server_id, server_name=server_name, expires_at=int(expires_at), suspend_at=int(suspend_at)
         )
-        
-        embed.add_field(name="🆔 Server ID", value=server_id, inline=True)
-        embed.add_field(name="📅 Restored At", value=f"<t:{int(datetime.utcnow().timestamp())}:F>", inline=False)
-        
-        embed.set_footer(text="Your server is now fully operational")
-        return embed
     
     @staticmethod
     def dm_resources_updated(server_id: str, ram: int = None, cpu: int = None, 
                             disk: int = None) -> discord.Embed:
         """DM embed when server resources are updated"""
-        embed = discord.Embed(
-            title="🔧 SERVER RESOURCES UPDATED",
-            description="Your server resources have been modified.",
-            color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
-        )
-        
-        embed.add_field(name="🆔 Server ID", value=server_id, inline=False)
-        
         changes = []
         if ram is not None:
             changes.append(f"💾 **RAM:** {ram} MB")
@@ -150,112 +316,271 @@ class EmbedBuilder:
         if disk is not None:
             changes.append(f"💿 **Disk:** {disk} MB")
         
-        embed.add_field(name="📊 New Resources", value="\n".join(changes), inline=False)
-        embed.add_field(name="📅 Updated At", value=f"<t:{int(datetime.utcnow().timestamp())}:F>", inline=False)
-        
-        embed.set_footer(text="Restart your server for changes to take full effect")
-        return embed
+        return DM_RESOURCES_UPDATED.render(server_id=server_id, changes="\n".join(changes), now=int(time.time()))
     
     @staticmethod
     def dm_maintenance(enabled: bool, message: str = None) -> discord.Embed:
         """DM embed for maintenance mode notifications"""
         if enabled:
-            embed = discord.Embed(
-                title="🔧 MAINTENANCE MODE ENABLED",
-                description=message or "The panel is currently undergoing maintenance. Your servers may be temporarily unavailable.",
-                color=discord.Color.orange(),
-                timestamp=datetime.utcnow()
+            return DM_MAINTENANCE_ENABLED.render(
+                message=message or "The panel is currently undergoing maintenance. Your servers may be temporarily unavailable."
             )
-            embed.set_footer(text="We'll notify you when maintenance is complete")
-        else:
-            embed = discord.Embed(
-                title="✅ MAINTENANCE COMPLETE",
-                description=message or "Maintenance has been completed. All services are now operational.",
-                color=discord.Color.green(),
-                timestamp=datetime.utcnow()
-            )
-            embed.set_footer(text="Thank you for your patience")
-        
-        return embed
+        return DM_MAINTENANCE_COMPLETE.render(
+            message=message or "Maintenance has been completed. All services are now operational."
+        )
     
     # ==================== ADMIN LOG EMBEDS ====================
     
     @staticmethod
     def log_server_action(action: str, admin: str, user: str, server_info: dict) -> discord.Embed:
         """Log embed for server actions"""
-        colors = {
-            'created': discord.Color.green(),
-            'deleted': discord.Color.red(),
-            'suspended': discord.Color.orange(),
-            'unsuspended': discord.Color.blue(),
-            'updated': discord.Color.purple()
-        }
+        res = server_info.get('resources')
+        return LOG_SERVER_ACTION.render(
+            color=LOG_COLORS.get(action.lower(), discord.Color.greyple()),
+            action=action.upper(), admin=admin, user=user,
+            server_id=server_info.get('id', 'N/A'), name=server_info.get('name'),
+            resources=res,
+            ram=res.get('ram', 'N/A') if res else None,
+            cpu=res.get('cpu', 'N/A') if res else None,
+            disk=res.get('disk', 'N/A') if res else None
+        )
+    
+    # ==================== INFO EMBEDS ====================
+    
+    @staticmethod
+    def server_info(server: Server) -> discord.Embed:
+        """Display server information"""
+        return SERVER_INFO.render(
+            name=server.name, id=server.id, short_uuid=server.uuid[:8], uuid=server.uuid,
+            status="🟢 Active" if not server.suspended else "🔴 Suspended",
+            memory=server.memory, cpu=server.cpu, disk=server.disk, owner=server.owner_discord_id or None
+        )
+    
+    @staticmethod
+    def node_info(node: Node) -> discord.Embed:
+        """Display node information"""
+        return NODE_INFO.render(
+            name=node.name, id=node.id, fqdn=node.fqdn, location=node.location_id,
+            memory=node.memory, disk=node.disk, port=node.daemon_listen
+        )
+    
+    @staticmethod
+    def user_info(user, servers: int) -> discord.Embed:
+        """Display panel user information"""
+        return USER_INFO.render(
+            username=user.username, id=user.id, email=user.email,
+            first_name=user.first_name, last_name=user.last_name,
+            admin="✅" if user.root_admin else "❌", two_factor="✅" if user.two_factor else "❌",
+            servers=servers, discord_id=user.discord_id or None
+        )
+    
+    @staticmethod
+    def server_resources(server: Server, usage) -> discord.Embed:
+        """Live resource usage of a server against its limits"""
+        states = {'running': "🟢 Running", 'starting': "🟡 Starting", 'stopping': "🟠 Stopping", 'offline': "🔴 Offline"}
+        embed = discord.Embed(
+            title=f"📈 {server.name}",
+            description=states.get(usage.state, usage.state),
+            color=discord.Color.green() if usage.state == 'running' else discord.Color.greyple(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        memory = usage.memory_bytes / 1024 / 1024
+        disk = usage.disk_bytes / 1024 / 1024
+        embed.add_field(name="💾 RAM", value=f"{memory:.0f} / {server.memory or '∞'} MB", inline=True)
+        embed.add_field(name="⚙️ CPU", value=f"{usage.cpu_absolute:.1f} / {server.cpu or '∞'}%", inline=True)
+        embed.add_field(name="💿 Disk", value=f"{disk:.0f} / {server.disk or '∞'} MB", inline=True)
+        embed.add_field(
+            name="🌐 Network",
+            value=f"⬇️ {usage.network_rx_bytes / 1024 / 1024:.1f} MB · ⬆️ {usage.network_tx_bytes / 1024 / 1024:.1f} MB",
+            inline=True
+        )
+        embed.add_field(name="⏱️ Uptime", value=f"{usage.uptime // 1000 // 3600}h {usage.uptime // 1000 % 3600 // 60}m", inline=True)
+        
+        embed.set_footer(text=f"Server ID: {server.id}")
+        return embed
+    
+    @staticmethod
+    def backup_report(report) -> discord.Embed:
+        """Summary of an orchestrated backup run"""
+        embed = discord.Embed(
+            title="💾 Backup Run Finished",
+            color=discord.Color.green() if not report.failed else discord.Color.orange(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        embed.add_field(name="✅ Succeeded", value=len(report.succeeded), inline=True)
+        embed.add_field(name="❌ Failed", value=len(report.failed), inline=True)
+        embed.add_field(name="♻️ Rotated", value=report.rotated, inline=True)
         
+        embed.add_field(name="⏱️ Duration", value=f"{report.elapsed:.1f}s", inline=True)
+        embed.add_field(name="📈 Throughput", value=f"{report.servers_per_minute:.1f} servers/min", inline=True)
+        embed.add_field(name="📦 Data", value=f"{report.total_bytes / 1024 ** 3:.2f} GB ({report.megabytes_per_second:.1f} MB/s)", inline=True)
+        
+        if report.failed:
+            lines = [f"`{r.server.id}` {r.server.name}: {r.error}" for r in report.failed[:10]]
+            if len(report.failed) > 10:
+                lines.append(f"... and {len(report.failed) - 10} more")
+            embed.add_field(name="⚠️ Failures", value="\n".join(lines)[:1024], inline=False)
+        
+        return embed
+    
+    @staticmethod
+    def power_report(report) -> discord.Embed:
+        """Summary of a power action sent to many servers"""
         embed = discord.Embed(
-            title=f"📋 Server {action.upper()}",
-            color=colors.get(action.lower(), discord.Color.greyple()),
-            timestamp=datetime.utcnow()
+            title=f"⚡ Power {report.signal.capitalize()} Finished",
+            color=discord.Color.green() if not report.failed else discord.Color.orange(),
+            timestamp=discord.utils.utcnow()
         )
         
-        embed.add_field(name="👮 Admin", value=admin, inline=True)
-        embed.add_field(name="👤 User", value=user, inline=True)
-        embed.add_field(name="🆔 Server ID", value=server_info.get('id', 'N/A'), inline=True)
+        embed.add_field(name="✅ Succeeded", value=len(report.succeeded), inline=True)
+        embed.add_field(name="❌ Failed", value=len(report.failed), inline=True)
+        embed.add_field(name="⏱️ Wall Time", value=f"{report.elapsed:.1f}s", inline=True)
+        
+        if report.succeeded:
+            lines = [f"`{r.server.id}` {r.server.name} ({r.seconds * 1000:.0f} ms)" for r in report.succeeded[:10]]
+            if len(report.succeeded) > 10:
+                lines.append(f"... and {len(report.succeeded) - 10} more")
+            embed.add_field(name="🟢 Servers", value="\n".join(lines)[:1024], inline=False)
         
-        if 'name' in server_info:
-            embed.add_field(name="📛 Server Name", value=server_info['name'], inline=True)
+        if report.failed:
+            lines = [f"`{r.server.id}` {r.server.name}: {r.error}" for r in report.failed[:10]]
+            if len(report.failed) > 10:
+                lines.append(f"... and {len(report.failed) - 10} more")
+            embed.add_field(name="⚠️ Failures", value="\n".join(lines)[:1024], inline=False)
         
-        if 'resources' in server_info:
-            res = server_info['resources']
+        return embed
+    
+    @staticmethod
+    def drain_plan(plan) -> discord.Embed:
+        """Summary of a node drain plan with per-node capacity deltas"""
+        embed = discord.Embed(
+            title=f"🚚 Drain Plan for {plan.source.name}",
+            description=(
+                f"**{len(plan.moves)}** server(s) placed, **{len(plan.unplaced)}** without a target "
+                f"(planned in {plan.seconds * 1000:.1f} ms)"
+            ),
+            color=discord.Color.green() if plan.complete else discord.Color.orange(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        for delta in plan.deltas[:20]:
+            memory_limit = "∞" if delta.memory_limit == float('inf') else f"{delta.memory_limit:.0f}"
+            disk_limit = "∞" if delta.disk_limit == float('inf') else f"{delta.disk_limit:.0f}"
             embed.add_field(
-                name="📊 Resources",
-                value=f"RAM: {res.get('ram', 'N/A')} MB\nCPU: {res.get('cpu', 'N/A')}%\nDisk: {res.get('disk', 'N/A')} MB",
+                name=f"{'📤' if delta.node.id == plan.source.id else '📥'} {delta.node.name} (ID: {delta.node.id})",
+                value=(
+                    f"Servers: {delta.servers_before} → {delta.servers_after}\n"
+                    f"RAM: {delta.memory_before} → {delta.memory_after} / {memory_limit} MB\n"
+                    f"Disk: {delta.disk_before} → {delta.disk_after} / {disk_limit} MB"
+                ),
                 inline=True
             )
         
+        if plan.unplaced:
+            lines = [f"`{s.id}` {s.name} ({s.memory} MB): {reason}" for s, reason in plan.unplaced[:10]]
+            if len(plan.unplaced) > 10:
+                lines.append(f"... and {len(plan.unplaced) - 10} more")
+            embed.add_field(name="⚠️ Unplaced", value="\n".join(lines)[:1024], inline=False)
+        
+        embed.set_footer(text="The attached JSON lists every transfer with its target allocation")
         return embed
     
-    # ==================== INFO EMBEDS ====================
-    
     @staticmethod
-    def server_info(server_data: dict) -> discord.Embed:
-        """Display server information"""
-        attrs = server_data.get('attributes', {})
-        limits = attrs.get('limits', {})
-        
+    def node_dashboard(healths) -> discord.Embed:
+        """Node health dashboard: probe status plus committed (and measured) resources per node"""
+        online = sum(1 for h in healths if h.online)
+        problems = sum(1 for h in healths if h.status in ('offline', 'unknown'))
         embed = discord.Embed(
-            title=f"🖥️ {attrs.get('name', 'Unknown Server')}",
-            color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            title="🖥️ Node Health",
+            description=f"**{online}/{len(healths)}** nodes online",
+            color=discord.Color.red() if problems else discord.Color.green(),
+            timestamp=discord.utils.utcnow()
         )
         
-        embed.add_field(name="🆔 ID", value=attrs.get('id', 'N/A'), inline=True)
-        embed.add_field(name="🔑 UUID", value=attrs.get('uuid', 'N/A')[:8] + "...", inline=True)
-        embed.add_field(name="📊 Status", value="🟢 Active" if not attrs.get('suspended') else "🔴 Suspended", inline=True)
-        
-        embed.add_field(name="💾 RAM", value=f"{limits.get('memory', 0)} MB", inline=True)
-        embed.add_field(name="⚙️ CPU", value=f"{limits.get('cpu', 0)}%", inline=True)
-        embed.add_field(name="💿 Disk", value=f"{limits.get('disk', 0)} MB", inline=True)
+        labels = {
+            'online': "🟢 Online",
+            'offline': "🔴 Offline",
+            'maintenance': "🟠 Maintenance",
+            'unknown': "⚪ Unknown"
+        }
+        for health in healths[:25]:
+            node = health.node
+            lines = [labels.get(health.status, health.status)]
+            if health.online:
+                lines[0] += f" · {health.latency_ms:.0f} ms via {health.probe_server}"
+            elif health.error:
+                lines.append(health.error[:100])
+            
+            memory_limit = "∞" if health.memory_limit == float('inf') else f"{health.memory_limit:.0f}"
+            memory_pct = "" if health.memory_limit in (0, float('inf')) else f" ({100 * health.committed_memory / health.memory_limit:.0f}%)"
+            lines.append(f"RAM: {health.committed_memory}/{memory_limit} MB committed{memory_pct}")
+            if health.used_memory is not None:
+                lines.append(f"RAM in use: {health.used_memory} MB")
+            disk_limit = "∞" if health.disk_limit == float('inf') else f"{health.disk_limit:.0f}"
+            lines.append(f"Disk: {health.committed_disk}/{disk_limit} MB committed · {health.servers} servers")
+            
+            embed.add_field(name=f"{node.name} (ID: {node.id})", value="\n".join(lines), inline=False)
         
-        embed.set_footer(text=f"Server UUID: {attrs.get('uuid', 'N/A')}")
+        if len(healths) > 25:
+            embed.set_footer(text=f"Showing 25 of {len(healths)} nodes")
         return embed
     
     @staticmethod
-    def node_info(node_data: dict) -> discord.Embed:
-        """Display node information"""
-        attrs = node_data.get('attributes', {})
-        
+    def status_board(snapshot) -> discord.Embed:
+        """Auto-updating status board: panel, nodes, servers, queues and API latency at a glance"""
+        offline = [h for h in snapshot.nodes if h.status in ('offline', 'unknown')]
+        if not snapshot.panel_ok:
+            color, state = discord.Color.red(), "🔴 Panel unreachable"
+        elif offline:
+            color, state = discord.Color.orange(), f"🟠 {len(offline)} node(s) down"
+        else:
+            color, state = discord.Color.green(), "🟢 All systems operational"
         embed = discord.Embed(
-            title=f"🖥️ {attrs.get('name', 'Unknown Node')}",
-            color=discord.Color.purple(),
-            timestamp=datetime.utcnow()
+            title="📊 Panel Status",
+            description=state,
+            color=color,
+            timestamp=discord.utils.utcnow()
         )
         
-        embed.add_field(name="🆔 ID", value=attrs.get('id', 'N/A'), inline=True)
-        embed.add_field(name="🌐 FQDN", value=attrs.get('fqdn', 'N/A'), inline=True)
-        embed.add_field(name="📍 Location", value=attrs.get('location_id', 'N/A'), inline=True)
+        panel = [f"Index: {'loaded <t:%d:R>' % snapshot.index_refreshed if snapshot.index_refreshed else 'not loaded'}"]
+        if snapshot.api_latency_ms is not None:
+            panel.append(f"API: {snapshot.api_latency_ms:.0f} ms avg · {snapshot.api_requests_per_min:.0f} req/min")
+        else:
+            panel.append("API: idle")
+        if snapshot.gateway_ms is not None:
+            panel.append(f"Gateway: {snapshot.gateway_ms:.0f} ms")
+        embed.add_field(name="🦖 Panel", value="\n".join(panel), inline=True)
+        
+        servers = [
+            f"Total: {snapshot.servers}",
+            f"Active: {snapshot.servers - snapshot.suspended}",
+            f"Suspended: {snapshot.suspended}"
+        ]
+        if snapshot.running is not None:
+            servers.append(f"Running: {snapshot.running} · Idle: {snapshot.idle}")
+        servers.append(f"Expiring in 24h: {snapshot.expiring}")
+        embed.add_field(name="🎮 Servers", value="\n".join(servers), inline=True)
+        
+        names = {'events': "Events", 'log': "Log channel", 'dm': "DMs"}
+        queues = [f"{names.get(name, name)}: {depth}" for name, depth in snapshot.queues.items()]
+        queues.append(f"Scheduled jobs: {snapshot.jobs}")
+        embed.add_field(name="📬 Queues", value="\n".join(queues), inline=True)
         
-        embed.add_field(name="💾 Memory", value=f"{attrs.get('memory', 0)} MB", inline=True)
-        embed.add_field(name="💿 Disk", value=f"{attrs.get('disk', 0)} MB", inline=True)
-        embed.add_field(name="🔌 Daemon Port", value=attrs.get('daemon_listen', 'N/A'), inline=True)
+        icons = {'online': "🟢", 'offline': "🔴", 'maintenance': "🟠", 'unknown': "⚪"}
+        lines = []
+        for health in snapshot.nodes:
+            usage = ""
+            if health.memory_limit not in (0, float('inf')):
+                usage = f" · RAM {100 * health.committed_memory / health.memory_limit:.0f}%"
+            lines.append(f"{icons.get(health.status, '⚪')} **{health.node.name}** · {health.servers} servers{usage}")
+        value = ""
+        for i, line in enumerate(lines):
+            if len(value) + len(line) + 30 > 1024:
+                value += f"... and {len(lines) - i} more"
+                break
+            value += line + "\n"
+        embed.add_field(name=f"🖥️ Nodes ({len(snapshot.nodes) - len(offline)}/{len(snapshot.nodes)} up)", value=value or "No nodes", inline=False)
         
         return embed
@@ -0,0 +1,194 @@
+import time
+import asyncio
+import discord
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Type
+from utils.metrics import REGISTRY, QUEUE_DEPTH
+from utils.models import Server, User
+
+EVENTS_PUBLISHED = REGISTRY.counter(
+    'bot_events_published_total',
+    'Events published on the internal event bus',
+    ('event', 'source')
+)
+
+EVENT_DELIVERY = REGISTRY.histogram(
+    'bot_event_delivery_seconds',
+    'Time from publishing an event until all of its handlers finished',
+    ('event',)
+)
+
+EVENT_HANDLER_ERRORS = REGISTRY.counter(
+    'bot_event_handler_errors_total',
+    'Event handlers that raised',
+    ('event', 'handler')
+)
+
+class Event:
+    """Base class for everything published on the bus"""
+    __slots__ = ()
+    name = 'event'
+
+# ==================== SERVER LIFECYCLE ====================
+# ``source`` is 'panel' for changes found by the change feed, 'command' for
+# bot commands, which also set the acting admin and an optional DM recipient
+# override (otherwise the server's linked owner is notified), and 'expiry' for
+# actions taken by the expiry engine. ``panel`` names the panel the server is
+# on (None for the default panel)
+
+@dataclass(frozen=True, slots=True)
+class ServerCreated(Event):
+    name = 'server_created'
+    server: Server
+    source: str = 'panel'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    node_name: Optional[str] = None
+    version: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    panel: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class ServerDeleted(Event):
+    name = 'server_deleted'
+    server: Server
+    source: str = 'panel'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    panel: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class ServerSuspended(Event):
+    name = 'server_suspended'
+    server: Server
+    source: str = 'panel'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    reason: Optional[str] = None
+    panel: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class ServerUnsuspended(Event):
+    name = 'server_unsuspended'
+    server: Server
+    source: str = 'panel'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    panel: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class LimitsChanged(Event):
+    name = 'limits_changed'
+    before: Server
+    after: Server
+    source: str = 'panel'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    panel: Optional[str] = None
+    
+    @property
+    def server(self) -> Server:
+        return self.after
+
+@dataclass(frozen=True, slots=True)
+class ServerExpiring(Event):
+    name = 'server_expiring'
+    server: Server
+    expires_at: float
+    suspend_at: float
+    source: str = 'expiry'
+    actor: Optional[discord.abc.User] = None
+    recipient: Optional[discord.abc.User] = None
+    panel: Optional[str] = None
+
+# ==================== USERS ====================
+
+@dataclass(frozen=True, slots=True)
+class UserCreated(Event):
+    name = 'user_created'
+    user: User
+    source: str = 'panel'
+    panel: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class UserDeleted(Event):
+    name = 'user_deleted'
+    user: User
+    source: str = 'panel'
+    panel: Optional[str] = None
+
+Handler = Callable[[Event], Awaitable[None]]
+
+class EventBus:
+    """
+    In-process publish/subscribe bus; ``publish`` only enqueues, workers run
+    every matching handler concurrently so publishers never wait on subscribers
+    """
+    
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self._handlers: Dict[Type[Event], List[Handler]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        QUEUE_DEPTH.set_function(self._queue.qsize, queue='events')
+    
+    def subscribe(self, event_type: Type[Event], handler: Handler):
+        """Call ``handler`` for ``event_type`` and its subclasses (``Event`` receives everything)"""
+        self._handlers.setdefault(event_type, []).append(handler)
+    
+    def on(self, event_type: Type[Event]):
+        """Decorator form of ``subscribe``"""
+        def decorator(handler: Handler) -> Handler:
+            self.subscribe(event_type, handler)
+            return handler
+        return decorator
+    
+    def handlers_for(self, event: Event) -> List[Handler]:
+        handlers = []
+        for cls in type(event).__mro__:
+            handlers.extend(self._handlers.get(cls, ()))
+        return handlers
+    
+    def publish(self, event: Event):
+        EVENTS_PUBLISHED.inc(event=event.name, source=getattr(event, 'source', ''))
+        self._queue.put_nowait((event, time.perf_counter()))
+    
+    # ==================== WORKERS ====================
+    
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self, timeout: Optional[float] = 5.0):
+        """Deliver what is already queued (up to ``timeout``), then stop the workers"""
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    async def _worker(self):
+        while True:
+            event, published_at = await self._queue.get()
+            try:
+                await self.dispatch(event)
+            finally:
+                EVENT_DELIVERY.observe(time.perf_counter() - published_at, event=event.name)
+                self._queue.task_done()
+    
+    async def dispatch(self, event: Event):
+        """Run every handler for ``event`` concurrently, isolating failures"""
+        handlers = self.handlers_for(event)
+        if not handlers:
+            return
+        results = await asyncio.gather(*(handler(event) for handler in handlers), return_exceptions=True)
+        for handler, result in zip(handlers, results):
+            if isinstance(result, Exception):
+                name = getattr(handler, '__qualname__', type(handler).__qualname__)
+                EVENT_HANDLER_ERRORS.inc(event=event.name, handler=name)
+                print(f"Event handler {name} failed on {event.name}: {result}")
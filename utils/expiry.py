@@ -0,0 +1,321 @@
+import os
+import time
+import heapq
+import sqlite3
+import asyncio
+import threading
+import dataclasses
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils.events import EventBus, ServerDeleted, ServerExpiring, ServerSuspended, ServerUnsuspended
+from utils.metrics import REGISTRY
+
+EXPIRY_ACTIONS = REGISTRY.counter(
+    'bot_expiry_actions_total',
+    'Reminders sent and servers suspended by the expiry engine',
+    ('action', 'result')
+)
+
+EXPIRY_TRACKED = REGISTRY.gauge(
+    'bot_expiry_tracked_servers',
+    'Servers with an expiry date'
+)
+
+EXPIRY_SWEEP_DURATION = REGISTRY.histogram(
+    'bot_expiry_sweep_seconds',
+    'Time spent processing due expiries in one sweep'
+)
+
+@dataclass
+class ExpiryRecord:
+    """Expiry date of one server and how far its reminders/suspension have got"""
+    server_id: int
+    expires_at: float
+    reminders_sent: int = 0
+    suspended: bool = False
+    set_by: Optional[int] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expiries (
+    server_id INTEGER PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    reminders_sent INTEGER NOT NULL DEFAULT 0,
+    suspended INTEGER NOT NULL DEFAULT 0,
+    set_by INTEGER
+)
+"""
+
+class ExpiryStore:
+    """SQLite expiry table; every call runs in a worker thread, one at a time on the shared connection"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+    
+    def _load(self) -> List[ExpiryRecord]:
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT server_id, expires_at, reminders_sent, suspended, set_by FROM expiries'
+            ).fetchall()
+            return [ExpiryRecord(r[0], r[1], r[2], bool(r[3]), r[4]) for r in rows]
+    
+    def _save(self, records: Sequence[ExpiryRecord]):
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                'INSERT OR REPLACE INTO expiries VALUES (?, ?, ?, ?, ?)',
+                [(r.server_id, r.expires_at, r.reminders_sent, int(r.suspended), r.set_by) for r in records]
+            )
+            conn.commit()
+    
+    def _delete(self, server_id: int):
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM expiries WHERE server_id = ?', (server_id,))
+            conn.commit()
+    
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    async def load(self) -> List[ExpiryRecord]:
+        return await asyncio.to_thread(self._load)
+    
+    async def save(self, *records: ExpiryRecord):
+        await asyncio.to_thread(self._save, records)
+    
+    async def delete(self, server_id: int):
+        await asyncio.to_thread(self._delete, server_id)
+    
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+class ExpiryManager:
+    """
+    Tracks per-server expiry dates, DMs reminders ``reminder_hours`` before
+    expiry and suspends servers ``grace_hours`` after it. Each record's next
+    due action sits in a min-heap, so a sweep only touches servers with
+    something to do; due work is processed in batches of ``batch_size`` with
+    ``batch_delay`` seconds between them to stay under panel rate limits.
+    """
+    
+    def __init__(self, bot, path: str, grace_hours: float = 24, reminder_hours: Sequence[float] = (72, 24),
+                 batch_size: int = 10, batch_delay: float = 2.0):
+        self.bot = bot
+        self.api = bot.api
+        self.index = bot.index
+        self.events: EventBus = bot.events
+        self.store = ExpiryStore(path)
+        self.grace = grace_hours * 3600
+        self.reminders = sorted((h * 3600 for h in reminder_hours), reverse=True)
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.records: Dict[int, ExpiryRecord] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._lock = asyncio.Lock()
+        EXPIRY_TRACKED.set_function(lambda: len(self.records))
+        bot.scheduler.register('expiry_sweep', self.sweep)
+    
+    # ==================== SCHEDULE ====================
+    
+    def suspend_at(self, record: ExpiryRecord) -> float:
+        return record.expires_at + self.grace
+    
+    def next_due(self, record: ExpiryRecord) -> Optional[float]:
+        """When the record next needs attention; None once the server has been suspended"""
+        if record.suspended:
+            return None
+        if record.reminders_sent < len(self.reminders):
+            return record.expires_at - self.reminders[record.reminders_sent]
+        return self.suspend_at(record)
+    
+    def _reminders_passed(self, expires_at: float, now: float) -> int:
+        """How many reminders are already due for an expiry at ``expires_at``"""
+        return sum(1 for offset in self.reminders if expires_at - offset <= now)
+    
+    def _push(self, record: ExpiryRecord):
+        due = self.next_due(record)
+        if due is not None:
+            heapq.heappush(self._heap, (due, record.server_id))
+    
+    def get(self, server_id: int) -> Optional[ExpiryRecord]:
+        return self.records.get(server_id)
+    
+    def upcoming(self, within: float) -> List[ExpiryRecord]:
+        """Unsuspended servers expiring in the next ``within`` seconds (or already expired), soonest first"""
+        cutoff = time.time() + within
+        return sorted(
+            (r for r in self.records.values() if not r.suspended and r.expires_at <= cutoff),
+            key=lambda r: r.expires_at
+        )
+    
+    # ==================== LIFECYCLE ====================
+    
+    async def start(self):
+        """Load stored expiries, subscribe to deletions and make sure the minutely sweep is scheduled"""
+        for record in await self.store.load():
+            self.records[record.server_id] = record
+            self._push(record)
+        self.events.subscribe(ServerDeleted, self._on_deleted)
+        if self.bot.scheduler.get('expiry_sweep') is None:
+            await self.bot.scheduler.schedule_cron('expiry_sweep', 'expiry_sweep', '* * * * *', catch_up='skip')
+    
+    async def stop(self):
+        await self.store.close()
+    
+    async def sync(self):
+        """Adopt expiries that another process sharing the expiry table set, swept or cleared"""
+        async with self._lock:
+            stored = {record.server_id: record for record in await self.store.load()}
+            for server_id in [server_id for server_id in self.records if server_id not in stored]:
+                del self.records[server_id]
+            for server_id, record in stored.items():
+                if self.records.get(server_id) != record:
+                    self.records[server_id] = record
+                    self._push(record)
+    
+    async def _on_deleted(self, event: ServerDeleted):
+        await self.clear(event.server.id)
+    
+    # ==================== CHANGES ====================
+    
+    async def set_expiry(self, server_id: int, expires_at: float, set_by: Optional[int] = None) -> Tuple[ExpiryRecord, bool]:
+        """Set or extend a server's expiry; returns the record and whether an expiry suspension was lifted"""
+        async with self._lock:
+            previous = self.records.get(server_id)
+            # Only the latest reminder that is already due gets sent, not every earlier one
+            reminders_sent = max(0, self._reminders_passed(expires_at, time.time()) - 1)
+            record = ExpiryRecord(server_id, expires_at, reminders_sent, False, set_by)
+            
+            lifted = False
+            if previous and previous.suspended and self.suspend_at(record) > time.time():
+                result = await self.api.unsuspend_server(server_id)
+                if not result['success']:
+                    raise RuntimeError(result.get('error', 'Could not unsuspend the server'))
+                lifted = True
+            elif previous and previous.suspended:
+                record.suspended = True
+            
+            await self.store.save(record)
+            self.records[server_id] = record
+            self._push(record)
+        
+        if lifted:
+            server = self.index.get_server(server_id) or await self.api.get_server_model(server_id)
+            if server:
+                self.events.publish(ServerUnsuspended(
+                    dataclasses.replace(server, suspended=False),
+                    source='expiry',
+                    actor=self.bot.user
+                ))
+        return record, lifted
+    
+    async def clear(self, server_id: int) -> bool:
+        async with self._lock:
+            if self.records.pop(server_id, None) is None:
+                return False
+            # Its heap entry is dropped lazily by the next sweep
+            await self.store.delete(server_id)
+            return True
+    
+    # ==================== SWEEP ====================
+    
+    async def sweep(self, job=None) -> int:
+        """Process every due reminder and suspension; returns how many servers were handled"""
+        start = time.perf_counter()
+        now = time.time()
+        handled: List[ExpiryRecord] = []
+        seen = set()
+        # The lock is only held to take a batch off the heap and to save it, so
+        # /expiry commands aren't stuck behind panel calls and batch delays
+        batch = await self._take_due(now, seen)
+        while batch:
+            await asyncio.gather(*(self._process(record, now) for record in batch))
+            async with self._lock:
+                # A renewal or clear made while the batch was processed wins over its result
+                batch = [record for record in batch if self.records.get(record.server_id) is record]
+                await self.store.save(*batch)
+            handled.extend(batch)
+            if not (self._heap and self._heap[0][0] <= now):
+                break
+            await asyncio.sleep(self.batch_delay)
+            batch = await self._take_due(now, seen)
+        
+        # Pushed back only now, so a failed suspension is retried by the next sweep rather than this one
+        async with self._lock:
+            for record in handled:
+                if self.records.get(record.server_id) is record:
+                    self._push(record)
+        
+        if handled:
+            EXPIRY_SWEEP_DURATION.observe(time.perf_counter() - start)
+        return len(handled)
+    
+    async def _take_due(self, now: float, seen: set) -> List[ExpiryRecord]:
+        """Pop up to ``batch_size`` records due at ``now`` that this sweep hasn't handled yet"""
+        async with self._lock:
+            due: List[ExpiryRecord] = []
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                at, server_id = heapq.heappop(self._heap)
+                record = self.records.get(server_id)
+                # Skip entries left behind by clears, renewals and earlier actions
+                if record is not None and self.next_due(record) == at and server_id not in seen:
+                    seen.add(server_id)
+                    due.append(record)
+            return due
+    
+    async def _process(self, record: ExpiryRecord, now: float):
+        server = self.index.get_server(record.server_id) or await self.api.get_server_model(record.server_id)
+        if server is None:
+            # Deleted outside the bot; the change feed's delete event clears it, this stops retries
+            record.suspended = True
+            return
+        
+        if now < self.suspend_at(record):
+            record.reminders_sent = max(record.reminders_sent + 1, self._reminders_passed(record.expires_at, now))
+            if now < record.expires_at:
+                self.events.publish(ServerExpiring(
+                    server,
+                    expires_at=record.expires_at,
+                    suspend_at=self.suspend_at(record),
+                    actor=self.bot.user
+                ))
+                EXPIRY_ACTIONS.inc(action='reminder', result='sent')
+            return
+        
+        if server.suspended:
+            record.suspended = True
+            EXPIRY_ACTIONS.inc(action='suspend', result='already_suspended')
+            return
+        
+        result = await self.api.suspend_server(record.server_id)
+        if not result['success']:
+            # Leave it due; the next sweep retries
+            EXPIRY_ACTIONS.inc(action='suspend', result='failed')
+            print(f"Expiry suspension of server {record.server_id} failed: {result.get('error')}")
+            return
+        
+        record.suspended = True
+        EXPIRY_ACTIONS.inc(action='suspend', result='suspended')
+        expired = datetime.fromtimestamp(record.expires_at, timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+        self.events.publish(ServerSuspended(
+            dataclasses.replace(server, suspended=True),
+            source='expiry',
+            actor=self.bot.user,
+            reason=f"Server expired on {expired}"
+        ))
@@ -0,0 +1,150 @@
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from utils.api import PterodactylAPI
+from utils.index import PanelIndex
+from utils.metrics import REGISTRY
+from utils.models import Node, Server
+
+NODE_UP = REGISTRY.gauge(
+    'bot_node_up',
+    'Whether the last probe reached the node\'s Wings daemon (1) or not (0)',
+    ('panel', 'node')
+)
+
+NODE_PROBE_LATENCY = REGISTRY.histogram(
+    'bot_node_probe_seconds',
+    'Node probe latency (a client API resources request the panel answers from Wings)',
+    ('panel', 'node')
+)
+
+@dataclass(frozen=True)
+class NodeHealth:
+    """Probe result and committed resources of one node"""
+    node: Node
+    status: str
+    checked_at: float
+    latency_ms: Optional[float] = None
+    # Server whose resources request the node was probed through
+    probe_server: Optional[str] = None
+    error: Optional[str] = None
+    servers: int = 0
+    committed_memory: int = 0
+    committed_disk: int = 0
+    used_memory: Optional[int] = None
+    
+    @property
+    def online(self) -> bool:
+        return self.status == 'online'
+    
+    @property
+    def memory_limit(self) -> float:
+        overallocate = self.node.memory_overallocate
+        return float('inf') if overallocate < 0 else self.node.memory * (1 + overallocate / 100)
+    
+    @property
+    def disk_limit(self) -> float:
+        overallocate = self.node.disk_overallocate
+        return float('inf') if overallocate < 0 else self.node.disk * (1 + overallocate / 100)
+
+class NodeHealthMonitor:
+    """
+    Probes every node concurrently, through the panel: a client API
+    ``resources`` request for one unsuspended server on the node is answered
+    by the panel asking that node's Wings daemon, so it fails when the panel
+    can't reach the node. The bot never holds daemon credentials or needs a
+    route to the nodes. Results are cached for ``ttl`` seconds and concurrent
+    callers share a single in-flight probe per node.
+    """
+    
+    def __init__(self, api: PterodactylAPI, index: PanelIndex, ttl: float = 30, timeout: float = 5, usage=None):
+        self.api = api
+        self.index = index
+        self.ttl = ttl
+        self.timeout = timeout
+        # Optional callable returning measured RAM per node (e.g. from the idle detector's samples)
+        self.usage = usage
+        self._results: Dict[int, Tuple[float, NodeHealth]] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+    
+    # ==================== PROBES ====================
+    
+    def _probe_server(self, node: Node) -> Optional[Server]:
+        """A server to ask the panel about; the lowest ID so repeated probes hit the same one"""
+        candidates = [s for s in self.index.servers.values() if s.node == node.id and not s.suspended]
+        return min(candidates, key=lambda s: s.id) if candidates else None
+    
+    async def probe(self, node: Node) -> NodeHealth:
+        """Check one node right now"""
+        now = time.time()
+        if node.maintenance_mode:
+            # Not probed, so don't keep exporting whatever the last probe saw
+            NODE_UP.remove(panel=self.api.name, node=node.name)
+            return NodeHealth(node, 'maintenance', now)
+        
+        server = self._probe_server(node)
+        if server is None:
+            NODE_UP.set(0, panel=self.api.name, node=node.name)
+            return NodeHealth(node, 'unknown', now, error="No unsuspended server to probe the node through")
+        
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.api.get_server_resources(server.uuid), self.timeout)
+        except asyncio.TimeoutError:
+            result = {'success': False, 'status': 504, 'error': f"Timed out after {self.timeout:g}s"}
+        latency = time.perf_counter() - start
+        NODE_PROBE_LATENCY.observe(latency, panel=self.api.name, node=node.name)
+        NODE_UP.set(1 if result['success'] else 0, panel=self.api.name, node=node.name)
+        
+        if result['success']:
+            return NodeHealth(node, 'online', now, latency * 1000, probe_server=server.name)
+        if (result.get('status') or 0) < 500:
+            # The panel was unreachable or refused (key, server state); that says nothing about the node
+            return NodeHealth(node, 'unknown', now, latency * 1000, error=f"Panel: {result.get('error')}")
+        # 5xx: the panel couldn't get an answer from the node's Wings daemon
+        return NodeHealth(node, 'offline', now, latency * 1000, error=f"Via {server.name}: {result.get('error')}")
+    
+    async def _probe_cached(self, node: Node, force: bool) -> NodeHealth:
+        cached = self._results.get(node.id)
+        if cached and not force and time.monotonic() - cached[0] < self.ttl and cached[1].node == node:
+            return cached[1]
+        task = self._inflight.get(node.id)
+        if task is None:
+            task = self._inflight[node.id] = asyncio.create_task(self.probe(node))
+            task.add_done_callback(lambda _: self._inflight.pop(node.id, None))
+        health = await asyncio.shield(task)
+        self._results[node.id] = (time.monotonic(), health)
+        return health
+    
+    # ==================== DASHBOARD ====================
+    
+    def _committed(self) -> Dict[int, Tuple[int, int, int]]:
+        """Server count, memory and disk committed per node, in one pass over the index"""
+        totals: Dict[int, List[int]] = {}
+        for server in self.index.servers.values():
+            entry = totals.setdefault(server.node, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += server.memory
+            entry[2] += server.disk
+        return {node_id: tuple(values) for node_id, values in totals.items()}
+    
+    async def check_all(self, force: bool = False) -> List[NodeHealth]:
+        """Health of every node in the index, probing those whose cached result has expired (or all with ``force``)"""
+        await self.index.ensure_loaded()
+        if force:
+            nodes = await self.api.fetch_all_nodes()
+            if nodes is not None:
+                self.index.upsert_nodes(nodes)
+        nodes = sorted(self.index.nodes.values(), key=lambda n: n.id)
+        healths = await asyncio.gather(*(self._probe_cached(node, force) for node in nodes))
+        committed = self._committed()
+        used = self.usage() if self.usage else {}
+        result = []
+        for health in healths:
+            servers, memory, disk = committed.get(health.node.id, (0, 0, 0))
+            result.append(NodeHealth(
+                health.node, health.status, health.checked_at, health.latency_ms, health.probe_server,
+                health.error, servers, memory, disk, used.get(health.node.id)
+            ))
+        return result
@@ -0,0 +1,215 @@
+import time
+import heapq
+import random
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from utils.concurrency import RateLimiter
+from utils.embeds import EmbedBuilder
+from utils.metrics import REGISTRY
+from utils.models import ResourceUsage, Server
+
+IDLE_SAMPLES = REGISTRY.counter(
+    'bot_idle_samples_total',
+    'Resource samples taken by the idle detector',
+    ('result',)
+)
+
+IDLE_SERVERS = REGISTRY.gauge(
+    'bot_idle_servers',
+    'Running servers currently flagged as idle'
+)
+
+IDLE_STOPPED = REGISTRY.counter(
+    'bot_idle_stopped_total',
+    'Idle servers stopped by the idle detector',
+    ('result',)
+)
+
+@dataclass
+class Activity:
+    """Sampling state of one server"""
+    server_id: int
+    interval: float
+    next_poll: float
+    last: Optional[ResourceUsage] = None
+    last_at: float = 0.0
+    idle_since: Optional[float] = None
+    flagged: bool = False
+    
+    def idle_for(self, now: float) -> float:
+        return now - self.idle_since if self.idle_since is not None else 0.0
+
+class IdleDetector:
+    """
+    Samples ``get_server_resources`` for every unsuspended server and flags
+    servers whose CPU and network traffic stay below the thresholds for
+    ``idle_hours``. Idle and offline servers back off to ``max_interval``
+    between samples, busy ones are polled every ``min_interval``; samples run
+    ``concurrency`` at a time and at most ``rate`` per second. With
+    ``auto_stop`` on, flagged servers are stopped through the power endpoint.
+    """
+    
+    def __init__(self, bot, idle_hours: float = 6, cpu_percent: float = 2.0, network_bps: float = 1024,
+                 min_interval: float = 60, max_interval: float = 900, rate: float = 5,
+                 concurrency: int = 10, auto_stop: bool = False):
+        self.bot = bot
+        self.api = bot.api
+        self.index = bot.index
+        self.idle_seconds = idle_hours * 3600
+        self.cpu_percent = cpu_percent
+        self.network_bps = network_bps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.auto_stop = auto_stop
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate, burst=max(1, concurrency))
+        self.activity: Dict[int, Activity] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._task: Optional[asyncio.Task] = None
+        IDLE_SERVERS.set_function(lambda: sum(1 for a in self.activity.values() if a.flagged))
+    
+    # ==================== QUERIES ====================
+    
+    def flagged(self) -> List[Tuple[Server, Activity]]:
+        """Flagged servers that are still running, longest idle first"""
+        now = time.time()
+        result = []
+        for activity in self.activity.values():
+            server = self.index.get_server(activity.server_id)
+            if activity.flagged and server and activity.last and activity.last.state == 'running':
+                result.append((server, activity))
+        return sorted(result, key=lambda item: item[1].idle_for(now), reverse=True)
+    
+    def memory_by_node(self) -> Dict[int, int]:
+        """RAM (MB) measured on running servers per node, from the latest samples"""
+        totals: Dict[int, int] = {}
+        for activity in self.activity.values():
+            server = self.index.get_server(activity.server_id)
+            if server and activity.last and activity.last.state == 'running':
+                totals[server.node] = totals.get(server.node, 0) + activity.last.memory_bytes // (1024 * 1024)
+        return totals
+    
+    # ==================== SAMPLING ====================
+    
+    def _sync(self, now: float):
+        """Track new unsuspended servers (spread over the first interval) and drop gone ones"""
+        current = {server.id for server in self.index.servers.values() if not server.suspended}
+        for server_id in current - self.activity.keys():
+            due = now + random.uniform(0, self.min_interval)
+            self.activity[server_id] = Activity(server_id, self.min_interval, due)
+            heapq.heappush(self._heap, (due, server_id))
+        for server_id in self.activity.keys() - current:
+            # Heap entries for dropped servers are skipped when popped
+            del self.activity[server_id]
+    
+    def _is_idle(self, activity: Activity, sample: ResourceUsage, now: float) -> bool:
+        if sample.cpu_absolute > self.cpu_percent:
+            return False
+        previous = activity.last
+        if previous is None or sample.uptime < previous.uptime or sample.network_bytes < previous.network_bytes:
+            # First sample or restarted since the last one: the traffic rate is unknown until the next
+            return False
+        elapsed = max(now - activity.last_at, 1e-3)
+        return (sample.network_bytes - previous.network_bytes) / elapsed <= self.network_bps
+    
+    def _record(self, activity: Activity, sample: Optional[ResourceUsage], now: float):
+        if sample is None:
+            IDLE_SAMPLES.inc(result='failed')
+            activity.interval = min(activity.interval * 2, self.max_interval)
+        elif sample.state != 'running':
+            # Stopped servers use no CPU or RAM; check back rarely in case they're started
+            IDLE_SAMPLES.inc(result='offline')
+            activity.idle_since = None
+            activity.flagged = False
+            activity.interval = self.max_interval
+        elif self._is_idle(activity, sample, now):
+            IDLE_SAMPLES.inc(result='idle')
+            if activity.idle_since is None:
+                activity.idle_since = activity.last_at if activity.last else now
+            activity.flagged = activity.idle_for(now) >= self.idle_seconds
+            activity.interval = min(activity.interval * 2, self.max_interval)
+        else:
+            IDLE_SAMPLES.inc(result='active')
+            activity.idle_since = None
+            activity.flagged = False
+            activity.interval = self.min_interval
+        
+        if sample is not None:
+            activity.last = sample
+            activity.last_at = now
+        # Never sample again later than the moment the server could cross the idle threshold
+        interval = activity.interval
+        if activity.idle_since is not None and not activity.flagged:
+            interval = min(interval, max(self.min_interval, activity.idle_since + self.idle_seconds - now))
+        activity.next_poll = now + interval
+        heapq.heappush(self._heap, (activity.next_poll, activity.server_id))
+    
+    async def _sample(self, activity: Activity, semaphore: asyncio.Semaphore):
+        server = self.index.get_server(activity.server_id)
+        if server is None:
+            return
+        async with semaphore:
+            async with self.limiter:
+                sample = await self.api.get_resource_usage(server.uuid)
+        was_flagged = activity.flagged
+        self._record(activity, sample, time.time())
+        if activity.flagged and not was_flagged and self.auto_stop:
+            await self.stop_server(server, activity)
+    
+    async def poll(self) -> int:
+        """Sample every server that is due; returns how many were sampled"""
+        now = time.time()
+        self._sync(now)
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            at, server_id = heapq.heappop(self._heap)
+            activity = self.activity.get(server_id)
+            if activity is not None and activity.next_poll == at:
+                due.append(activity)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._sample(activity, semaphore) for activity in due))
+        return len(due)
+    
+    async def run(self):
+        """Sample continuously, sleeping until the next server is due"""
+        await self.index.ensure_loaded()
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                print(f"Idle detector poll failed: {e}")
+            wait = self._heap[0][0] - time.time() if self._heap else self.min_interval
+            # Wake at least every min_interval so new servers are picked up
+            await asyncio.sleep(min(max(wait, 1.0), self.min_interval))
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    # ==================== POWER ====================
+    
+    async def stop_server(self, server: Server, activity: Activity) -> bool:
+        """Stop an idle server and log it"""
+        result = await self.api.send_power_action(server.uuid, 'stop')
+        IDLE_STOPPED.inc(result='stopped' if result['success'] else 'failed')
+        if not result['success']:
+            print(f"Stopping idle server {server.id} failed: {result.get('error')}")
+            return False
+        
+        hours = activity.idle_for(time.time()) / 3600
+        memory = activity.last.memory_bytes // (1024 * 1024) if activity.last else 0
+        activity.flagged = False
+        activity.idle_since = None
+        await self.bot.log_action(EmbedBuilder.info(
+            "Idle Server Stopped",
+            f"**{server.name}** (ID: {server.id}) was idle for at least {hours:.1f}h and has been stopped, "
+            f"freeing about {memory} MB of RAM on node {server.node}"
+        ))
+        return True
@@ -0,0 +1,245 @@
+import time
+import asyncio
+import dataclasses
+from typing import Dict, Iterable, List, Optional, Set
+from utils.api import PterodactylAPI
+from utils.models import Server, User, Node
+from utils.metrics import REGISTRY, record_cache
+
+INDEX_RECORDS = REGISTRY.gauge(
+    'bot_index_records',
+    'Records held in the in-memory panel index',
+    ('panel', 'kind')
+)
+
+class PanelIndex:
+    """In-memory index of panel servers, users and nodes held as compact models"""
+    
+    def __init__(self, api: PterodactylAPI, ttl: float = 300):
+        self.api = api
+        self.ttl = ttl
+        self.servers: Dict[int, Server] = {}
+        self.users: Dict[int, User] = {}
+        self.nodes: Dict[int, Node] = {}
+        self.users_by_email: Dict[str, int] = {}
+        self.users_by_discord: Dict[int, int] = {}
+        self.servers_by_owner: Dict[int, Set[int]] = {}
+        # When the bot last wrote or removed each server/user (monotonic), so a listing
+        # fetched before that write doesn't overwrite it. Writes that apply a listing
+        # (the change feed) pass ``stamp=False``
+        self.server_changed_at: Dict[int, float] = {}
+        self.user_changed_at: Dict[int, float] = {}
+        self.refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        
+        INDEX_RECORDS.set_function(lambda: len(self.servers), panel=api.name, kind='servers')
+        INDEX_RECORDS.set_function(lambda: len(self.users), panel=api.name, kind='users')
+        INDEX_RECORDS.set_function(lambda: len(self.nodes), panel=api.name, kind='nodes')
+    
+    @property
+    def loaded(self) -> bool:
+        return self.refreshed_at > 0
+    
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self.refreshed_at > self.ttl
+    
+    # ==================== LOADING ====================
+    
+    async def refresh(self) -> bool:
+        """Reload everything from the panel; returns False if any listing failed"""
+        async with self._refresh_lock:
+            servers, users, nodes = await asyncio.gather(
+                self.api.fetch_all_servers(),
+                self.api.fetch_all_users(),
+                self.api.fetch_all_nodes()
+            )
+            if servers is None or users is None or nodes is None:
+                return False
+            self.users = {user.id: user for user in users}
+            self.users_by_email = {user.email.lower(): user.id for user in users}
+            self.users_by_discord = {user.discord_id: user.id for user in users if user.discord_id is not None}
+            self.servers = {}
+            self.servers_by_owner = {}
+            for server in servers:
+                self._store_server(server)
+            self.nodes = {node.id: node for node in nodes}
+            self.server_changed_at = {}
+            self.user_changed_at = {}
+            self.refreshed_at = time.monotonic()
+            return True
+    
+    async def ensure_loaded(self) -> bool:
+        """Load the index on first use or once it has gone stale"""
+        if self.loaded and not self.stale:
+            return True
+        if self._refresh_lock.locked():
+            # Someone else is already refreshing; wait for them instead of refetching
+            async with self._refresh_lock:
+                return self.loaded
+        return await self.refresh() or self.loaded
+    
+    # ==================== SERVERS ====================
+    
+    def get_server(self, server_id: int) -> Optional[Server]:
+        server = self.servers.get(server_id)
+        record_cache('servers', server is not None)
+        return server
+    
+    def search_servers(self, query: str, limit: Optional[int] = None) -> List[Server]:
+        needle = query.lower()
+        matches = []
+        for server in self.servers.values():
+            if needle in server.name.lower() or server.uuid.startswith(needle):
+                matches.append(server)
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+    
+    def find_server(self, ref: str) -> Optional[Server]:
+        """Look a server up by ID, UUID or short identifier"""
+        ref = ref.strip()
+        if ref.isdigit():
+            return self.get_server(int(ref))
+        server = next((s for s in self.servers.values() if s.uuid == ref or s.identifier == ref), None)
+        record_cache('servers', server is not None)
+        return server
+    
+    def sorted_servers(self) -> List[Server]:
+        return sorted(self.servers.values(), key=lambda s: s.id)
+    
+    def upsert_server(self, server: Server, stamp: bool = True):
+        self._unlink_owner(self.servers.get(server.id))
+        self._store_server(server)
+        if stamp:
+            self.server_changed_at[server.id] = time.monotonic()
+    
+    def update_server(self, server_id: int, stamp: bool = True, **changes) -> Optional[Server]:
+        """Apply field changes to a cached server, e.g. after a successful suspend"""
+        server = self.servers.get(server_id)
+        if server is None:
+            return None
+        self._unlink_owner(server)
+        if stamp:
+            self.server_changed_at[server_id] = time.monotonic()
+        return self._store_server(dataclasses.replace(server, **changes))
+    
+    def remove_server(self, server_id: int, stamp: bool = True) -> Optional[Server]:
+        server = self.servers.pop(server_id, None)
+        self._unlink_owner(server)
+        if stamp:
+            self.server_changed_at[server_id] = time.monotonic()
+        return server
+    
+    def _store_server(self, server: Server) -> Server:
+        if server.owner_discord_id is None:
+            # Not fetched with ``include=user``; fall back to the cached owner account
+            owner = self.users.get(server.user)
+            if owner is not None and owner.discord_id is not None:
+                server = dataclasses.replace(server, owner_discord_id=owner.discord_id)
+        self.servers[server.id] = server
+        if server.owner_discord_id is not None:
+            self.servers_by_owner.setdefault(server.owner_discord_id, set()).add(server.id)
+        return server
+    
+    def _unlink_owner(self, server: Optional[Server]):
+        if server is None or server.owner_discord_id is None:
+            return
+        owned = self.servers_by_owner.get(server.owner_discord_id)
+        if owned is not None:
+            owned.discard(server.id)
+            if not owned:
+                del self.servers_by_owner[server.owner_discord_id]
+    
+    def changed_since(self, kind: str, record_id: int, since: float) -> bool:
+        """Whether a server or user was written or removed locally after ``since`` (monotonic)"""
+        stamps = self.server_changed_at if kind == 'server' else self.user_changed_at
+        return stamps.get(record_id, 0.0) > since
+    
+    def forget_changes(self, before: float):
+        """Drop modification stamps no listing can still be older than"""
+        for stamps in (self.server_changed_at, self.user_changed_at):
+            for record_id in [record_id for record_id, at in stamps.items() if at <= before]:
+                del stamps[record_id]
+    
+    # ==================== OWNERSHIP ====================
+    
+    def owner_of(self, server_id: int) -> Optional[int]:
+        """Discord ID of the server's owner, if the owner's panel account is linked"""
+        server = self.get_server(server_id)
+        return server.owner_discord_id if server else None
+    
+    def servers_for_owner(self, discord_id: int) -> List[Server]:
+        """Servers owned by a Discord user, sorted by ID"""
+        owned = self.servers_by_owner.get(discord_id, ())
+        return sorted((self.servers[server_id] for server_id in owned), key=lambda s: s.id)
+    
+    def servers_on_node(self, node_id: int) -> List[Server]:
+        return [server for server in self.servers.values() if server.node == node_id]
+    
+    # ==================== USERS ====================
+    
+    def get_user(self, user_id: int) -> Optional[User]:
+        user = self.users.get(user_id)
+        record_cache('users', user is not None)
+        return user
+    
+    def get_user_by_discord_id(self, discord_id: int) -> Optional[User]:
+        user_id = self.users_by_discord.get(discord_id)
+        record_cache('users', user_id is not None)
+        return self.users.get(user_id) if user_id is not None else None
+    
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        user_id = self.users_by_email.get(email.lower())
+        record_cache('users', user_id is not None)
+        return self.users.get(user_id) if user_id is not None else None
+    
+    def search_users(self, query: str, limit: Optional[int] = None) -> List[User]:
+        needle = query.lower()
+        matches = []
+        for user in self.users.values():
+            if needle in user.email.lower() or needle in user.username.lower():
+                matches.append(user)
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+    
+    def upsert_user(self, user: User, stamp: bool = True):
+        previous = self.users.get(user.id)
+        if previous is not None and previous.email.lower() != user.email.lower():
+            self.users_by_email.pop(previous.email.lower(), None)
+        if previous is not None and previous.discord_id is not None:
+            self.users_by_discord.pop(previous.discord_id, None)
+        self.users[user.id] = user
+        if stamp:
+            self.user_changed_at[user.id] = time.monotonic()
+        self.users_by_email[user.email.lower()] = user.id
+        if user.discord_id is not None:
+            self.users_by_discord[user.discord_id] = user.id
+        if previous is not None and previous.discord_id != user.discord_id:
+            # Account was (re)linked; move its servers to the new owner
+            for server in [s for s in self.servers.values() if s.user == user.id]:
+                self.update_server(server.id, stamp=stamp, owner_discord_id=user.discord_id)
+    
+    def remove_user(self, user_id: int, stamp: bool = True) -> Optional[User]:
+        user = self.users.pop(user_id, None)
+        if stamp:
+            self.user_changed_at[user_id] = time.monotonic()
+        if user is not None:
+            self.users_by_email.pop(user.email.lower(), None)
+            if user.discord_id is not None:
+                self.users_by_discord.pop(user.discord_id, None)
+            for server_id in [s.id for s in self.servers.values() if s.user == user_id]:
+                self.remove_server(server_id, stamp=stamp)
+        return user
+    
+    # ==================== NODES ====================
+    
+    def get_node(self, node_id: int) -> Optional[Node]:
+        node = self.nodes.get(node_id)
+        record_cache('nodes', node is not None)
+        return node
+    
+    def upsert_nodes(self, nodes: Iterable[Node]):
+        for node in nodes:
+            self.nodes[node.id] = node
@@ -0,0 +1,204 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+# Fastest available JSON decoder (msgspec, then orjson, then stdlib); all accept raw response bytes
+try:
+    import msgspec
+    json_loads: Callable[[bytes], Any] = msgspec.json.Decoder().decode
+    JSON_BACKEND = 'msgspec'
+except ImportError:
+    try:
+        import orjson
+        json_loads = orjson.loads
+        JSON_BACKEND = 'orjson'
+    except ImportError:
+        json_loads = json.loads
+        JSON_BACKEND = 'json'
+
+T = TypeVar('T')
+
+def _suspended(attrs: Dict) -> bool:
+    # Panel 1.x reports `status`, 0.7 used a `suspended` flag
+    return bool(attrs.get('suspended')) or attrs.get('status') == 'suspended'
+
+def parse_discord_id(external_id: Optional[str]) -> Optional[int]:
+    """Discord user ID stored in a panel user's ``external_id``, if it holds one"""
+    if external_id and external_id.isdigit():
+        return int(external_id)
+    return None
+
+def _owner_discord_id(attrs: Dict) -> Optional[int]:
+    # Present when the server was fetched with ``?include=user``
+    owner = ((attrs.get('relationships') or {}).get('user') or {}).get('attributes') or {}
+    return parse_discord_id(owner.get('external_id'))
+
+@dataclass(frozen=True, slots=True)
+class Server:
+    """Compact server record holding only the fields the bot uses"""
+    id: int
+    uuid: str
+    identifier: str
+    name: str
+    suspended: bool
+    user: int
+    node: int
+    allocation: int
+    egg: int
+    memory: int
+    swap: int
+    disk: int
+    io: int
+    cpu: int
+    threads: Optional[str]
+    databases: int
+    allocations: int
+    backups: int
+    updated_at: Optional[str]
+    owner_discord_id: Optional[int] = None
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'Server':
+        limits = attrs.get('limits') or {}
+        features = attrs.get('feature_limits') or {}
+        return cls(
+            attrs['id'], attrs['uuid'], attrs.get('identifier') or attrs['uuid'][:8], attrs['name'],
+            _suspended(attrs), attrs.get('user', 0), attrs.get('node', 0), attrs.get('allocation', 0),
+            attrs.get('egg', 0), limits.get('memory', 0), limits.get('swap', 0), limits.get('disk', 0),
+            limits.get('io', 500), limits.get('cpu', 0), limits.get('threads'),
+            features.get('databases') or 0, features.get('allocations') or 0, features.get('backups') or 0,
+            attrs.get('updated_at'), _owner_discord_id(attrs)
+        )
+
+@dataclass(frozen=True, slots=True)
+class User:
+    """Compact panel user record"""
+    id: int
+    uuid: str
+    username: str
+    email: str
+    first_name: str
+    last_name: str
+    root_admin: bool
+    two_factor: bool
+    external_id: Optional[str]
+    updated_at: Optional[str]
+    
+    @property
+    def discord_id(self) -> Optional[int]:
+        return parse_discord_id(self.external_id)
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'User':
+        return cls(
+            attrs['id'], attrs.get('uuid', ''), attrs['username'], attrs['email'],
+            attrs.get('first_name', ''), attrs.get('last_name', ''), bool(attrs.get('root_admin')),
+            bool(attrs.get('2fa')), attrs.get('external_id'), attrs.get('updated_at')
+        )
+
+@dataclass(frozen=True, slots=True)
+class Node:
+    """Compact node record"""
+    id: int
+    name: str
+    fqdn: str
+    scheme: str
+    daemon_listen: int
+    location_id: int
+    memory: int
+    memory_overallocate: int
+    disk: int
+    disk_overallocate: int
+    maintenance_mode: bool
+    updated_at: Optional[str]
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'Node':
+        return cls(
+            attrs['id'], attrs['name'], attrs.get('fqdn', ''), attrs.get('scheme', 'https'),
+            attrs.get('daemon_listen', 8080), attrs.get('location_id', 0), attrs.get('memory', 0),
+            attrs.get('memory_overallocate', 0), attrs.get('disk', 0), attrs.get('disk_overallocate', 0),
+            bool(attrs.get('maintenance_mode')), attrs.get('updated_at')
+        )
+
+@dataclass(frozen=True, slots=True)
+class Egg:
+    """Compact egg record"""
+    id: int
+    nest: int
+    name: str
+    author: str
+    docker_image: str
+    startup: str
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'Egg':
+        return cls(
+            attrs['id'], attrs.get('nest', 0), attrs['name'], attrs.get('author', ''),
+            attrs.get('docker_image', ''), attrs.get('startup', '')
+        )
+
+@dataclass(frozen=True, slots=True)
+class Allocation:
+    """Compact node allocation record"""
+    id: int
+    ip: str
+    port: int
+    alias: Optional[str]
+    assigned: bool
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'Allocation':
+        return cls(attrs['id'], attrs['ip'], attrs['port'], attrs.get('alias'), bool(attrs.get('assigned')))
+
+@dataclass(frozen=True, slots=True)
+class Backup:
+    """Compact client API backup record"""
+    uuid: str
+    name: str
+    bytes: int
+    is_successful: bool
+    is_locked: bool
+    created_at: Optional[str]
+    completed_at: Optional[str]
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'Backup':
+        return cls(
+            attrs['uuid'], attrs.get('name', ''), attrs.get('bytes') or 0, bool(attrs.get('is_successful')),
+            bool(attrs.get('is_locked')), attrs.get('created_at'), attrs.get('completed_at')
+        )
+
+@dataclass(frozen=True, slots=True)
+class ResourceUsage:
+    """Live client API resource sample of one server"""
+    state: str
+    is_suspended: bool
+    memory_bytes: int
+    cpu_absolute: float
+    disk_bytes: int
+    network_rx_bytes: int
+    network_tx_bytes: int
+    uptime: int
+    
+    @property
+    def network_bytes(self) -> int:
+        return self.network_rx_bytes + self.network_tx_bytes
+    
+    @classmethod
+    def from_attributes(cls, attrs: Dict) -> 'ResourceUsage':
+        res = attrs.get('resources') or {}
+        return cls(
+            attrs.get('current_state', 'offline'), bool(attrs.get('is_suspended')), res.get('memory_bytes') or 0,
+            res.get('cpu_absolute') or 0.0, res.get('disk_bytes') or 0, res.get('network_rx_bytes') or 0,
+            res.get('network_tx_bytes') or 0, res.get('uptime') or 0
+        )
+
+def parse_item(payload: Dict, model: Type[T]) -> T:
+    """Convert a single ``{'object': ..., 'attributes': ...}`` payload"""
+    return model.from_attributes(payload['attributes'])
+
+def parse_list(payload: Dict, model: Type[T]) -> List[T]:
+    """Convert a JSON:API list payload into model instances"""
+    from_attributes = model.from_attributes
+    return [from_attributes(item['attributes']) for item in payload.get('data', ())]
@@ -0,0 +1,179 @@
+import os
+import asyncio
+import discord
+import dataclasses
+from discord import app_commands
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from utils.api import PterodactylAPI
+from utils.events import EventBus, LimitsChanged
+from utils.index import PanelIndex
+from utils.models import Server, User, parse_item
+
+@dataclass
+class PanelContext:
+    """Everything bound to one Pterodactyl panel: its pooled API client and its caches"""
+    name: str
+    url: str
+    api: PterodactylAPI
+    index: PanelIndex
+    node_health: Optional[object] = None
+    backups: Optional[object] = None
+    power: Optional[object] = None
+    
+    async def update_build(self, events: EventBus, before: Server, ram: Optional[int] = None,
+                           cpu: Optional[int] = None, disk: Optional[int] = None,
+                           actor: Optional[discord.abc.User] = None,
+                           recipient: Optional[discord.abc.User] = None) -> Dict:
+        """
+        Change a server's RAM, CPU and/or disk starting from ``before``; on
+        success the index is updated and ``LimitsChanged`` is published. Shared
+        by ``/set_resources`` and the /manage resources form.
+        """
+        result = await self.api.update_server_build(before.id, ram=ram, cpu=cpu, disk=disk, current=before)
+        if not result['success']:
+            return result
+        
+        if result.get('data'):
+            after = dataclasses.replace(parse_item(result['data'], Server), owner_discord_id=before.owner_discord_id)
+        else:
+            # Empty body: the panel accepted the build that was sent
+            after = dataclasses.replace(
+                before,
+                memory=ram if ram is not None else before.memory,
+                cpu=cpu if cpu is not None else before.cpu,
+                disk=disk if disk is not None else before.disk
+            )
+        # Right away rather than when the event is handled, so the next update builds on it
+        self.index.upsert_server(after)
+        events.publish(LimitsChanged(before, after, source='command', actor=actor, recipient=recipient, panel=self.name))
+        return result
+
+class PanelRegistry:
+    """
+    The panels this bot manages. Commands that take a ``panel`` option resolve
+    it here; without one they act on the default panel, and searches fan out
+    to every panel concurrently.
+    """
+    
+    def __init__(self, panels: List[PanelContext], default: Optional[str] = None):
+        if not panels:
+            raise ValueError("At least one panel must be configured")
+        self.panels: Dict[str, PanelContext] = {panel.name: panel for panel in panels}
+        self.default = self.panels.get(default) if default else panels[0]
+        if self.default is None:
+            raise ValueError(f"Default panel '{default}' is not configured")
+    
+    @classmethod
+    def from_env(cls) -> 'PanelRegistry':
+        """
+        ``PANELS=eu,us`` reads ``PANEL_EU_URL``, ``PANEL_EU_APP_KEY``,
+        ``PANEL_EU_CLIENT_KEY`` and optionally ``PANEL_EU_RATE`` for each name.
+        Without ``PANELS``, one panel is built from ``PANEL_URL``,
+        ``APP_API_KEY`` and ``CLIENT_API_KEY``.
+        """
+        rate = float(os.getenv('PANEL_RATE_LIMIT', '0'))
+        connections = int(os.getenv('PANEL_CONNECTIONS', '20'))
+        ttl = float(os.getenv('INDEX_REFRESH_SECONDS', '300'))
+        
+        names = [name.strip() for name in os.getenv('PANELS', '').split(',') if name.strip()]
+        if names:
+            configs = [
+                (
+                    name,
+                    os.getenv(f'PANEL_{name.upper()}_URL', ''),
+                    os.getenv(f'PANEL_{name.upper()}_APP_KEY', ''),
+                    os.getenv(f'PANEL_{name.upper()}_CLIENT_KEY', ''),
+                    float(os.getenv(f'PANEL_{name.upper()}_RATE', str(rate)))
+                )
+                for name in names
+            ]
+        else:
+            configs = [(
+                os.getenv('PANEL_NAME', 'main'),
+                os.getenv('PANEL_URL', ''),
+                os.getenv('APP_API_KEY', ''),
+                os.getenv('CLIENT_API_KEY', ''),
+                rate
+            )]
+        
+        panels = []
+        for name, url, app_key, client_key, panel_rate in configs:
+            api = PterodactylAPI(url, app_key, client_key, name=name, rate=panel_rate, connections=connections)
+            panels.append(PanelContext(name, url.rstrip('/'), api, PanelIndex(api, ttl=ttl)))
+        return cls(panels, os.getenv('DEFAULT_PANEL') or None)
+    
+    def __iter__(self):
+        return iter(self.panels.values())
+    
+    def __len__(self) -> int:
+        return len(self.panels)
+    
+    def get(self, name: Optional[str]) -> Optional[PanelContext]:
+        """Panel by name; the default panel for None"""
+        return self.default if name is None else self.panels.get(name)
+    
+    def missing_credentials(self) -> List[str]:
+        return [panel.name for panel in self if not panel.url or not panel.api.app_key]
+    
+    # ==================== CROSS-PANEL SEARCH ====================
+    
+    async def _fan_out(self, panels: Optional[List[PanelContext]], search) -> Tuple[list, List[str]]:
+        """Run ``search(panel)`` on every panel at once; returns (merged results, panels that failed)"""
+        panels = panels or list(self)
+        
+        async def run(panel: PanelContext):
+            if not await panel.index.ensure_loaded():
+                return panel, None
+            return panel, search(panel)
+        
+        results, failed = [], []
+        for panel, matches in await asyncio.gather(*(run(panel) for panel in panels)):
+            if matches is None:
+                failed.append(panel.name)
+            else:
+                results.extend((panel, match) for match in matches)
+        return results, failed
+    
+    async def search_servers(self, query: str, panels: Optional[List[PanelContext]] = None,
+                             limit: Optional[int] = None) -> Tuple[List[Tuple[PanelContext, Server]], List[str]]:
+        """Servers matching ``query`` on each panel, merged by name"""
+        results, failed = await self._fan_out(panels, lambda panel: panel.index.search_servers(query, limit))
+        results.sort(key=lambda item: (item[1].name.lower(), item[0].name, item[1].id))
+        return results[:limit] if limit else results, failed
+    
+    async def search_users(self, query: str, panels: Optional[List[PanelContext]] = None,
+                           limit: Optional[int] = None) -> Tuple[List[Tuple[PanelContext, User]], List[str]]:
+        """Users whose email or username contains ``query`` on each panel, exact email matches first"""
+        needle = query.lower()
+        results, failed = await self._fan_out(panels, lambda panel: panel.index.search_users(query, limit))
+        results.sort(key=lambda item: (item[1].email.lower() != needle, item[1].username.lower(), item[0].name))
+        return results[:limit] if limit else results, failed
+    
+    async def servers_for_owner(self, discord_id: int) -> Tuple[List[Tuple[PanelContext, Server]], List[str]]:
+        """A Discord user's servers across every panel"""
+        return await self._fan_out(None, lambda panel: panel.index.servers_for_owner(discord_id))
+    
+    async def close(self):
+        await asyncio.gather(*(panel.api.close() for panel in self))
+
+# ==================== COMMAND OPTION ====================
+
+class PanelTransformer(app_commands.Transformer):
+    """``panel`` command option: autocompletes configured panel names and resolves to a PanelContext"""
+    
+    async def transform(self, interaction: discord.Interaction, value: str) -> PanelContext:
+        panel = interaction.client.panels.get(value)
+        if panel is None:
+            raise app_commands.TransformerError(value, self.type, self)
+        return panel
+    
+    async def autocomplete(self, interaction: discord.Interaction, value: str) -> List[app_commands.Choice[str]]:
+        needle = value.lower()
+        return [
+            app_commands.Choice(name=f"{panel.name} ({panel.url})"[:100], value=panel.name)
+            for panel in interaction.client.panels
+            if needle in panel.name.lower() or needle in panel.url.lower()
+        ][:25]
+
+PanelOption = app_commands.Transform[PanelContext, PanelTransformer]
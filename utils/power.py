@@ -0,0 +1,98 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from utils.api import PterodactylAPI
+from utils.concurrency import KeyedLimiter, Spacer
+from utils.metrics import REGISTRY
+from utils.models import Server
+
+POWER_ACTIONS = REGISTRY.counter(
+    'bot_power_actions_total',
+    'Power signals sent by the bot by signal and result',
+    ('signal', 'result')
+)
+
+POWER_SIGNALS = ('start', 'stop', 'restart', 'kill')
+
+# Signals that boot a server and hit the node's disk hard, so they're staggered per node
+STAGGERED_SIGNALS = ('start', 'restart')
+
+@dataclass
+class PowerResult:
+    """Outcome of sending a power signal to one server"""
+    server: Server
+    success: bool
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+@dataclass
+class PowerReport:
+    """Summary of a power fan-out"""
+    signal: str
+    results: List[PowerResult] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float = 0.0
+    peak_per_node: Dict[int, int] = field(default_factory=dict)
+    
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+    
+    @property
+    def succeeded(self) -> List[PowerResult]:
+        return [r for r in self.results if r.success]
+    
+    @property
+    def failed(self) -> List[PowerResult]:
+        return [r for r in self.results if not r.success]
+
+class PowerExecutor:
+    """
+    Sends a power signal to many servers: at most ``concurrency`` requests at
+    once and ``per_node`` per node, and for starts/restarts successive
+    servers on the same node are spaced ``stagger`` seconds apart so a node
+    doesn't boot all of its servers at the same moment
+    """
+    
+    def __init__(self, api: PterodactylAPI, concurrency: int = 10, per_node: int = 4, stagger: float = 2.0):
+        self.api = api
+        self.concurrency = concurrency
+        self.per_node = per_node
+        self.stagger = stagger
+    
+    async def run(self, servers: List[Server], signal: str) -> PowerReport:
+        """Send ``signal`` to every server; returns once each has succeeded or failed"""
+        if signal not in POWER_SIGNALS:
+            raise ValueError(f"Signal must be one of {', '.join(POWER_SIGNALS)}")
+        limiter = KeyedLimiter(self.per_node, self.concurrency)
+        staggers: Dict[int, Spacer] = {}
+        report = PowerReport(signal)
+        
+        async def send(server: Server):
+            async with limiter.slot(server.node):
+                # Spaced once the slot is held: a token taken while waiting for the slot
+                # would be spent in a burst when several slots free up together
+                if signal in STAGGERED_SIGNALS and self.stagger > 0:
+                    stagger = staggers.get(server.node)
+                    if stagger is None:
+                        stagger = staggers[server.node] = Spacer(self.stagger)
+                    await stagger.acquire()
+                result = await self.send(server, signal)
+            report.results.append(result)
+        
+        try:
+            await asyncio.gather(*(send(server) for server in servers))
+        finally:
+            report.finished_at = time.perf_counter()
+            report.peak_per_node = dict(limiter.peak)
+        return report
+    
+    async def send(self, server: Server, signal: str) -> PowerResult:
+        start = time.perf_counter()
+        if server.suspended:
+            POWER_ACTIONS.inc(signal=signal, result='skipped')
+            return PowerResult(server, False, "Server is suspended")
+        result = await self.api.send_power_action(server.uuid, signal)
+        POWER_ACTIONS.inc(signal=signal, result='success' if result['success'] else 'failed')
+        return PowerResult(server, result['success'], result.get('error'), time.perf_counter() - start)
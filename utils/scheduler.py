@@ -0,0 +1,452 @@
+import os
+import time
+import json
+import heapq
+import sqlite3
+import asyncio
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from utils.metrics import REGISTRY
+
+JOB_RUNS = REGISTRY.counter(
+    'bot_job_runs_total',
+    'Scheduled job executions by handler and status',
+    ('handler', 'status')
+)
+
+JOB_DURATION = REGISTRY.histogram(
+    'bot_job_duration_seconds',
+    'Scheduled job runtime',
+    ('handler',)
+)
+
+JOB_DELAY = REGISTRY.histogram(
+    'bot_job_start_delay_seconds',
+    'How late scheduled jobs started compared to their due time',
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 30, 60, 300, 3600)
+)
+
+SCHEDULED_JOBS = REGISTRY.gauge(
+    'bot_scheduled_jobs',
+    'Jobs currently in the schedule'
+)
+
+CATCH_UP_POLICIES = ('skip', 'once', 'all')
+
+# ==================== CRON ====================
+
+# Day-of-week accepts 0-7; both 0 and 7 are Sunday
+_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *'
+}
+
+def _parse_field(spec: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in spec.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Invalid step in '{spec}'")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"'{spec}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronExpression:
+    """Standard 5-field cron expression (minute hour day-of-month month day-of-week), evaluated in UTC"""
+    
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = _ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError("Cron expressions need 5 fields: minute hour day month weekday")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(spec, low, high) for spec, (low, high) in zip(fields, _FIELD_RANGES)
+        )
+        # Mapped after range expansion so '5-7' stays Friday to Sunday
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+    
+    def _day_matches(self, moment: datetime) -> bool:
+        weekday = (moment.weekday() + 1) % 7
+        if self._any_day or self._any_weekday:
+            return moment.day in self.days and weekday in self.weekdays
+        # Like cron: when both are restricted, either may match
+        return moment.day in self.days or weekday in self.weekdays
+    
+    def next_after(self, timestamp: float) -> float:
+        """First matching minute strictly after ``timestamp``"""
+        moment = datetime.fromtimestamp(timestamp, timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment.timestamp()
+        raise ValueError(f"'{self.expression}' never matches")
+
+# ==================== JOBS ====================
+
+@dataclass
+class Job:
+    """One scheduled job as stored in the job table"""
+    id: str
+    handler: str
+    trigger: str
+    spec: str
+    payload: Dict[str, Any]
+    next_run: Optional[float]
+    catch_up: str = 'once'
+    last_run: Optional[float] = None
+    last_status: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    
+    @property
+    def is_cron(self) -> bool:
+        return self.trigger == 'cron'
+
+Handler = Callable[[Job], Awaitable[Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    handler TEXT NOT NULL,
+    trigger TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    next_run REAL,
+    catch_up TEXT NOT NULL,
+    last_run REAL,
+    last_status TEXT,
+    runs INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+class JobStore:
+    """
+    SQLite job table; every call runs in a worker thread so the event loop
+    never blocks on disk. Worker threads share one connection, so calls are
+    serialised with a lock.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+    
+    def _load(self) -> List[Job]:
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT id, handler, trigger, spec, payload, next_run, catch_up, last_run, last_status, runs, failures FROM jobs'
+            ).fetchall()
+            return [Job(r[0], r[1], r[2], r[3], json.loads(r[4]), *r[5:]) for r in rows]
+    
+    def _save(self, job: Job):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job.id, job.handler, job.trigger, job.spec, json.dumps(job.payload), job.next_run,
+                 job.catch_up, job.last_run, job.last_status, job.runs, job.failures)
+            )
+            conn.commit()
+    
+    def _delete(self, job_id: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            conn.commit()
+    
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    async def load(self) -> List[Job]:
+        return await asyncio.to_thread(self._load)
+    
+    async def save(self, job: Job):
+        await asyncio.to_thread(self._save, job)
+    
+    async def delete(self, job_id: str):
+        await asyncio.to_thread(self._delete, job_id)
+    
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+class Scheduler:
+    """
+    Persistent job scheduler: jobs live in SQLite, due times in an in-memory
+    min-heap, and at most ``max_workers`` jobs run at once. Cogs register
+    handlers by name and schedule cron or one-shot jobs against them.
+    
+    Missed runs (bot offline when a job was due) follow the job's catch-up
+    policy: ``skip`` moves on to the next run (dropping a one-shot job),
+    ``once`` runs it once, ``all`` replays every missed cron occurrence (up to
+    ``max_catch_up``). Jobs whose handler isn't registered stay stored and
+    untouched until it is.
+    """
+    
+    def __init__(self, path: str, max_workers: int = 4, max_catch_up: int = 50):
+        self.store = JobStore(path)
+        self.max_workers = max_workers
+        self.max_catch_up = max_catch_up
+        self.handlers: Dict[str, Handler] = {}
+        self.jobs: Dict[str, Job] = {}
+        self.running: Set[str] = set()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._latest: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._workers = asyncio.Semaphore(max_workers)
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        SCHEDULED_JOBS.set_function(lambda: len(self.jobs))
+    
+    def register(self, name: str, handler: Handler):
+        """Make ``handler`` available to jobs under ``name``"""
+        missing = name not in self.handlers
+        self.handlers[name] = handler
+        if missing and self._task is not None:
+            # Cogs register from __init__, so held-back jobs are re-admitted in a task
+            task = asyncio.create_task(self._readmit(name))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _readmit(self, name: str):
+        """Queue jobs held back while their handler was missing"""
+        now = time.time()
+        for job in [job for job in self.jobs.values() if job.handler == name]:
+            await self._admit(job, now)
+    
+    # ==================== SCHEDULING ====================
+    
+    async def schedule_cron(self, job_id: str, handler: str, expression: str,
+                            payload: Optional[Dict] = None, catch_up: str = 'once') -> Job:
+        """Create or replace a recurring job"""
+        cron = CronExpression(expression)
+        return await self._add(Job(job_id, handler, 'cron', cron.expression, payload or {},
+                                   cron.next_after(time.time()), catch_up))
+    
+    async def schedule_once(self, job_id: str, handler: str, run_at: float,
+                            payload: Optional[Dict] = None, catch_up: str = 'once') -> Job:
+        """Create or replace a job that runs once at ``run_at`` (Unix time) and is then removed"""
+        return await self._add(Job(job_id, handler, 'once', str(run_at), payload or {}, run_at, catch_up))
+    
+    async def _add(self, job: Job) -> Job:
+        if job.handler not in self.handlers:
+            raise ValueError(f"No handler registered as '{job.handler}'")
+        if job.catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Catch-up policy must be one of {', '.join(CATCH_UP_POLICIES)}")
+        await self.store.save(job)
+        self.jobs[job.id] = job
+        self._push(job)
+        return job
+    
+    async def cancel(self, job_id: str) -> bool:
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        self._latest.pop(job_id, None)
+        # Its heap entry is dropped lazily when it comes up
+        await self.store.delete(job_id)
+        return True
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+    
+    def list_jobs(self, handler: Optional[str] = None) -> List[Job]:
+        jobs = [job for job in self.jobs.values() if handler is None or job.handler == handler]
+        return sorted(jobs, key=lambda job: job.next_run or float('inf'))
+    
+    def _push(self, job: Job):
+        if job.next_run is None:
+            return
+        self._seq += 1
+        # Only the newest entry per job is live; older ones are skipped when popped
+        self._latest[job.id] = self._seq
+        heapq.heappush(self._heap, (job.next_run, self._seq, job.id))
+        self._wakeup.set()
+    
+    # ==================== LIFECYCLE ====================
+    
+    async def start(self, dispatch: bool = True):
+        """Load persisted jobs and, with ``dispatch``, start running them"""
+        for job in await self.store.load():
+            self.jobs[job.id] = job
+        if dispatch:
+            await self.resume()
+    
+    async def resume(self):
+        """Start dispatching; overdue jobs follow their catch-up policy"""
+        if self._task is not None:
+            return
+        now = time.time()
+        for job in list(self.jobs.values()):
+            await self._admit(job, now)
+        self._task = asyncio.create_task(self._run())
+    
+    async def pause(self):
+        """Stop dispatching; jobs already running carry on"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def sync(self):
+        """Adopt jobs that another process sharing the job table added, replaced or cancelled"""
+        stored = {job.id: job for job in await self.store.load()}
+        for job_id in [job_id for job_id in self.jobs if job_id not in stored and job_id not in self.running]:
+            del self.jobs[job_id]
+            self._latest.pop(job_id, None)
+        for job in stored.values():
+            current = self.jobs.get(job.id)
+            if current is None or (current.handler, current.spec, current.payload, current.catch_up) != (
+                job.handler, job.spec, job.payload, job.catch_up
+            ):
+                self.jobs[job.id] = job
+                self._push(job)
+            elif self._task is None:
+                # Not dispatching here, so the stored run times are the ones to show
+                current.next_run, current.last_run, current.last_status = job.next_run, job.last_run, job.last_status
+                current.runs, current.failures = job.runs, job.failures
+    
+    async def stop(self, timeout: float = 10):
+        """Stop dispatching and give running jobs ``timeout`` seconds to finish"""
+        await self.pause()
+        if self._inflight:
+            await asyncio.wait(self._inflight, timeout=timeout)
+        await self.store.close()
+    
+    async def _admit(self, job: Job, now: float):
+        """Queue ``job``, applying its catch-up policy if it's overdue"""
+        if job.handler not in self.handlers:
+            # Left as stored; register() admits it, catch-up included
+            print(f"Scheduled job {job.id} has no handler '{job.handler}'; leaving it in place")
+            return
+        if job.next_run is not None and job.next_run < now:
+            await self._catch_up(job, now)
+        if job.id in self.jobs:
+            self._push(job)
+    
+    async def _catch_up(self, job: Job, now: float):
+        if job.catch_up == 'skip':
+            if job.is_cron:
+                job.next_run = CronExpression(job.spec).next_after(now)
+                await self.store.save(job)
+            else:
+                # A one-shot job's only run was missed
+                del self.jobs[job.id]
+                self._latest.pop(job.id, None)
+                await self.store.delete(job.id)
+            return
+        if job.catch_up == 'all' and job.is_cron:
+            cron = CronExpression(job.spec)
+            missed, due = 0, job.next_run
+            while due < now and missed < self.max_catch_up:
+                missed += 1
+                due = cron.next_after(due)
+            # The first missed run is dispatched from the heap; replay the rest here
+            for _ in range(missed - 1):
+                self._spawn(job, job.next_run, advance=False)
+        # 'once' (and the first of 'all') runs as soon as the loop starts
+    
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, seq, job_id = heapq.heappop(self._heap)
+                job = self.jobs.get(job_id)
+                if job is None or self._latest.get(job_id) != seq:
+                    # Cancelled or rescheduled since this entry was pushed
+                    continue
+                self._spawn(job, due)
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _spawn(self, job: Job, due: float, advance: bool = True):
+        task = asyncio.create_task(self._execute(job, due, advance))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+    
+    async def _execute(self, job: Job, due: float, advance: bool):
+        if job.handler not in self.handlers:
+            # Not run, advanced or deleted; register() queues it again
+            print(f"Scheduled job {job.id} has no handler '{job.handler}'; leaving it in place")
+            return
+        if advance:
+            # Reserve the next slot before running so a slow job can't be dispatched twice
+            job.next_run = CronExpression(job.spec).next_after(max(time.time(), due)) if job.is_cron else None
+            if job.next_run is not None:
+                self._push(job)
+        
+        async with self._workers:
+            handler = self.handlers[job.handler]
+            JOB_DELAY.observe(max(0.0, time.time() - due))
+            start = time.perf_counter()
+            self.running.add(job.id)
+            try:
+                await handler(job)
+                job.last_status = 'ok'
+            except Exception as e:
+                job.last_status = f'error: {e}'[:200]
+                job.failures += 1
+                print(f"Scheduled job {job.id} failed: {e}")
+            finally:
+                self.running.discard(job.id)
+                elapsed = time.perf_counter() - start
+                JOB_DURATION.observe(elapsed, handler=job.handler)
+                JOB_RUNS.inc(handler=job.handler, status='ok' if job.last_status == 'ok' else 'error')
+                job.runs += 1
+                job.last_run = time.time()
+        
+        if job.next_run is None and not job.is_cron and self.jobs.get(job.id) is job:
+            # One-shot jobs are removed once they've run
+            del self.jobs[job.id]
+            await self.store.delete(job.id)
+        elif self.jobs.get(job.id) is job:
+            await self.store.save(job)
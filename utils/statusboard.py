@@ -0,0 +1,176 @@
+import time
+import math
+import asyncio
+import discord
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from utils.embeds import EmbedBuilder
+from utils.events import Event
+from utils.metrics import REGISTRY, QUEUE_DEPTH, PANEL_LATENCY
+
+STATUS_EDITS = REGISTRY.counter(
+    'bot_status_board_edits_total',
+    'Status board refreshes by outcome (edited, unchanged, failed)',
+    ('result',)
+)
+
+FOOTER = "Status board · updates automatically"
+
+@dataclass
+class StatusSnapshot:
+    """Everything the status board shows, gathered from local caches"""
+    panel_ok: bool
+    index_refreshed: Optional[int]
+    servers: int
+    suspended: int
+    users: int
+    expiring: int
+    nodes: List = field(default_factory=list)
+    running: Optional[int] = None
+    idle: Optional[int] = None
+    queues: Dict[str, int] = field(default_factory=dict)
+    api_latency_ms: Optional[float] = None
+    api_requests_per_min: float = 0.0
+    gateway_ms: Optional[float] = None
+    jobs: int = 0
+
+class StatusBoard:
+    """
+    Keeps one status message per channel up to date by editing it in place.
+    Refreshes happen every ``interval`` seconds and, coalesced, shortly after
+    lifecycle events; a message is never edited more often than every
+    ``min_edit_interval`` seconds, and not at all when nothing changed.
+    """
+    
+    def __init__(self, bot, channel_ids: List[int], interval: float = 60, min_edit_interval: float = 10):
+        self.bot = bot
+        self.channel_ids = channel_ids
+        self.interval = interval
+        self.min_edit_interval = min_edit_interval
+        self.messages: Dict[int, discord.Message] = {}
+        self._last_rendered: Dict[int, dict] = {}
+        self._last_edit = 0.0
+        self._latency_totals = PANEL_LATENCY.totals()
+        self._latency_at = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def request_update(self, *_):
+        """Ask for a refresh soon; many requests within the edit interval become one edit"""
+        self._wakeup.set()
+    
+    async def _on_event(self, event: Event):
+        self.request_update()
+    
+    # ==================== SNAPSHOT ====================
+    
+    def _api_stats(self):
+        """Mean panel API latency and request rate since the previous snapshot"""
+        count, total = PANEL_LATENCY.totals()
+        previous_count, previous_total = self._latency_totals
+        now = time.monotonic()
+        elapsed = max(now - self._latency_at, 1e-3)
+        self._latency_totals, self._latency_at = (count, total), now
+        requests = count - previous_count
+        latency = (total - previous_total) / requests * 1000 if requests else None
+        return latency, requests / elapsed * 60
+    
+    async def snapshot(self) -> StatusSnapshot:
+        index = self.bot.index
+        servers = index.servers.values()
+        idle = self.bot.idle
+        running = idle_count = None
+        if idle:
+            samples = [a.last for a in idle.activity.values() if a.last]
+            running = sum(1 for sample in samples if sample.state == 'running')
+            idle_count = len(idle.flagged())
+        latency, rate = self._api_stats()
+        return StatusSnapshot(
+            panel_ok=index.loaded,
+            # Wall-clock time of the last index load, rounded so it doesn't drift between renders
+            index_refreshed=round(time.time() - (time.monotonic() - index.refreshed_at)) if index.loaded else None,
+            servers=len(index.servers),
+            suspended=sum(1 for server in servers if server.suspended),
+            users=len(index.users),
+            expiring=len(self.bot.expiry.upcoming(86400)),
+            # Probes only nodes whose cached health has expired
+            nodes=await self.bot.node_health.check_all() if index.loaded else [],
+            running=running,
+            idle=idle_count,
+            queues={queue: int(QUEUE_DEPTH.get(queue=queue)) for queue in ('events', 'log', 'dm')},
+            api_latency_ms=latency,
+            api_requests_per_min=rate,
+            gateway_ms=None if math.isnan(self.bot.latency) else self.bot.latency * 1000,
+            jobs=len(self.bot.scheduler.jobs)
+        )
+    
+    # ==================== MESSAGES ====================
+    
+    async def _find_message(self, channel: discord.abc.Messageable) -> Optional[discord.Message]:
+        """Reuse the board this bot posted before a restart instead of posting a new one"""
+        async for message in channel.history(limit=50):
+            if message.author == self.bot.user and message.embeds and message.embeds[0].footer.text == FOOTER:
+                return message
+        return None
+    
+    async def _publish(self, channel_id: int, embed: discord.Embed):
+        rendered = embed.to_dict()
+        rendered.pop('timestamp', None)
+        if self._last_rendered.get(channel_id) == rendered and channel_id in self.messages:
+            STATUS_EDITS.inc(result='unchanged')
+            return
+        
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return
+        try:
+            message = self.messages.get(channel_id)
+            if message is None:
+                message = await self._find_message(channel)
+            if message is None:
+                message = await channel.send(embed=embed)
+            else:
+                message = await message.edit(embed=embed)
+            self.messages[channel_id] = message
+            self._last_rendered[channel_id] = rendered
+            STATUS_EDITS.inc(result='edited')
+        except discord.NotFound:
+            # Deleted by someone; post a new one next time
+            self.messages.pop(channel_id, None)
+            STATUS_EDITS.inc(result='failed')
+        except discord.HTTPException as e:
+            print(f"Failed to update status board in {channel_id}: {e}")
+            STATUS_EDITS.inc(result='failed')
+    
+    async def refresh(self):
+        embed = EmbedBuilder.status_board(await self.snapshot())
+        embed.set_footer(text=FOOTER)
+        await asyncio.gather(*(self._publish(channel_id, embed) for channel_id in self.channel_ids))
+        self._last_edit = time.monotonic()
+    
+    # ==================== LIFECYCLE ====================
+    
+    async def run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Status board refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+                # Coalesce: whatever else arrives before the edit interval is up rides along
+                await asyncio.sleep(max(0.0, self._last_edit + self.min_edit_interval - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+    
+    def start(self):
+        self.bot.events.subscribe(Event, self._on_event)
+        self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
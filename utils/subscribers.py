@@ -0,0 +1,190 @@
+import discord
+from typing import Optional
+from utils.embeds import EmbedBuilder
+from utils.events import (
+    EventBus, Event, ServerCreated, ServerDeleted, ServerSuspended, ServerUnsuspended,
+    LimitsChanged, ServerExpiring, UserCreated, UserDeleted
+)
+from utils.metrics import REGISTRY
+
+SERVER_LIFECYCLE = REGISTRY.counter(
+    'bot_server_lifecycle_total',
+    'Server lifecycle events by type and origin (bot command or panel)',
+    ('event', 'source')
+)
+
+SERVER_EVENTS = (ServerCreated, ServerDeleted, ServerSuspended, ServerUnsuspended, LimitsChanged)
+
+def _changed_limits(event: LimitsChanged) -> dict:
+    """RAM/CPU/disk values that changed, or all three when the previous build is unknown"""
+    before, after = event.before, event.after
+    changes = {
+        'ram': after.memory if after.memory != before.memory else None,
+        'cpu': after.cpu if after.cpu != before.cpu else None,
+        'disk': after.disk if after.disk != before.disk else None
+    }
+    if not any(changes.values()):
+        return {'ram': after.memory, 'cpu': after.cpu, 'disk': after.disk}
+    return changes
+
+def _panel(bot, event: Event):
+    """Panel the event happened on (the default panel when unset or no longer configured)"""
+    return bot.panels.get(getattr(event, 'panel', None)) or bot.panels.default
+
+class IndexUpdater:
+    """Applies the bot's own actions to the panel index (the change feed already applied panel-side ones)"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def __call__(self, event: Event):
+        if getattr(event, 'source', 'panel') == 'panel':
+            return
+        index = _panel(self.bot, event).index
+        if isinstance(event, ServerDeleted):
+            index.remove_server(event.server.id)
+        elif isinstance(event, SERVER_EVENTS):
+            index.upsert_server(event.server)
+        elif isinstance(event, UserDeleted):
+            index.remove_user(event.user.id)
+        elif isinstance(event, UserCreated):
+            index.upsert_user(event.user)
+
+class DMNotifier:
+    """
+    DMs the owner (or the admin-chosen recipient) about actions taken by the
+    bot. Runs alongside ``AuditLogger``; when a DM isn't delivered it logs a
+    separate "DM Status" line naming the server and the event.
+    """
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def _recipient(self, event: Event) -> Optional[discord.abc.User]:
+        if event.recipient:
+            return event.recipient
+        owner_id = event.server.owner_discord_id
+        if owner_id is None:
+            panel_user = _panel(self.bot, event).index.get_user(event.server.user)
+            owner_id = panel_user.discord_id if panel_user else None
+        if owner_id is None:
+            return None
+        return await self.bot.user_cache.get(owner_id)
+    
+    def _embed(self, event: Event) -> discord.Embed:
+        server = event.server
+        if isinstance(event, ServerCreated):
+            return EmbedBuilder.dm_server_created(
+                server_name=server.name,
+                server_id=str(server.id),
+                node=event.node_name or str(server.node),
+                ram=server.memory,
+                cpu=server.cpu,
+                disk=server.disk,
+                version=event.version or "N/A",
+                panel_url=_panel(self.bot, event).url,
+                username=event.username,
+                password=event.password
+            )
+        if isinstance(event, ServerDeleted):
+            return EmbedBuilder.dm_server_deleted(
+                server_id=str(server.id),
+                deleted_by=event.actor.mention if event.actor else "Panel administrator"
+            )
+        if isinstance(event, ServerSuspended):
+            return EmbedBuilder.dm_server_suspended(
+                server_id=str(server.id),
+                reason=event.reason or "Administrative action"
+            )
+        if isinstance(event, ServerUnsuspended):
+            return EmbedBuilder.dm_server_unsuspended(server_id=str(server.id))
+        if isinstance(event, ServerExpiring):
+            return EmbedBuilder.dm_server_expiring(
+                server_id=str(server.id),
+                server_name=server.name,
+                expires_at=event.expires_at,
+                suspend_at=event.suspend_at
+            )
+        return EmbedBuilder.dm_resources_updated(server_id=str(server.id), **_changed_limits(event))
+    
+    async def __call__(self, event: Event):
+        if getattr(event, 'source', 'panel') == 'panel' or not isinstance(event, SERVER_EVENTS + (ServerExpiring,)):
+            return
+        about = f"`{event.name}` for **{event.server.name}** (ID: {event.server.id})"
+        recipient = await self._recipient(event)
+        if recipient is None:
+            await self.bot.log_action(EmbedBuilder.warning(
+                "DM Status",
+                f"No Discord owner linked to this server, so nobody was notified of {about}"
+            ))
+            return
+        # A failed send is logged by send_user_dm, with the reason
+        await self.bot.send_user_dm(recipient, self._embed(event), about=about)
+
+class AuditLogger:
+    """
+    Writes every server lifecycle event and panel-side user change to the log channel
+    """
+    
+    ACTIONS = {
+        ServerCreated: 'created',
+        ServerDeleted: 'deleted',
+        ServerSuspended: 'suspended',
+        ServerUnsuspended: 'unsuspended',
+        LimitsChanged: 'updated'
+    }
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def __call__(self, event: Event):
+        if isinstance(event, (UserCreated, UserDeleted)):
+            if event.source == 'panel':
+                action = 'created' if isinstance(event, UserCreated) else 'deleted'
+                await self.bot.log_action(EmbedBuilder.info(
+                    f"Panel User {action.capitalize()}",
+                    f"**{event.user.username}** ({event.user.email}) was {action} on the panel"
+                ))
+            return
+        if not isinstance(event, SERVER_EVENTS):
+            return
+        
+        server = event.server
+        server_info = {'id': server.id, 'name': server.name}
+        if isinstance(event, ServerCreated):
+            server_info['resources'] = {'ram': server.memory, 'cpu': server.cpu, 'disk': server.disk}
+        elif isinstance(event, LimitsChanged):
+            server_info['resources'] = _changed_limits(event)
+        
+        if event.recipient:
+            user = event.recipient.mention
+        elif server.owner_discord_id:
+            user = f"<@{server.owner_discord_id}>"
+        else:
+            user = "Unknown"
+        
+        log_embed = EmbedBuilder.log_server_action(
+            action=self.ACTIONS[type(event)],
+            admin=event.actor.mention if event.actor else "Panel (outside the bot)",
+            user=user,
+            server_info=server_info
+        )
+        if len(self.bot.panels) > 1:
+            log_embed.add_field(name="🦖 Panel", value=_panel(self.bot, event).name, inline=True)
+        if isinstance(event, ServerSuspended) and event.reason:
+            log_embed.add_field(name="Reason", value=event.reason, inline=False)
+        await self.bot.log_action(log_embed)
+
+class LifecycleMetrics:
+    """Counts lifecycle events for the metrics endpoint"""
+    
+    async def __call__(self, event: Event):
+        if isinstance(event, SERVER_EVENTS):
+            SERVER_LIFECYCLE.inc(event=event.name, source=event.source)
+
+def register_subscribers(bot, bus: EventBus):
+    """Attach the standard lifecycle subscribers to ``bus``"""
+    bus.subscribe(Event, IndexUpdater(bot))
+    bus.subscribe(Event, DMNotifier(bot))
+    bus.subscribe(Event, AuditLogger(bot))
+    bus.subscribe(Event, LifecycleMetrics())
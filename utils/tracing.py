@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import contextvars
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+
+class Span:
+    """A timed unit of work inside a trace"""
+    __slots__ = ('name', 'trace', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes', 'status', '_token')
+    
+    def __init__(self, name: str, trace: 'Trace', parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = 'ok'
+        self._token = None
+    
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+    
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+    
+    def finish(self, status: Optional[str] = None):
+        """End the span; finishing the root span completes the trace"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if status:
+            self.status = status
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Finished from a different context (e.g. a completion event task)
+                pass
+            self._token = None
+        if self.parent_id is None:
+            self.trace.tracer._finish_trace(self.trace)
+    
+    def __enter__(self) -> 'Span':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.status = 'error'
+            self.attributes.setdefault('error', f"{exc_type.__name__}: {exc}")
+        self.finish()
+        return False
+
+class Trace:
+    """All spans recorded under one root span"""
+    __slots__ = ('trace_id', 'tracer', 'spans')
+    
+    def __init__(self, tracer: 'Tracer'):
+        self.trace_id = os.urandom(16).hex()
+        self.tracer = tracer
+        self.spans: List[Span] = []
+    
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+    
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+    
+    def waterfall(self, width: int = 24) -> str:
+        """Render the spans as an indented text waterfall"""
+        root = self.root
+        total = max(root.end_ns - root.start_ns, 1) if root.end_ns else max(time.time_ns() - root.start_ns, 1)
+        depth = {root.span_id: 0}
+        lines = []
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            level = depth.get(span.parent_id, -1) + 1 if span.parent_id else 0
+            depth[span.span_id] = level
+            offset = int((span.start_ns - root.start_ns) / total * width)
+            length = max(1, int((span.end_ns or time.time_ns()) - span.start_ns) * width // total)
+            bar = ' ' * offset + '█' * min(length, width - offset)
+            marker = '!' if span.status != 'ok' else ' '
+            label = ('  ' * level + span.name)[:38]
+            lines.append(f"{bar:<{width}} {span.duration_ms:8.1f}ms{marker} {label}")
+        return '\n'.join(lines)
+
+class Tracer:
+    """Creates spans and keeps a ring buffer of recent and slow traces"""
+    
+    def __init__(self, buffer_size: int = 50, slow_threshold_ms: float = 1000,
+                 export_path: Optional[str] = None, service_name: str = 'pterodactyl-bot'):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.export_path = export_path
+        self.service_name = service_name
+        self.recent: Deque[Trace] = deque(maxlen=buffer_size)
+        self.slow: Deque[Trace] = deque(maxlen=buffer_size)
+    
+    def configure(self, buffer_size: int = None, slow_threshold_ms: float = None, export_path: str = None):
+        """Apply settings loaded after import (e.g. from .env)"""
+        if buffer_size is not None and buffer_size != self.recent.maxlen:
+            self.recent = deque(self.recent, maxlen=buffer_size)
+            self.slow = deque(self.slow, maxlen=buffer_size)
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+        if export_path is not None:
+            self.export_path = export_path or None
+    
+    def start_span(self, name: str, **attributes) -> Span:
+        """Start a span as a child of the current span, or a new trace if there is none"""
+        parent = _current_span.get()
+        if parent is not None and parent.end_ns is None:
+            trace = parent.trace
+            span = Span(name, trace, parent.span_id, attributes)
+        else:
+            trace = Trace(self)
+            span = Span(name, trace, None, attributes)
+        trace.spans.append(span)
+        span._token = _current_span.set(span)
+        return span
+    
+    def span(self, name: str, **attributes) -> Span:
+        """Context manager form of ``start_span``"""
+        return self.start_span(name, **attributes)
+    
+    def child_span(self, name: str, **attributes) -> Optional[Span]:
+        """Start a span only when there is an active trace to attach it to"""
+        parent = _current_span.get()
+        if parent is None or parent.end_ns is not None:
+            return None
+        return self.start_span(name, **attributes)
+    
+    def last(self, slow_only: bool = False, name: Optional[str] = None) -> Optional[Trace]:
+        """Most recent finished trace, optionally only slow ones or ones with a given root name"""
+        source = self.slow if slow_only else self.recent
+        for trace in reversed(source):
+            if name is None or trace.root.name == name:
+                return trace
+        return None
+    
+    def _finish_trace(self, trace: Trace):
+        self.recent.append(trace)
+        if trace.duration_ms >= self.slow_threshold_ms:
+            self.slow.append(trace)
+        if self.export_path:
+            try:
+                self._export(trace)
+            except OSError as e:
+                print(f"Failed to export trace: {e}")
+    
+    # ==================== OTLP FILE EXPORT ====================
+    
+    @staticmethod
+    def _otlp_value(value) -> Dict:
+        if isinstance(value, bool):
+            return {'boolValue': value}
+        if isinstance(value, int):
+            return {'intValue': str(value)}
+        if isinstance(value, float):
+            return {'doubleValue': value}
+        return {'stringValue': str(value)}
+    
+    def to_otlp(self, trace: Trace) -> Dict:
+        """Encode a trace as an OTLP/JSON ``ExportTraceServiceRequest``"""
+        spans = []
+        for span in trace.spans:
+            encoded = {
+                'traceId': trace.trace_id,
+                'spanId': span.span_id,
+                'name': span.name,
+                'kind': 1,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns or span.start_ns),
+                'attributes': [{'key': k, 'value': self._otlp_value(v)} for k, v in span.attributes.items()],
+                'status': {'code': 2 if span.status == 'error' else 1}
+            }
+            if span.parent_id:
+                encoded['parentSpanId'] = span.parent_id
+            spans.append(encoded)
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+                'scopeSpans': [{'scope': {'name': 'utils.tracing'}, 'spans': spans}]
+            }]
+        }
+    
+    def _export(self, trace: Trace):
+        with open(self.export_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_otlp(trace), separators=(',', ':')) + '\n')
+
+TRACER = Tracer()
@@ -0,0 +1,67 @@
+import asyncio
+import discord
+from collections import OrderedDict
+from typing import Dict, Optional
+from utils.metrics import REGISTRY
+
+USER_LOOKUPS = REGISTRY.counter(
+    'bot_user_lookups_total',
+    'Discord user lookups for DMs by where the user came from (gateway, lru, fetched, missing)',
+    ('result',)
+)
+
+USER_CACHE_SIZE = REGISTRY.gauge(
+    'bot_user_cache_size',
+    'Users held by the lazy user cache'
+)
+
+class UserCache:
+    """
+    Discord users to DM, looked up on demand: the gateway cache first, then a
+    small LRU of users fetched before, then ``fetch_user``. With member caching
+    off the gateway rarely knows a server owner, and this keeps repeat DMs to
+    the same owners from costing a REST call each. Concurrent lookups of one
+    user share a single fetch.
+    """
+    
+    def __init__(self, bot, size: int = 512):
+        self.bot = bot
+        self.size = size
+        self._users: OrderedDict[int, discord.User] = OrderedDict()
+        self._inflight: Dict[int, asyncio.Task] = {}
+        USER_CACHE_SIZE.set_function(lambda: len(self._users))
+    
+    def __len__(self) -> int:
+        return len(self._users)
+    
+    def _remember(self, user: discord.User):
+        self._users[user.id] = user
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.size:
+            self._users.popitem(last=False)
+    
+    async def _fetch(self, user_id: int) -> Optional[discord.User]:
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except discord.HTTPException:
+            USER_LOOKUPS.inc(result='missing')
+            return None
+        USER_LOOKUPS.inc(result='fetched')
+        self._remember(user)
+        return user
+    
+    async def get(self, user_id: int) -> Optional[discord.User]:
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            USER_LOOKUPS.inc(result='gateway')
+            return user
+        user = self._users.get(user_id)
+        if user is not None:
+            self._users.move_to_end(user_id)
+            USER_LOOKUPS.inc(result='lru')
+            return user
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = self._inflight[user_id] = asyncio.create_task(self._fetch(user_id))
+            task.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        return await asyncio.shield(task)
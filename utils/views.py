@@ -0,0 +1,432 @@
+import dataclasses
+import discord
+from typing import List, Optional, Tuple
+from utils.embeds import EmbedBuilder
+from utils.events import ServerSuspended, ServerUnsuspended
+from utils.models import Server
+from utils.panels import PanelContext
+
+# Discord allows at most 25 options per select menu
+PAGE_SIZE = 25
+
+KINDS = {
+    'servers': "🎮 Servers",
+    'users': "👥 Users",
+    'nodes': "🖥️ Nodes"
+}
+
+async def _admin_only(interaction: discord.Interaction) -> bool:
+    """
+    Component and modal counterpart of ``is_admin``. Refuses interactions
+    while the bot shuts down, and has shutdown wait for accepted ones: the
+    check runs in the task that then runs the callback.
+    """
+    if interaction.client.draining:
+        await interaction.response.send_message(
+            embed=EmbedBuilder.warning("Restarting", "The bot is restarting. Try again in a minute."),
+            ephemeral=True
+        )
+        return False
+    if interaction.user.id in interaction.client.admin_ids:
+        interaction.client.track_inflight()
+        return True
+    await interaction.response.send_message(
+        embed=EmbedBuilder.error("Access Denied", "Admin only"),
+        ephemeral=True
+    )
+    return False
+
+async def _resolve_panel(interaction: discord.Interaction, name: Optional[str]) -> Optional[PanelContext]:
+    """Panel named in a component's custom_id; None (after replying) if it is no longer configured"""
+    panel = interaction.client.panels.get(name)
+    if panel is None:
+        await interaction.response.send_message(
+            embed=EmbedBuilder.error("Panel Not Found", f"Panel `{name}` is no longer configured"),
+            ephemeral=True
+        )
+    return panel
+
+def _records(panel: PanelContext, kind: str) -> list:
+    index = panel.index
+    if kind == 'servers':
+        return index.sorted_servers()
+    if kind == 'users':
+        return sorted(index.users.values(), key=lambda u: u.id)
+    return sorted(index.nodes.values(), key=lambda n: n.id)
+
+def _option(kind: str, record) -> discord.SelectOption:
+    if kind == 'servers':
+        return discord.SelectOption(
+            label=record.name[:100], value=str(record.id),
+            description=f"ID {record.id} · {record.memory} MB · node {record.node}",
+            emoji="🔴" if record.suspended else "🟢"
+        )
+    if kind == 'users':
+        return discord.SelectOption(label=record.username[:100], value=str(record.id), description=record.email[:100])
+    return discord.SelectOption(
+        label=record.name[:100], value=str(record.id),
+        description=record.fqdn[:100], emoji="🟠" if record.maintenance_mode else None
+    )
+
+def picker(panel: PanelContext, kind: str, page: int = 0, records: Optional[list] = None,
+           title: Optional[str] = None) -> Tuple[discord.Embed, discord.ui.View]:
+    """One page of servers, users or nodes from the panel's index, with a select menu and page buttons"""
+    records = _records(panel, kind) if records is None else records
+    pages = max(1, -(-len(records) // PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    shown = records[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    
+    embed = discord.Embed(
+        title=title or KINDS[kind],
+        description="\n".join(f"`{r.id}` {getattr(r, 'name', None) or r.username}" for r in shown) or "Nothing to show",
+        color=discord.Color.blue(),
+        timestamp=discord.utils.utcnow()
+    )
+    embed.set_footer(text=f"Page {page + 1}/{pages} · {len(records)} total · pick one below")
+    
+    view = discord.ui.View(timeout=None)
+    if shown:
+        view.add_item(PickerSelect(panel.name, kind, [_option(kind, r) for r in shown]))
+    # Page buttons only make sense for the full listings, which can be rebuilt from the index
+    if title is None and pages > 1:
+        view.add_item(PickerPage(panel.name, kind, page - 1, 'prev', disabled=page == 0))
+        view.add_item(PickerPage(panel.name, kind, page + 1, 'next', disabled=page >= pages - 1))
+    return embed, view
+
+def server_panel(panel: PanelContext, server: Server) -> Tuple[discord.Embed, discord.ui.View]:
+    """Server details with its action buttons"""
+    view = discord.ui.View(timeout=None)
+    view.add_item(ServerAction(panel.name, 'unsuspend' if server.suspended else 'suspend', server.id))
+    view.add_item(ServerAction(panel.name, 'resources', server.id))
+    view.add_item(ServerAction(panel.name, 'usage', server.id, disabled=server.suspended))
+    view.add_item(ServerAction(panel.name, 'backup', server.id, disabled=server.suspended or server.backups <= 0))
+    return EmbedBuilder.server_info(server), view
+
+# ==================== PERSISTENT COMPONENTS ====================
+#
+# Every component below carries what it needs in its custom_id, including
+# the panel it belongs to, so the bot can handle clicks on messages it sent
+# before a restart. Custom IDs from before panels were encoded have no panel
+# segment and resolve to the default panel.
+
+class PickerPage(discord.ui.DynamicItem[discord.ui.Button], template=r'manage:page:(?:(?P<panel>[^:]+):)?(?P<kind>servers|users|nodes):(?P<page>-?\d+):(?P<direction>prev|next)'):
+    """Previous/next page button of a picker"""
+    
+    def __init__(self, panel: Optional[str], kind: str, page: int, direction: str, disabled: bool = False):
+        super().__init__(discord.ui.Button(
+            label="◀ Previous" if direction == 'prev' else "Next ▶",
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"manage:page:{panel}:{kind}:{page}:{direction}",
+            disabled=disabled
+        ))
+        self.panel = panel
+        self.kind = kind
+        self.page = page
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['panel'], match['kind'], int(match['page']), match['direction'])
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await _admin_only(interaction)
+    
+    async def callback(self, interaction: discord.Interaction):
+        panel = await _resolve_panel(interaction, self.panel)
+        if panel is None:
+            return
+        embed, view = picker(panel, self.kind, self.page)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class PickerSelect(discord.ui.DynamicItem[discord.ui.Select], template=r'manage:pick:(?:(?P<panel>[^:]+):)?(?P<kind>servers|users|nodes)'):
+    """Select menu that opens the chosen server, user or node"""
+    
+    def __init__(self, panel: Optional[str], kind: str, options: List[discord.SelectOption] = None):
+        super().__init__(discord.ui.Select(
+            placeholder=f"Choose a {kind[:-1]}...",
+            custom_id=f"manage:pick:{panel}:{kind}",
+            options=options or [discord.SelectOption(label="-")]
+        ))
+        self.panel = panel
+        self.kind = kind
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls(match['panel'], match['kind'], item.options)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await _admin_only(interaction)
+    
+    async def callback(self, interaction: discord.Interaction):
+        panel = await _resolve_panel(interaction, self.panel)
+        if panel is None:
+            return
+        record_id = int(self.item.values[0])
+        
+        if self.kind == 'servers':
+            server = panel.index.get_server(record_id)
+            if server is None:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error("Server Not Found", f"Server ID {record_id} is no longer on the panel"),
+                    ephemeral=True
+                )
+                return
+            embed, view = server_panel(panel, server)
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        
+        elif self.kind == 'users':
+            user = panel.index.get_user(record_id)
+            if user is None:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error("User Not Found", f"User ID {record_id} is no longer on the panel"),
+                    ephemeral=True
+                )
+                return
+            servers = [s for s in panel.index.sorted_servers() if s.user == user.id]
+            embed, view = picker(panel, 'servers', records=servers, title=f"🎮 Servers of {user.username}")
+            await interaction.response.send_message(
+                embeds=[EmbedBuilder.user_info(user, len(servers)), embed], view=view, ephemeral=True
+            )
+        
+        else:
+            node = panel.index.get_node(record_id)
+            if node is None:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error("Node Not Found", f"Node ID {record_id} is no longer on the panel"),
+                    ephemeral=True
+                )
+                return
+            # Probe results are cached, so this is usually instant
+            await interaction.response.defer(ephemeral=True)
+            health = next((h for h in await panel.node_health.check_all() if h.node.id == node.id), None)
+            servers = sorted(panel.index.servers_on_node(node.id), key=lambda s: s.id)
+            embed, view = picker(panel, 'servers', records=servers, title=f"🎮 Servers on {node.name}")
+            embeds = [EmbedBuilder.node_dashboard([health]) if health else EmbedBuilder.node_info(node), embed]
+            await interaction.followup.send(embeds=embeds, view=view, ephemeral=True)
+
+class ServerAction(discord.ui.DynamicItem[discord.ui.Button], template=r'manage:server:(?:(?P<panel>[^:]+):)?(?P<action>suspend|unsuspend|resources|usage|backup):(?P<id>\d+)'):
+    """Suspend, unsuspend, edit resources, live usage or backup button of one server"""
+    
+    STYLES = {
+        'suspend': ("⏸️ Suspend", discord.ButtonStyle.danger),
+        'unsuspend': ("▶️ Unsuspend", discord.ButtonStyle.success),
+        'resources': ("⚙️ Resources", discord.ButtonStyle.primary),
+        'usage': ("📈 Live Usage", discord.ButtonStyle.secondary),
+        'backup': ("💾 Backup", discord.ButtonStyle.secondary)
+    }
+    
+    def __init__(self, panel: Optional[str], action: str, server_id: int, disabled: bool = False):
+        label, style = self.STYLES[action]
+        super().__init__(discord.ui.Button(
+            label=label, style=style, custom_id=f"manage:server:{panel}:{action}:{server_id}", disabled=disabled
+        ))
+        self.panel = panel
+        self.action = action
+        self.server_id = server_id
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['panel'], match['action'], int(match['id']))
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await _admin_only(interaction)
+    
+    async def callback(self, interaction: discord.Interaction):
+        panel = await _resolve_panel(interaction, self.panel)
+        if panel is None:
+            return
+        server = panel.index.get_server(self.server_id) or await panel.api.get_server_model(self.server_id)
+        if server is None:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Server Not Found", f"Server ID {self.server_id} does not exist"),
+                ephemeral=True
+            )
+            return
+        
+        if self.action in ('suspend', 'unsuspend'):
+            await self.toggle_suspension(interaction, panel, server)
+        elif self.action == 'resources':
+            await interaction.response.send_modal(ResourcesModal(panel, server))
+        elif self.action == 'usage':
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            usage = await panel.api.get_resource_usage(server.uuid)
+            if usage is None:
+                await interaction.followup.send(
+                    embed=EmbedBuilder.error("Resources Unavailable", "The panel did not return resource usage"),
+                    ephemeral=True
+                )
+                return
+            await interaction.followup.send(embed=EmbedBuilder.server_resources(server, usage), ephemeral=True)
+        else:
+            await self.backup(interaction, panel, server)
+    
+    async def toggle_suspension(self, interaction: discord.Interaction, panel: PanelContext, server: Server):
+        bot = interaction.client
+        suspend = self.action == 'suspend'
+        await interaction.response.defer()
+        result = await (panel.api.suspend_server(server.id) if suspend else panel.api.unsuspend_server(server.id))
+        if not result['success']:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error(
+                    "Suspension Failed" if suspend else "Unsuspension Failed", result.get('error', 'Unknown error')
+                ),
+                ephemeral=True
+            )
+            return
+        
+        server = dataclasses.replace(server, suspended=suspend)
+        if suspend:
+            bot.events.publish(ServerSuspended(
+                server, source='command', actor=interaction.user, reason="Suspended from /manage", panel=panel.name
+            ))
+        else:
+            bot.events.publish(ServerUnsuspended(server, source='command', actor=interaction.user, panel=panel.name))
+        # Redraw the panel so the buttons match the new state
+        embed, view = server_panel(panel, server)
+        await interaction.edit_original_response(embed=embed, view=view)
+    
+    async def backup(self, interaction: discord.Interaction, panel: PanelContext, server: Server):
+        bot = interaction.client
+        if panel.backups.running:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.warning("Backup Run In Progress", "Wait for the current backup run to finish"),
+                ephemeral=True
+            )
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        result = await panel.backups.backup_server(server, rotate=False)
+        if not result.success:
+            await interaction.followup.send(embed=EmbedBuilder.error("Backup Failed", result.error), ephemeral=True)
+            return
+        embed = EmbedBuilder.success(
+            "Backup Complete",
+            f"Backed up **{server.name}** in {result.seconds:.1f}s"
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        log = EmbedBuilder.log_server_action(
+            "backed up", interaction.user.mention, f"<@{server.owner_discord_id}>" if server.owner_discord_id else "Unlinked",
+            {'id': server.id, 'name': server.name}
+        )
+        if len(bot.panels) > 1:
+            log.add_field(name="🦖 Panel", value=panel.name, inline=True)
+        await bot.log_action(log)
+
+class ResourcesModal(discord.ui.Modal):
+    """RAM, CPU and disk form behind a server's Resources button; applied like ``/set_resources``"""
+    
+    def __init__(self, panel: PanelContext, server: Server):
+        super().__init__(title=f"Resources of {server.name}"[:45])
+        self.panel = panel
+        self.server = server
+        self.fields = []
+        for key, label, current in (('ram', "RAM (MB)", server.memory), ('cpu', "CPU (%)", server.cpu),
+                                    ('disk', "Disk (MB)", server.disk)):
+            field = discord.ui.TextInput(default=str(current), required=False, max_length=10)
+            self.add_item(discord.ui.Label(text=label, component=field))
+            self.fields.append((key, label, field, current))
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await _admin_only(interaction)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        values = {}
+        for key, label, field, current in self.fields:
+            text = field.value.strip()
+            if not text:
+                continue
+            if not text.isdigit():
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error("Invalid Value", f"{label} must be a whole number"),
+                    ephemeral=True
+                )
+                return
+            # Unchanged fields are left out, as if the /set_resources option wasn't given
+            if int(text) != current:
+                values[key] = int(text)
+        if not values:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("No Changes", "Change at least one resource to update"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        bot = interaction.client
+        # The form may have been open a while; start from the latest cached build
+        before = self.panel.index.get_server(self.server.id) or self.server
+        result = await self.panel.update_build(bot.events, before, actor=interaction.user, **values)
+        if not result['success']:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error("Update Failed", result.get('error', 'Unknown error')),
+                ephemeral=True
+            )
+            return
+        
+        changes = []
+        if 'ram' in values: changes.append(f"RAM: {values['ram']} MB")
+        if 'cpu' in values: changes.append(f"CPU: {values['cpu']}%")
+        if 'disk' in values: changes.append(f"Disk: {values['disk']} MB")
+        await interaction.followup.send(
+            embed=EmbedBuilder.success(
+                "Resources Updated",
+                f"Server ID {self.server.id} resources updated:\n" + "\n".join(changes)
+            ),
+            ephemeral=True
+        )
+
+class ManageView(discord.ui.View):
+    """Interactive management panel"""
+    def __init__(self, bot, panel: Optional[PanelContext] = None):
+        super().__init__(timeout=None)
+        self.bot = bot
+        self.panel = panel or bot.panels.default
+        # The default panel keeps the original custom IDs so older /manage messages still work
+        if self.panel is not bot.panels.default:
+            for item in self.children:
+                if item.custom_id != 'manage_help':
+                    item.custom_id = f"{item.custom_id}:{self.panel.name}"
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Help is open to everyone; everything else is admin-only
+        if interaction.data.get('custom_id') == 'manage_help':
+            return True
+        return await _admin_only(interaction)
+    
+    async def _open(self, interaction: discord.Interaction, kind: str):
+        if not self.panel.index.loaded:
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            if not await self.panel.index.ensure_loaded():
+                await interaction.followup.send(
+                    embed=EmbedBuilder.error("Panel Unavailable", "Could not load the panel data"),
+                    ephemeral=True
+                )
+                return
+            embed, view = picker(self.panel, kind)
+            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            return
+        embed, view = picker(self.panel, kind)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+    
+    @discord.ui.button(label="📊 Server List", style=discord.ButtonStyle.primary, custom_id="manage_servers")
+    async def show_servers(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._open(interaction, 'servers')
+    
+    @discord.ui.button(label="👥 User List", style=discord.ButtonStyle.primary, custom_id="manage_users")
+    async def show_users(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._open(interaction, 'users')
+    
+    @discord.ui.button(label="🖥️ Nodes", style=discord.ButtonStyle.secondary, custom_id="manage_nodes")
+    async def show_nodes(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._open(interaction, 'nodes')
+    
+    @discord.ui.button(label="❓ Help", style=discord.ButtonStyle.success, custom_id="manage_help")
+    async def show_help(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_message(
+            embed=EmbedBuilder.info("Help", "Use `/help` to see all available commands"),
+            ephemeral=True
+        )
+
+def register_views(bot):
+    """Re-attach the persistent /manage components so old messages keep working after a restart"""
+    for panel in bot.panels:
+        bot.add_view(ManageView(bot, panel))
+    bot.add_dynamic_items(PickerPage, PickerSelect, ServerAction)
@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from utils.metrics import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    'event_loop_lag_seconds',
+    'How late the event loop watchdog timer fired',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+LOOP_BLOCKS = REGISTRY.counter(
+    'event_loop_blocked_total',
+    'Times the event loop was blocked longer than the watchdog threshold',
+    ('location',)
+)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Offender:
+    """Aggregated blocking samples sharing the same stack"""
+    __slots__ = ('location', 'stack', 'count', 'total', 'worst', 'last_seen')
+    
+    def __init__(self, location: str, stack: str):
+        self.location = location
+        self.stack = stack
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.last_seen = 0.0
+    
+    def record(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.worst = max(self.worst, duration)
+        self.last_seen = time.time()
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag continuously and samples the loop thread's stack
+    from a helper thread whenever a callback blocks longer than ``threshold``
+    """
+    
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, max_offenders: int = 100,
+                 history: int = 1200):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_offenders = max_offenders
+        self.lags: Deque[float] = deque(maxlen=history)
+        self.offenders: Dict[Tuple, Offender] = {}
+        self.blocks = 0
+        self._heartbeat = time.monotonic()
+        self._pending: Optional[Tuple[Tuple, str, str]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+    
+    @property
+    def current_lag(self) -> float:
+        return self.lags[-1] if self.lags else 0.0
+    
+    def lag_percentile(self, pct: float) -> float:
+        if not self.lags:
+            return 0.0
+        ordered = sorted(self.lags)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+    
+    def worst_offenders(self, limit: int = 5) -> List[Offender]:
+        return sorted(self.offenders.values(), key=lambda o: o.total, reverse=True)[:limit]
+    
+    # ==================== LIFECYCLE ====================
+    
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._tick())
+        self._thread = threading.Thread(target=self._monitor, name='loop-watchdog', daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+    
+    # ==================== LOOP SIDE ====================
+    
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.lags.append(lag)
+            LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                self._record_block(lag)
+            elif self._pending is not None:
+                # Sampled a stall that ended up under the threshold
+                with self._lock:
+                    self._pending = None
+    
+    def _record_block(self, lag: float):
+        self.blocks += 1
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            # Blocked, but the sampler thread didn't catch it in time
+            key, location, stack = ('<unsampled>',), '<unsampled>', ''
+        else:
+            key, location, stack = pending
+        offender = self.offenders.get(key)
+        if offender is None:
+            if len(self.offenders) >= self.max_offenders:
+                smallest = min(self.offenders, key=lambda k: self.offenders[k].total)
+                del self.offenders[smallest]
+            offender = self.offenders[key] = Offender(location, stack)
+        offender.record(lag)
+        LOOP_BLOCKS.inc(location=location)
+    
+    # ==================== SAMPLER THREAD ====================
+    
+    def _monitor(self):
+        sampled_for = None
+        while not self._stop.wait(self.threshold / 4):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat
+            # Sample a little early so short blocks just over the threshold are still caught
+            if stalled < self.interval + self.threshold / 2 or sampled_for == heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            sample = self._describe(traceback.extract_stack(frame))
+            with self._lock:
+                self._pending = sample
+            sampled_for = heartbeat
+    
+    @staticmethod
+    def _describe(stack: traceback.StackSummary) -> Tuple[Tuple, str, str]:
+        """Key, innermost project location and formatted stack for a sample"""
+        frames = [f for f in stack if 'asyncio' not in f.filename and 'selectors' not in f.filename]
+        frames = frames or list(stack)
+        project = [f for f in frames if f.filename.startswith(_PROJECT_ROOT)]
+        anchor = project[-1] if project else frames[-1]
+        filename = os.path.relpath(anchor.filename, _PROJECT_ROOT) if project else os.path.basename(anchor.filename)
+        location = f"{filename}:{anchor.lineno} in {anchor.name}"
+        tail = frames[-8:]
+        key = tuple((f.filename, f.name) for f in tail)
+        formatted = '\n'.join(
+            f"{os.path.basename(f.filename)}:{f.lineno} {f.name}: {(f.line or '').strip()[:60]}" for f in tail
+        )
+        return key, location, formatted